@@ -1,60 +1,52 @@
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, Response, jsonify, request, render_template_string, stream_with_context
 from flask_cors import CORS
 import os
 import json
+import base64
+import heapq
 from datetime import datetime
 import uuid
+from itertools import islice
+from json_store import LogStore
 
 app = Flask(__name__)
 CORS(app)
 
-# In-memory data storage (for demo purposes)
-users = []
-tools = []
-reviews = []
-
 # Data file paths
-DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DATA_DIR = os.environ.get(
+    "DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+)
 USERS_FILE = os.path.join(DATA_DIR, "users.json")
 TOOLS_FILE = os.path.join(DATA_DIR, "tools.json")
 REVIEWS_FILE = os.path.join(DATA_DIR, "reviews.json")
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
-
-# Load data from files if they exist
-def load_data():
-    global users, tools, reviews
-    
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, 'r') as f:
-            users = json.load(f)
-    
-    if os.path.exists(TOOLS_FILE):
-        with open(TOOLS_FILE, 'r') as f:
-            tools = json.load(f)
-    
-    if os.path.exists(REVIEWS_FILE):
-        with open(REVIEWS_FILE, 'r') as f:
-            reviews = json.load(f)
-
-# Save data to files
-def save_data():
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f)
-    
-    with open(TOOLS_FILE, 'w') as f:
-        json.dump(tools, f)
-    
-    with open(REVIEWS_FILE, 'w') as f:
-        json.dump(reviews, f)
-
-# Load data on startup
-load_data()
+# Mutations are appended to a write-ahead log and compacted into a snapshot;
+# the whole-file JSON files of older versions are imported on first start.
+# In shared mode every gunicorn worker sees the others' writes (see below).
+store = LogStore(
+    DATA_DIR,
+    {
+        "users": ["email"],
+        "tools": ["category", "access_level"],
+        "reviews": ["tool_name"]
+    },
+    compact_every=int(os.environ.get("DATA_COMPACT_EVERY", 1000)),
+    fsync=os.environ.get("DATA_FSYNC", "1") != "0",
+    shared=os.environ.get("DATA_SHARED", "1") != "0"
+).open(legacy_files={
+    "users": USERS_FILE,
+    "tools": TOOLS_FILE,
+    "reviews": REVIEWS_FILE
+})
+
+# Indexed in-memory collections, loaded from the store on startup
+users = store["users"]
+tools = store["tools"]
+reviews = store["reviews"]
 
 # Initialize with frontend data if empty
 if not users:
-    users.extend([
+    users.insert_many([
         {
             "id": "1",
             "email": "john.doe@example.com",
@@ -85,7 +77,7 @@ if not users:
     ])
 
 if not tools:
-    tools.extend([
+    tools.insert_many([
         {
             "id": "1",
             "name": "ChatGPT",
@@ -125,7 +117,7 @@ if not tools:
     ])
 
 if not reviews:
-    reviews.extend([
+    reviews.insert_many([
         {
             "id": "1",
             "user_name": "John Doe",
@@ -154,9 +146,140 @@ if not reviews:
             "created_at": "2025-01-25T11:45:00"
         }
     ])
+
+# Pick up writes made by other workers before handling each request
+@app.before_request
+def refresh_store():
+    store.refresh()
+
+# Listing parameters: filterable fields per collection (indexed ones are
+# looked up through the collection index) and sortable fields
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+LIST_FILTERS = {
+    "users": ["email", "subscription_tier"],
+    "tools": ["category", "access_level"]
+}
+LIST_SORTS = {
+    "users": ["created_at", "email", "first_name", "last_name", "subscription_tier"],
+    "tools": ["created_at", "name", "category", "access_level", "rating"]
+}
+
+class ListError(ValueError):
+    pass
+
+def sort_key(value):
+    # Orders numbers before strings before missing values without comparing across types
+    if value is None:
+        return [2, ""]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return [0, value]
+    return [1, str(value)]
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ListError("Invalid cursor")
+    if not isinstance(key, list) or len(key) != 3:
+        raise ListError("Invalid cursor")
+    return key
+
+def list_params(name):
+    args = request.args
+    sort = args.get("sort")
+    if sort is not None and sort not in LIST_SORTS[name]:
+        raise ListError(f"sort must be one of: {', '.join(LIST_SORTS[name])}")
+    
+    order = args.get("order", "asc")
+    if order not in ("asc", "desc"):
+        raise ListError("order must be asc or desc")
+    
+    fields = [field for field in args.get("fields", "").split(",") if field]
+    filters = {field: args[field] for field in LIST_FILTERS[name] if field in args}
+    return sort, order == "desc", fields, filters
+
+def select_records(name, sort, descending, filters):
+    # Returns the matching [(key, record)] unordered; key is [rank, value, position].
+    # Holds the store lock so another thread's refresh cannot change the
+    # collection while it is scanned
+    collection = store[name]
+    indexed = [field for field in filters if field in collection.indexes]
+    
+    with store.lock:
+        if indexed:
+            candidates = collection.find(indexed[0], filters[indexed[0]])
+        else:
+            candidates = collection.values()
+        
+        rows = []
+        for record in candidates:
+            if all(str(record.get(field)) == value for field, value in filters.items()):
+                position = collection.position(record["id"])
+                rows.append((sort_key(record.get(sort)) + [position] if sort else [0, 0, position], record))
+    return rows
+
+def first_rows(rows, descending, count):
+    # The first count rows in listing order; O(n log count) instead of sorting them all
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(count, rows, key=lambda row: row[0])
+
+def project(record, fields):
+    return {field: record.get(field) for field in fields} if fields else record
+
+def list_page(name):
+    # Offset pages with page/limit, or keyset pages with cursor
+    sort, descending, fields, filters = list_params(name)
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        page = max(int(request.args.get("page", 1)), 1)
+    except ValueError:
+        raise ListError("page and limit must be integers")
+    
+    rows = select_records(name, sort, descending, filters)
+    pagination = {"total": len(rows), "limit": limit}
+    
+    if "cursor" in request.args:
+        if request.args["cursor"]:
+            after = decode_cursor(request.args["cursor"])
+            try:
+                rows = [row for row in rows if (row[0] < after if descending else row[0] > after)]
+            except TypeError:
+                raise ListError("Invalid cursor")
+        selected = first_rows(rows, descending, limit + 1)
+        pagination["has_more"] = len(selected) > limit
+        selected = selected[:limit]
+        pagination["next_cursor"] = encode_cursor(selected[-1][0]) if pagination["has_more"] else None
+    else:
+        selected = first_rows(rows, descending, page * limit)[(page - 1) * limit:]
+        pagination["page"] = page
+        pagination["pages"] = -(-len(rows) // limit)
+    
+    return [project(record, fields) for key, record in selected], pagination
+
+def export_ndjson(name):
+    # Streams every matching record as one JSON line, so memory and time to
+    # first byte stay flat however large the collection is
+    sort, descending, fields, filters = list_params(name)
+    rows = select_records(name, sort, descending, filters)
+    rows.sort(key=lambda row: row[0], reverse=descending)
+    
+    def generate():
+        for key, record in rows:
+            yield json.dumps(project(record, fields)) + "\n"
     
-# Save the initialized data
-save_data()
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={name}.ndjson"}
+    )
+
+@app.errorhandler(ListError)
+def handle_list_error(error):
+    return jsonify({"success": False, "message": str(error)}), 400
 
 # Admin portal HTML template
 ADMIN_PORTAL_HTML = """
@@ -195,6 +318,7 @@ ADMIN_PORTAL_HTML = """
         .tab.active { background: #3498db; color: white; }
         .tab-content { display: none; }
         .tab-content.active { display: block; }
+        .pager { display: flex; align-items: center; gap: 15px; }
     </style>
 </head>
 <body>
@@ -314,6 +438,14 @@ ADMIN_PORTAL_HTML = """
                 </table>
             </div>
         </div>
+
+        {% if pages > 1 %}
+        <div class="section pager">
+            {% if page > 1 %}<a class="btn" href="?page={{ page - 1 }}&limit={{ limit }}">Previous</a>{% endif %}
+            <span>Page {{ page }} of {{ pages }}</span>
+            {% if page < pages %}<a class="btn" href="?page={{ page + 1 }}&limit={{ limit }}">Next</a>{% endif %}
+        </div>
+        {% endif %}
     </div>
 
     <!-- Add User Modal -->
@@ -694,13 +826,30 @@ def root():
 
 @app.route('/admin')
 def admin_portal():
+    # Each tab renders one page of its collection
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        page = max(int(request.args.get("page", 1)), 1)
+    except ValueError:
+        limit, page = DEFAULT_LIMIT, 1
+    start = (page - 1) * limit
+    pages = max(-(-max(len(users), len(tools), len(reviews)) // limit), 1)
+    
+    with store.lock:
+        user_page = list(islice(users.records.values(), start, start + limit))
+        tool_page = list(islice(tools.records.values(), start, start + limit))
+        review_page = list(islice(reviews.records.values(), start, start + limit))
+    
     return render_template_string(ADMIN_PORTAL_HTML, 
-                                users=users, 
-                                tools=tools, 
-                                reviews=reviews,
+                                users=user_page, 
+                                tools=tool_page, 
+                                reviews=review_page,
                                 user_count=len(users),
                                 tool_count=len(tools),
-                                review_count=len(reviews))
+                                review_count=len(reviews),
+                                page=page,
+                                pages=pages,
+                                limit=limit)
 
 @app.route('/api/health')
 def health_check():
@@ -713,13 +862,19 @@ def health_check():
 # User endpoints
 @app.route('/api/users', methods=['GET'])
 def get_users():
+    page, pagination = list_page("users")
     return jsonify({
         "success": True,
         "data": {
-            "users": users
+            "users": page,
+            "pagination": pagination
         }
     })
 
+@app.route('/api/users/export', methods=['GET'])
+def export_users():
+    return export_ndjson("users")
+
 @app.route('/api/users', methods=['POST'])
 def create_user():
     data = request.json
@@ -734,8 +889,7 @@ def create_user():
         "created_at": datetime.now().isoformat()
     }
     
-    users.append(new_user)
-    save_data()
+    users.insert(new_user)
     
     return jsonify({
         "success": True,
@@ -749,41 +903,44 @@ def create_user():
 def update_user(user_id):
     data = request.json
     
-    for i, user in enumerate(users):
-        if user['id'] == user_id:
-            users[i].update({
-                "email": data.get("email", user["email"]),
-                "first_name": data.get("first_name", user["first_name"]),
-                "last_name": data.get("last_name", user["last_name"]),
-                "subscription_tier": data.get("subscription_tier", user["subscription_tier"]),
-                "is_admin": data.get("is_admin", user["is_admin"])
-            })
-            save_data()
-            return jsonify({
-                "success": True,
-                "message": "User updated successfully",
-                "data": {"user": users[i]}
-            })
+    user = users.get(user_id)
+    if user is None:
+        return jsonify({"success": False, "message": "User not found"}), 404
     
-    return jsonify({"success": False, "message": "User not found"}), 404
+    user = users.update(user_id, {
+        "email": data.get("email", user["email"]),
+        "first_name": data.get("first_name", user["first_name"]),
+        "last_name": data.get("last_name", user["last_name"]),
+        "subscription_tier": data.get("subscription_tier", user["subscription_tier"]),
+        "is_admin": data.get("is_admin", user["is_admin"])
+    })
+    return jsonify({
+        "success": True,
+        "message": "User updated successfully",
+        "data": {"user": user}
+    })
 
 @app.route('/api/users/<user_id>', methods=['DELETE'])
 def delete_user(user_id):
-    global users
-    users = [user for user in users if user['id'] != user_id]
-    save_data()
+    users.delete(user_id)
     return jsonify({"success": True, "message": "User deleted successfully"})
 
 # Tool endpoints
 @app.route('/api/tools', methods=['GET'])
 def get_tools():
+    page, pagination = list_page("tools")
     return jsonify({
         "success": True,
         "data": {
-            "tools": tools
+            "tools": page,
+            "pagination": pagination
         }
     })
 
+@app.route('/api/tools/export', methods=['GET'])
+def export_tools():
+    return export_ndjson("tools")
+
 @app.route('/api/tools', methods=['POST'])
 def create_tool():
     data = request.json
@@ -801,8 +958,7 @@ def create_tool():
         "created_at": datetime.now().isoformat()
     }
     
-    tools.append(new_tool)
-    save_data()
+    tools.insert(new_tool)
     
     return jsonify({
         "success": True,
@@ -816,32 +972,29 @@ def create_tool():
 def update_tool(tool_id):
     data = request.json
     
-    for i, tool in enumerate(tools):
-        if tool['id'] == tool_id:
-            tools[i].update({
-                "name": data.get("name", tool["name"]),
-                "description": data.get("description", tool["description"]),
-                "category": data.get("category", tool["category"]),
-                "access_level": data.get("access_level", tool["access_level"]),
-                "rating": data.get("rating", tool["rating"]),
-                "website_url": data.get("website_url", tool["website_url"]),
-                "business_utility": data.get("business_utility", tool["business_utility"]),
-                "price_point": data.get("price_point", tool["price_point"])
-            })
-            save_data()
-            return jsonify({
-                "success": True,
-                "message": "Tool updated successfully",
-                "data": {"tool": tools[i]}
-            })
+    tool = tools.get(tool_id)
+    if tool is None:
+        return jsonify({"success": False, "message": "Tool not found"}), 404
     
-    return jsonify({"success": False, "message": "Tool not found"}), 404
+    tool = tools.update(tool_id, {
+        "name": data.get("name", tool["name"]),
+        "description": data.get("description", tool["description"]),
+        "category": data.get("category", tool["category"]),
+        "access_level": data.get("access_level", tool["access_level"]),
+        "rating": data.get("rating", tool["rating"]),
+        "website_url": data.get("website_url", tool["website_url"]),
+        "business_utility": data.get("business_utility", tool["business_utility"]),
+        "price_point": data.get("price_point", tool["price_point"])
+    })
+    return jsonify({
+        "success": True,
+        "message": "Tool updated successfully",
+        "data": {"tool": tool}
+    })
 
 @app.route('/api/tools/<tool_id>', methods=['DELETE'])
 def delete_tool(tool_id):
-    global tools
-    tools = [tool for tool in tools if tool['id'] != tool_id]
-    save_data()
+    tools.delete(tool_id)
     return jsonify({"success": True, "message": "Tool deleted successfully"})
 
 # Admin dashboard data
@@ -856,8 +1009,8 @@ def get_dashboard_data():
                 "reviews": len(reviews),
                 "revenue": 12850.00
             },
-            "recent_users": users[-5:] if users else [],
-            "recent_tools": tools[-5:] if tools else []
+            "recent_users": users.recent(5),
+            "recent_tools": tools.recent(5)
         }
     })
 
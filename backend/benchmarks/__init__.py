@@ -0,0 +1,12 @@
+"""
+Benchmarks for the AI Directory Platform backend.
+
+Run a benchmark from the backend directory, e.g.
+``python -m benchmarks.json_encode``:
+
+- ``suite``: per-endpoint req/s, latency percentiles and SQL statement
+  counts on a synthetic catalog, saved as JSON
+- ``compare``: diff two ``suite`` result files
+- ``load_test``: gunicorn worker classes under a mixed load
+- ``json_encode``: JSON encoding of a tool listing page
+"""
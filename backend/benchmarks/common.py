@@ -0,0 +1,73 @@
+"""
+Shared helpers for the benchmarks: a throwaway database, a synthetic
+catalog and latency percentiles.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+@contextmanager
+def temporary_database():
+    """Point DATABASE_URL at a new SQLite file for the duration of the block.
+    
+    Must be entered before ``src.config`` is imported, since the config
+    reads the environment at import time.
+    """
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    previous = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    try:
+        yield os.environ['DATABASE_URL']
+    finally:
+        if previous is None:
+            os.environ.pop('DATABASE_URL', None)
+        else:
+            os.environ['DATABASE_URL'] = previous
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+def seed_catalog(tools):
+    """Add an admin, 8 categories, 12 industries and ``tools`` tools with a guide each.
+    
+    Returns the admin user.
+    """
+    from src.database import db
+    from src.models import AITool, Category, Industry, ToolGuide, User
+    
+    admin = User(email='bench@example.com', first_name='Bench', last_name='Admin', password_hash='x', is_admin=True)
+    categories = [Category(name=f'Category {i}', description='Tools for category ' + str(i)) for i in range(8)]
+    industries = [Industry(name=f'Industry {i}', description='Industry ' + str(i)) for i in range(12)]
+    db.session.add_all([admin] + categories + industries)
+    db.session.flush()
+    
+    for i in range(tools):
+        tool = AITool(
+            name=f'Tool {i}',
+            description='An AI tool that helps with a specific task. ' * 4,
+            website_url=f'https://tool{i}.example.com',
+            access_level='Public',
+            category_id=categories[i % len(categories)].id,
+            business_utility='Automates routine work for teams.',
+            price_point_type='Subscription',
+            price_point_details={'monthly': 19.99, 'annual': 199.0}
+        )
+        tool.industries = industries[i % 4:i % 4 + 3]
+        db.session.add(tool)
+        db.session.flush()
+        db.session.add(ToolGuide(tool_id=tool.id, title='Getting started', content='Step. ' * 50,
+                                 author_id=admin.id, guide_type='Tutorial'))
+    db.session.commit()
+    return admin
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Get the nearest-rank percentiles of ``samples`` as ``{'p50': ...}``."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f'p{point}': None for point in points}
+    return {
+        f'p{point}': ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))]
+        for point in points
+    }
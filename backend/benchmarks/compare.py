@@ -0,0 +1,72 @@
+"""
+Compare two ``benchmarks.suite`` result files.
+
+Prints, for every endpoint and mode in both files, the baseline and
+current p50/p95/p99, req/s and SQL statement counts with the relative
+change, and flags latency regressions beyond ``--threshold`` percent.
+Exits with status 1 if any endpoint regressed.
+
+Usage: python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ['p50', 'p95', 'p99', 'requests_per_second', 'sql_statements_mean']
+
+# Metrics where a higher value is better
+HIGHER_IS_BETTER = {'requests_per_second'}
+
+# Metrics that count as a regression when they get worse than the threshold
+GATED = {'p50', 'p95', 'sql_statements_mean'}
+
+def change(before, after):
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before * 100
+
+def compare(baseline, current, threshold):
+    """Yield (mode, endpoint, metric, before, after, percent change, regressed)."""
+    for mode, endpoints in current['results'].items():
+        for name, result in endpoints.items():
+            before_result = baseline['results'].get(mode, {}).get(name)
+            if before_result is None:
+                continue
+            for metric in METRICS:
+                before, after = before_result.get(metric), result.get(metric)
+                if before is None and after is None:
+                    continue
+                percent = change(before, after)
+                worse = percent is not None and (-percent if metric in HIGHER_IS_BETTER else percent) > threshold
+                yield mode, name, metric, before, after, percent, worse and metric in GATED
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10, help='regression threshold in percent')
+    args = parser.parse_args()
+    
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    
+    print(f"baseline {baseline.get('commit')} ({baseline.get('scale')})")
+    print(f"current  {current.get('commit')} ({current.get('scale')})")
+    if (baseline.get('scale'), baseline.get('database')) != (current.get('scale'), current.get('database')):
+        print('warning: the runs used different datasets or databases', file=sys.stderr)
+    regressions = 0
+    for mode, name, metric, before, after, percent, regressed in compare(baseline, current, args.threshold):
+        delta = f'{percent:+7.1f}%' if percent is not None else '       '
+        print(f"{'REGRESSED' if regressed else '         '} {mode:<11} {name:<18} {metric:<20} "
+              f"{before!s:>10} -> {after!s:<10} {delta}")
+        regressions += regressed
+    
+    print(f'{regressions} regressions beyond {args.threshold:g}%')
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
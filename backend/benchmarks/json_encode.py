@@ -0,0 +1,83 @@
+"""
+Microbenchmark of the JSON encoding of a ``get_tools`` page.
+
+Seeds a throwaway SQLite database, renders a page of tools with the
+``TOOL_LIST`` schema and times encoding the response envelope with:
+
+- ``before``: Flask's standard provider with sorted keys, datetimes
+  converted to ISO strings by hand (as the models used to do)
+- ``stdlib``: the standard library fallback provider
+- ``orjson``: the orjson provider
+
+``before`` does not include the ``isoformat()`` calls the models used to
+make, which ``stdlib`` pays for inside the encoder.
+
+Usage: python -m benchmarks.json_encode [--tools 100] [--repeat 200]
+"""
+
+import argparse
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+from .common import seed_catalog, temporary_database
+
+def walk_isoformat(value):
+    """Convert datetimes to ISO strings the way the models did before."""
+    if isinstance(value, dict):
+        return {key: walk_isoformat(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [walk_isoformat(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def measure(encode, repeat):
+    """Get the median and best time per call in milliseconds."""
+    encode()
+    times = timeit.repeat(encode, number=1, repeat=repeat)
+    return statistics.median(times) * 1000, min(times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tools', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    
+    with temporary_database():
+        from flask.json.provider import DefaultJSONProvider
+        from src import loaders, schemas
+        from src.main import create_app
+        from src.models import AITool
+        from src.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+        
+        app = create_app('production')
+        with app.app_context():
+            seed_catalog(args.tools)
+            tools = AITool.query.options(*loaders.TOOL).order_by(AITool.name).limit(args.tools).all()
+            envelope = {'success': True, 'data': {'tools': schemas.TOOL_LIST.dump_many(tools)}}
+            legacy_envelope = walk_isoformat(envelope)
+            
+            providers = [('before', DefaultJSONProvider(app), legacy_envelope)]
+            providers.append(('stdlib', StdlibJSONProvider(app), envelope))
+            if orjson is not None:
+                providers.append(('orjson', OrjsonProvider(app), envelope))
+            
+            print(f'Encoding a {args.tools}-tool get_tools page, {args.repeat} runs')
+            baseline = None
+            for name, provider, payload in providers:
+                provider.compact = True
+                if name != 'before':
+                    provider.sort_keys = False
+                size = len(provider.response(payload).get_data())
+                median, best = measure(lambda: provider.response(payload).get_data(), args.repeat)
+                baseline = baseline or median
+                print(f'  {name:<8} median {median:7.3f} ms  best {best:7.3f} ms  '
+                      f'{size:>8} bytes  x{baseline / median:.1f}')
+            
+            if orjson is None:
+                print('orjson is not installed; only the standard library was measured', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
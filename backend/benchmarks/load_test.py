@@ -0,0 +1,219 @@
+"""
+Load test comparing gunicorn worker classes on the real API routes.
+
+Seeds a throwaway SQLite database, then for each worker profile (see
+GUNICORN_PROFILE in gunicorn_config.py) starts gunicorn on the app and
+drives it with ``--concurrency`` keep-alive clients for ``--duration``
+seconds. The clients request a weighted mix of tool listings, searches,
+tool details, categories and, for a slow request, a year of admin user
+stats. Throughput, p50/p95/p99 latency and errors are reported per
+profile.
+
+Rate limiting is off, and the response cache is disabled unless
+``--cache`` is given, so the numbers reflect the work of the routes rather
+than 429s and cache hits.
+
+Usage: python -m benchmarks.load_test [--profiles sync,gthread,gevent]
+       [--duration 20] [--concurrency 32] [--tools 500] [--workers N]
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from .common import percentiles, seed_catalog, temporary_database
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SECRET_KEY = 'benchmark-secret-key'
+
+# (weight, name, path) of each request in the mix; {tool_id} is filled per request
+MIX = [
+    (40, 'tools', '/api/v1/tools?limit=20'),
+    (15, 'tools_search', '/api/v1/tools?search=task&limit=20'),
+    (30, 'tool_detail', '/api/v1/tools/{tool_id}'),
+    (10, 'categories', '/api/v1/categories'),
+    (5, 'user_stats', '/users/stats?days=365'),
+]
+
+def prepare(tools):
+    """Seed the database and get an admin access token."""
+    from flask_jwt_extended import create_access_token
+    from src.main import create_app
+    from src.utils import user_claims
+    
+    app = create_app('production')
+    with app.app_context():
+        admin = seed_catalog(tools)
+        return create_access_token(identity=admin.id, additional_claims=user_claims(admin), expires_delta=False)
+
+def start_server(profile, port, args):
+    env = dict(
+        os.environ,
+        GUNICORN_PROFILE=profile,
+        SECRET_KEY=SECRET_KEY,
+        JWT_SECRET_KEY=SECRET_KEY,
+        RATELIMIT_ENABLED='false',
+    )
+    if not args.cache:
+        env['RESPONSE_CACHE_BACKEND'] = 'none'
+    elif not env.get('RESPONSE_CACHE_URL'):
+        # Per worker, which is enough to measure hits
+        env.setdefault('RESPONSE_CACHE_BACKEND', 'memory')
+    if args.workers:
+        env['GUNICORN_WORKERS'] = str(args.workers)
+    
+    command = [
+        sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py',
+        '-b', f'127.0.0.1:{port}', '--access-logfile', '/dev/null',
+        "src.main:create_app('production')"
+    ]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited: {server.stderr.read().decode(errors="replace")[-2000:]}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError('gunicorn did not start within 30 seconds')
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+def run_client(address, headers, choose, deadline, samples, errors):
+    """Send ``choose()``'s (name, path) requests until ``deadline``, recording (name, seconds)."""
+    connection = http.client.HTTPConnection(*address, timeout=60)
+    
+    while time.monotonic() < deadline:
+        name, path = choose()
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            if response.status >= 400:
+                errors.append((name, response.status))
+            else:
+                samples.append((name, elapsed))
+        except (OSError, http.client.HTTPException) as error:
+            errors.append((name, type(error).__name__))
+            connection.close()
+            connection = http.client.HTTPConnection(*address, timeout=60)
+    connection.close()
+
+def drive(address, headers, make_chooser, concurrency, duration):
+    """Run ``concurrency`` clients for ``duration`` seconds.
+    
+    ``make_chooser(index)`` gives each client its request chooser. Returns
+    the samples, the errors and the elapsed seconds.
+    """
+    samples, errors = [], []
+    deadline = time.monotonic() + duration
+    clients = [
+        threading.Thread(target=run_client, args=(address, headers, make_chooser(index), deadline, samples, errors))
+        for index in range(concurrency)
+    ]
+    started = time.monotonic()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    return samples, errors, time.monotonic() - started
+
+def mix_chooser(tools, seed):
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in MIX]
+    
+    def choose():
+        _, name, path = rng.choices(MIX, weights)[0]
+        return name, path.format(tool_id=rng.randint(1, tools))
+    return choose
+
+def latency_summary(samples):
+    """Get the request count and p50/p95/p99 in milliseconds of (name, seconds) samples."""
+    latencies = [seconds * 1000 for _, seconds in samples]
+    return {
+        'requests': len(samples),
+        **{name: round(value, 2) if value is not None else None
+           for name, value in percentiles(latencies).items()},
+    }
+
+def summarize(samples, errors, elapsed):
+    """Get the latency summary plus the error count and req/s of a run."""
+    return {
+        **latency_summary(samples),
+        'errors': len(errors),
+        'requests_per_second': round(len(samples) / elapsed, 1),
+    }
+
+def run_profile(profile, port, token, args):
+    server = start_server(profile, port, args)
+    try:
+        samples, errors, elapsed = drive(
+            ('127.0.0.1', port), {'Authorization': f'Bearer {token}'},
+            lambda index: mix_chooser(args.tools, index), args.concurrency, args.duration
+        )
+    finally:
+        stop_server(server)
+    
+    result = {'profile': profile, **summarize(samples, errors, elapsed), 'routes': {}}
+    for _, name, _ in MIX:
+        result['routes'][name] = latency_summary([sample for sample in samples if sample[0] == name])
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--profiles', default='sync,gthread,gevent')
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--tools', type=int, default=500)
+    parser.add_argument('--workers', type=int, help='worker processes (default: the profile\'s)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cache', action='store_true', help='keep the response cache enabled')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args()
+    
+    if importlib.util.find_spec('gunicorn') is None:
+        parser.error('gunicorn is not installed')
+    
+    os.environ['SECRET_KEY'] = os.environ['JWT_SECRET_KEY'] = SECRET_KEY
+    results = []
+    with temporary_database():
+        token = prepare(args.tools)
+        for profile in args.profiles.split(','):
+            if profile == 'gevent' and importlib.util.find_spec('gevent') is None:
+                print('Skipping gevent: not installed', file=sys.stderr)
+                continue
+            result = run_profile(profile, args.port, token, args)
+            results.append(result)
+            print(f"{profile:<8} {result['requests_per_second']:>8} req/s  "
+                  f"p50 {result['p50']} ms  p95 {result['p95']} ms  p99 {result['p99']} ms  "
+                  f"errors {result['errors']}")
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'args': vars(args), 'results': results}, file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""
+Endpoint benchmark suite for the API.
+
+Seeds a synthetic catalog (see ``src.dataset.SCALES``) and measures each of the
+ENDPOINTS two ways:
+
+- ``test_client``: ``--requests`` sequential requests through Flask's test
+  client, with the SQL statements of every request counted
+- ``http`` (with ``--http``): ``--concurrency`` keep-alive clients for
+  ``--duration`` seconds against gunicorn (started here with
+  ``--profile``) or an already running server at ``--url``
+
+Each reports req/s and p50/p95/p99 latency. The results, with the commit
+and dataset they were measured on, are written to ``--output`` (by default
+``benchmarks/results/<time>-<commit>.json``) for ``benchmarks.compare``.
+
+Rate limiting and the response cache are off unless ``--cache`` is given.
+Pass ``--database`` to reuse a database between runs; it is seeded only
+if it has no tools yet.
+
+Usage: python -m benchmarks.suite [--scale 10k] [--requests 50]
+       [--http [--url http://host:port] [--profile gthread]]
+       [--only tools,tool_detail] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from src.dataset import SCALES, TASKS, generate
+
+from .common import temporary_database
+from .load_test import SECRET_KEY, drive, start_server, stop_server, summarize
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# (name, path, caller) of each measured request; {placeholders} are filled
+# per request from the seeded data, and caller is None, 'user' or 'admin'
+ENDPOINTS = [
+    ('tools', '/api/v1/tools?limit=20', None),
+    ('tools_card', '/api/v1/tools?limit=20&view=card', None),
+    ('tools_by_category', '/api/v1/tools?category_id={category_id}&sort=rating&order=desc&limit=20', None),
+    ('tools_deep_page', '/api/v1/tools?limit=20&page={page}', None),
+    ('tools_search', '/api/v1/tools?search={term}&limit=20', None),
+    ('tool_detail', '/api/v1/tools/{tool_id}', 'user'),
+    ('tool_reviews', '/api/v1/tools/{tool_id}/reviews?limit=20', None),
+    ('categories', '/api/v1/categories', None),
+    ('industries', '/api/v1/industries', None),
+    ('my_favorites', '/api/v1/users/me/favorites', 'user'),
+    ('admin_dashboard', '/dashboard', 'admin'),
+    ('admin_user_stats', '/users/stats?days=365', 'admin'),
+    ('admin_tool_stats', '/tools/stats', 'admin'),
+]
+
+class Fixtures:
+    """Ids of the seeded data used to fill in the endpoint paths."""
+    
+    def __init__(self):
+        from sqlalchemy import func
+        from src.database import db
+        from src.models import AITool, Category, User, UserFavorite
+        
+        self.tool_ids = (db.session.query(func.min(AITool.id)).scalar(), db.session.query(func.max(AITool.id)).scalar())
+        self.category_ids = [id for id, in db.session.query(Category.id)]
+        self.pages = max(1, db.session.query(func.count(AITool.id)).scalar() // 20)
+        self.terms = sorted({word for task in TASKS for word in task.split() if len(word) > 4})
+        
+        # The benchmark user is the Business user with the most favorites, so
+        # every tool detail is visible to it
+        user_id = db.session.query(UserFavorite.user_id).join(User, User.id == UserFavorite.user_id).filter(
+            User.subscription_tier == 'Business', User.is_admin.is_(False)
+        ).group_by(UserFavorite.user_id).order_by(func.count(UserFavorite.id).desc()).limit(1).scalar()
+        self.user = db.session.get(User, user_id) if user_id else User.query.filter_by(is_admin=False).first()
+        self.admin = User.query.filter_by(is_admin=True).first()
+        if self.admin is None:
+            self.admin = User(email='benchmark-admin@example.com', first_name='Benchmark', last_name='Admin',
+                              password_hash='x', subscription_tier='Business', is_admin=True)
+            db.session.add(self.admin)
+            db.session.commit()
+    
+    def tokens(self):
+        """Get the Authorization headers for each kind of caller."""
+        from flask_jwt_extended import create_access_token
+        from src.utils import user_claims
+        
+        headers = {None: {}}
+        for caller, user in (('user', self.user), ('admin', self.admin)):
+            token = create_access_token(identity=user.id, additional_claims=user_claims(user), expires_delta=False)
+            headers[caller] = {'Authorization': f'Bearer {token}'}
+        return headers
+    
+    def chooser(self, name, path, seed):
+        """Get a function returning ``(name, path)`` with fresh placeholder values."""
+        rng = random.Random(seed)
+        
+        def choose():
+            return name, path.format(
+                tool_id=rng.randint(*self.tool_ids),
+                category_id=rng.choice(self.category_ids),
+                page=rng.randint(1, self.pages),
+                term=rng.choice(self.terms)
+            )
+        return choose
+
+def git_commit():
+    """Get the current commit, marked ``-dirty`` if the tree has changes."""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD'], stderr=subprocess.DEVNULL) != 0
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+def bench_test_client(app, endpoints, fixtures, headers, args):
+    """Time ``args.requests`` sequential requests per endpoint, counting SQL statements."""
+    from src.database import count_statements
+    
+    client = app.test_client()
+    results = {}
+    for name, path, caller in endpoints:
+        choose = fixtures.chooser(name, path, args.seed)
+        for _ in range(args.warmup):
+            client.get(choose()[1], headers=headers[caller])
+        
+        samples, errors, statement_counts = [], [], []
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            _, url = choose()
+            with count_statements() as statements:
+                request_started = time.perf_counter()
+                response = client.get(url, headers=headers[caller])
+                elapsed = time.perf_counter() - request_started
+            statement_counts.append(len(statements))
+            if response.status_code >= 400:
+                errors.append((name, response.status_code))
+            else:
+                samples.append((name, elapsed))
+        
+        results[name] = {
+            **summarize(samples, errors, time.perf_counter() - started),
+            'sql_statements_mean': round(sum(statement_counts) / len(statement_counts), 1) if statement_counts else None,
+            'sql_statements_max': max(statement_counts, default=None),
+        }
+        report('test_client', name, results[name])
+    return results
+
+def bench_http(address, endpoints, fixtures, headers, args):
+    """Drive each endpoint for ``args.duration`` seconds with ``args.concurrency`` clients."""
+    results = {}
+    for name, path, caller in endpoints:
+        samples, errors, elapsed = drive(
+            address, headers[caller],
+            lambda index: fixtures.chooser(name, path, args.seed + index),
+            args.concurrency, args.duration
+        )
+        results[name] = summarize(samples, errors, elapsed)
+        report('http', name, results[name])
+    return results
+
+def report(mode, name, result):
+    statements = f"  sql {result['sql_statements_mean']:>6}" if 'sql_statements_mean' in result else ''
+    print(f"  {mode:<11} {name:<18} {result['requests_per_second'] or 0:>8} req/s  "
+          f"p50 {result['p50']} ms  p95 {result['p95']} ms  p99 {result['p99']} ms  "
+          f"errors {result['errors']}{statements}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', choices=SCALES, default='10k')
+    parser.add_argument('--database', help='database URL to seed once and reuse (default: a temporary SQLite file)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=50, help='test client requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--http', action='store_true', help='also load test over HTTP')
+    parser.add_argument('--url', help='server to load test (default: start gunicorn)')
+    parser.add_argument('--profile', default='gthread', help='GUNICORN_PROFILE of the started server')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--cache', action='store_true', help='keep the response cache enabled')
+    parser.add_argument('--only', help='comma-separated endpoint names to run')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<time>-<commit>.json)')
+    args = parser.parse_args()
+    
+    endpoints = ENDPOINTS
+    if args.only:
+        names = set(args.only.split(','))
+        unknown = names - {name for name, _, _ in ENDPOINTS}
+        if unknown:
+            parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+        endpoints = [endpoint for endpoint in ENDPOINTS if endpoint[0] in names]
+    
+    # The config reads these at import time
+    os.environ['SECRET_KEY'] = os.environ['JWT_SECRET_KEY'] = SECRET_KEY
+    os.environ['RATELIMIT_ENABLED'] = 'false'
+    if not args.cache:
+        os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    if args.database:
+        os.environ['DATABASE_URL'] = args.database
+    
+    with nullcontext() if args.database else temporary_database():
+        from src.database import db
+        from src.main import create_app
+        from src.models import AITool
+        
+        app = create_app('production')
+        with app.app_context():
+            seeded = None
+            if AITool.query.first() is None:
+                print(f'Seeding the {args.scale} dataset')
+                started = time.perf_counter()
+                seeded = generate(**SCALES[args.scale], seed=args.seed)
+                print(f'Seeded in {time.perf_counter() - started:.1f}s')
+            fixtures = Fixtures()
+            headers = fixtures.tokens()
+            dialect = db.engine.dialect.name
+            
+            print('Test client')
+            results = {'test_client': bench_test_client(app, endpoints, fixtures, headers, args)}
+            
+            if args.http:
+                print('HTTP')
+                server = None
+                if args.url:
+                    url = urlsplit(args.url)
+                    address = (url.hostname, url.port or 80)
+                else:
+                    server = start_server(args.profile, args.port, args)
+                    address = ('127.0.0.1', args.port)
+                try:
+                    results['http'] = bench_http(address, endpoints, fixtures, headers, args)
+                finally:
+                    if server is not None:
+                        stop_server(server)
+    
+    commit = git_commit()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.utcnow():%Y%m%dT%H%M%S}-{(commit or 'unknown')[:12]}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({
+            'commit': commit,
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'database': dialect,
+            'scale': args.scale if seeded is not None or not args.database else None,
+            'seeded': seeded,
+            'args': vars(args),
+            'results': results,
+        }, file, indent=2)
+    print(f'Results written to {output}', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
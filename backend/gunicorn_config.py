@@ -1,20 +1,97 @@
 """
 Gunicorn configuration for the AI Directory Platform.
+
+GUNICORN_PROFILE selects the worker model:
+
+- ``gthread`` (default): a few processes with a pool of threads each. A slow
+  request (an image upload, a long stats query) occupies one thread, not a
+  whole process.
+- ``gevent``: cooperative greenlets, for many concurrent slow clients.
+  Needs ``pip install gevent``, plus ``psycogreen`` on PostgreSQL; other
+  server databases are refused, as their drivers would block the workers.
+- ``sync``: one request per process at a time.
+
+GUNICORN_WORKERS, GUNICORN_THREADS, GUNICORN_CONNECTIONS and
+GUNICORN_TIMEOUT override the profile's defaults. The app sizes its
+database pool from GUNICORN_THREADS (see DB_POOL_SIZE in src/config.py).
+
+Workers share their /metrics series through METRICS_DIR (by default a
+directory per port under the system temp directory, emptied at startup).
 """
 
 import multiprocessing
+import os
+import tempfile
+
+profile = os.environ.get('GUNICORN_PROFILE', 'gthread')
+cpus = multiprocessing.cpu_count()
+
+PROFILES = {
+    'sync': {'workers': cpus * 2 + 1, 'threads': 1, 'timeout': 120},
+    'gthread': {'workers': cpus + 1, 'threads': 4, 'timeout': 60},
+    'gevent': {'workers': cpus, 'threads': 1, 'connections': 100, 'timeout': 60},
+}
+
+if profile not in PROFILES:
+    raise ValueError(f"Unknown GUNICORN_PROFILE '{profile}' (expected one of {', '.join(PROFILES)})")
+
+defaults = PROFILES[profile]
 
-# Bind to 0.0.0.0:5000
-bind = "0.0.0.0:5000"
+if profile == 'gevent':
+    # Patch before the app is preloaded, so its locks, sockets and the
+    # activity log thread are all cooperative
+    from gevent import monkey
+    monkey.patch_all()
 
-# Number of worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
+    # patch_all does not reach C database drivers: a query would block every
+    # greenlet of the worker until it returns. psycopg2 yields to the hub
+    # through psycogreen; other server databases are not supported
+    from sqlalchemy.engine import make_url
+    from src.engine import database_uri
 
-# Worker class
-worker_class = "sync"
+    url = make_url(database_uri(os.environ.get('DATABASE_URL') or 'sqlite:///ai_directory.db'))
+    if url.drivername in ('postgresql', 'postgresql+psycopg2'):
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError as error:
+            raise RuntimeError(
+                f"The gevent profile needs psycogreen on PostgreSQL (pip install psycogreen): {error}"
+            ) from error
+        patch_psycopg()
+    elif url.get_backend_name() != 'sqlite':
+        raise ValueError(
+            f"The gevent profile does not support {url.drivername} databases "
+            "(use GUNICORN_PROFILE=gthread)"
+        )
+
+# Bind to 0.0.0.0:$PORT (5000 by default)
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Worker processes and the concurrency of each
+worker_class = profile
+workers = int(os.environ.get('GUNICORN_WORKERS', defaults['workers']))
+threads = int(os.environ.get('GUNICORN_THREADS', defaults['threads']))
+worker_connections = int(os.environ.get('GUNICORN_CONNECTIONS', defaults.get('connections', 1000)))
+
+# Each worker's database pool serves its threads; greenlets share a bounded
+# pool and queue for a connection. The worker count tells the app whether a
+# per-process response cache is coherent (see src/cache.py).
+os.environ.setdefault('GUNICORN_WORKERS', str(workers))
+os.environ.setdefault('GUNICORN_THREADS', str(threads))
+if profile == 'gevent':
+    os.environ.setdefault('DB_POOL_SIZE', '10')
+    os.environ.setdefault('DB_MAX_OVERFLOW', '10')
+
+# Every worker writes its metrics here so any of them can serve the merged
+# /metrics (see src/metrics.py)
+os.environ.setdefault(
+    'METRICS_DIR', os.path.join(tempfile.gettempdir(), f"ai-directory-metrics-{os.environ.get('PORT', 5000)}")
+)
 
 # Timeout in seconds
-timeout = 120
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', defaults['timeout']))
+graceful_timeout = 30
+keepalive = 5
 
 # Log level
 loglevel = "info"
@@ -32,3 +109,28 @@ preload_app = True
 max_requests = 1000
 max_requests_jitter = 50
 
+def on_starting(server):
+    """Drop the metrics files of a previous run."""
+    from src.metrics import clear_directory
+    
+    clear_directory(os.environ['METRICS_DIR'])
+
+def worker_exit(server, worker):
+    """Flush buffered activity log events and metrics before the worker exits."""
+    try:
+        from src.activity import activity_log
+        from src.metrics import metrics
+    except ImportError:
+        return
+    
+    if activity_log.app is not None:
+        activity_log.stop()
+    if metrics.app is not None:
+        metrics.stop()
+
+def child_exit(server, worker):
+    """Fold an exited worker's metrics into the archive of the metrics directory."""
+    from src.metrics import archive_process
+    
+    archive_process(os.environ['METRICS_DIR'], worker.pid)
+
@@ -0,0 +1,446 @@
+"""
+Append-only JSON storage for the A.I Intel API (app.py).
+
+Every mutation is appended to a write-ahead log as one JSON line, so a write
+costs O(record) instead of rewriting the whole dataset. Once the log holds
+``compact_every`` entries, the full state is written to a snapshot file that
+atomically replaces the previous one, and the log starts over.
+
+Log entries carry increasing sequence numbers and the snapshot records the
+last one it contains, so a crash at any point is recoverable: a torn last
+line is discarded on replay, and entries already in the snapshot are skipped.
+
+With ``shared=True`` several processes (gunicorn workers) can use the same
+data directory. Writers serialize on an exclusive ``flock`` and catch up on
+other processes' entries before appending. Readers call ``refresh()`` once
+per request, which stats the log and only reads the entries appended since
+the last call; compaction replaces the log file, and a changed inode tells
+readers to reload the snapshot.
+
+Each collection keeps its records in an id-keyed dict (in insertion order)
+plus secondary indexes on the fields it is configured with, so lookups,
+filters and writes are O(1) rather than scans of a list.
+
+Under a threaded worker, ``refresh()`` in one request thread applies other
+processes' entries while other threads read. Everything that iterates a
+collection's dicts therefore holds the store's ``lock``, as writes do;
+single key lookups are atomic and need no lock.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows, single process only
+    fcntl = None
+
+SNAPSHOT_FILE = 'snapshot.json'
+LOG_FILE = 'wal.log'
+LOCK_FILE = 'store.lock'
+
+def _fsync_dir(path):
+    # Make a rename durable; not supported on every platform
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class Collection:
+    """Indexed records of one kind; writes go through the store's log."""
+
+    def __init__(self, store, name, indexed_fields=()):
+        self.store = store
+        self.name = name
+        self.records = {}
+        # Log sequence number that first inserted each record; the same in
+        # every process, so it can order records and back pagination cursors
+        self.positions = {}
+        # field -> value -> {id: None}, dicts doubling as insertion-ordered sets
+        self.indexes = {field: {} for field in indexed_fields}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def values(self):
+        """Get the records in insertion order."""
+        with self.store.lock:
+            return list(self.records.values())
+
+    def get(self, record_id):
+        return self.records.get(record_id)
+
+    def find(self, field, value):
+        """Get the records whose indexed ``field`` equals ``value``."""
+        with self.store.lock:
+            ids = self.indexes[field].get(value, {})
+            return [self.records[record_id] for record_id in ids]
+
+    def position(self, record_id):
+        """Get a record's insertion sequence number, for ordering and cursors."""
+        return self.positions[record_id]
+
+    def first(self, field, value):
+        with self.store.lock:
+            ids = self.indexes[field].get(value)
+            return self.records[next(iter(ids))] if ids else None
+
+    def recent(self, count):
+        """Get the last ``count`` records inserted, oldest first."""
+        with self.store.lock:
+            return list(islice(reversed(self.records.values()), count))[::-1]
+
+    def insert(self, record):
+        with self.store.lock:
+            self.store.put(self.name, record)
+            return self.records[record['id']]
+
+    def insert_many(self, records):
+        for record in records:
+            self.store.put(self.name, record)
+
+    def update(self, record_id, changes):
+        """Apply ``changes`` to a record; returns it, or None if it does not exist."""
+        return self.store.merge(self.name, record_id, changes)
+
+    def delete(self, record_id):
+        """Delete a record; returns False if it did not exist."""
+        return self.store.delete(self.name, record_id)
+
+    def _put(self, record, position):
+        old = self.records.get(record['id'])
+        if old is not None:
+            self._unindex(old)
+        else:
+            self.positions[record['id']] = position
+        # Replacing an existing key keeps the record's insertion position
+        self.records[record['id']] = record
+        for field, index in self.indexes.items():
+            index.setdefault(record.get(field), {})[record['id']] = None
+
+    def _remove(self, record_id):
+        record = self.records.pop(record_id, None)
+        if record is not None:
+            self.positions.pop(record_id, None)
+            self._unindex(record)
+
+    def _unindex(self, record):
+        for field, index in self.indexes.items():
+            ids = index.get(record.get(field))
+            if ids is not None:
+                ids.pop(record['id'], None)
+                if not ids:
+                    del index[record.get(field)]
+
+    def _load(self, records, positions):
+        # Built off to the side and swapped in at once, so a reload never
+        # empties the dicts another thread is reading
+        loaded = Collection(self.store, self.name, self.indexes)
+        for record, position in zip(records, positions):
+            loaded._put(record, position)
+        self.records, self.positions, self.indexes = loaded.records, loaded.positions, loaded.indexes
+
+class LogStore:
+    """Repository of indexed record collections, persisted as snapshot + log.
+
+    ``collections`` maps each collection name to the fields to index.
+    """
+
+    def __init__(self, data_dir, collections, compact_every=1000, fsync=True, shared=False):
+        self.data_dir = data_dir
+        self.snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+        self.log_path = os.path.join(data_dir, LOG_FILE)
+        self.lock_path = os.path.join(data_dir, LOCK_FILE)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.shared = shared and fcntl is not None
+        self.collections = {
+            name: Collection(self, name, fields) for name, fields in collections.items()
+        }
+        self.seq = 0
+        self.log = None
+        self.log_inode = None
+        self.log_offset = 0
+        self.log_entries = 0
+        self.lock = threading.RLock()
+        self.lock_file = None
+        self.lock_pid = None
+
+    @contextmanager
+    def _file_lock(self, exclusive=True):
+        if not self.shared:
+            yield
+            return
+
+        # flock belongs to the open file, so each forked worker opens its own
+        if self.lock_pid != os.getpid():
+            self.lock_file = open(self.lock_path, 'a')
+            self.lock_pid = os.getpid()
+
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def open(self, legacy_files=None):
+        """Load the snapshot and replay the log.
+
+        ``legacy_files`` maps collection names to the whole-file JSON lists
+        written by older versions; they are imported once into a snapshot
+        when no snapshot or log exists yet.
+        """
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        with self.lock, self._file_lock():
+            fresh = not os.path.exists(self.snapshot_path) and not os.path.exists(self.log_path)
+
+            self._load_snapshot()
+            self._load_log(truncate=True)
+            self._open_log()
+
+            if fresh and legacy_files:
+                self._import_legacy(legacy_files)
+
+        return self
+
+    def _open_log(self):
+        if self.log is not None:
+            self.log.close()
+        self.log = open(self.log_path, 'ab')
+        self.log_inode = os.fstat(self.log.fileno()).st_ino
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return
+
+        with open(self.snapshot_path, 'r') as f:
+            snapshot = json.load(f)
+
+        self.seq = snapshot['seq']
+        for name, records in snapshot['collections'].items():
+            self._collection(name)._load(records, snapshot['positions'][name])
+
+    def _load_log(self, truncate=False):
+        self.log_inode = None
+        self.log_offset = 0
+        self.log_entries = 0
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, 'rb+' if truncate else 'rb') as f:
+            self.log_inode = os.fstat(f.fileno()).st_ino
+            self.log_offset = self._read_log(f, truncate)
+
+    def _read_log(self, f, truncate=False):
+        """Apply the complete entries from ``f``'s position; returns the offset after them."""
+        offset = f.tell()
+        for line in f:
+            entry = None
+            if line.endswith(b'\n'):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    pass
+            if entry is None:
+                # A torn write from a crash (dropped along with everything
+                # after it), or another process's append still in progress
+                if truncate:
+                    f.truncate(offset)
+                break
+
+            offset += len(line)
+            self.log_entries += 1
+            if entry['seq'] > self.seq:
+                self._apply(entry)
+                self.seq = entry['seq']
+
+        return offset
+
+    def refresh(self):
+        """Pick up entries written by other processes since the last call.
+
+        Costs one ``stat`` when nothing changed and takes no file lock unless
+        the log was compacted in the meantime.
+        """
+        if not self.shared:
+            return
+
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino == self.log_inode and stat.st_size == self.log_offset:
+            return
+
+        with self.lock:
+            self._catch_up(locked=False)
+
+    def _catch_up(self, locked):
+        try:
+            f = open(self.log_path, 'rb+' if locked else 'rb')
+        except FileNotFoundError:
+            return
+
+        with f:
+            # The inode of the file actually opened: a compaction between a
+            # stat and the open would pair the old offset with the new log
+            stat = os.fstat(f.fileno())
+            if stat.st_ino == self.log_inode:
+                if stat.st_size > self.log_offset:
+                    # Holding the exclusive lock, no other append is in progress:
+                    # an incomplete last line is a crashed writer's, and is cut off
+                    # so the next append starts on a line of its own
+                    f.seek(self.log_offset)
+                    self.log_offset = self._read_log(f, truncate=locked)
+                return
+
+        # Another process compacted: reload its snapshot and the new log,
+        # holding off further compactions while both are read
+        if locked:
+            self._reload(truncate=True)
+        else:
+            with self._file_lock(exclusive=False):
+                self._reload()
+
+    def _reload(self, truncate=False):
+        self._load_snapshot()
+        self._load_log(truncate)
+
+    def _import_legacy(self, legacy_files):
+        imported = False
+        for name, path in legacy_files.items():
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r') as f:
+                records = json.load(f)
+            self._collection(name)._load(records, range(self.seq + 1, self.seq + 1 + len(records)))
+            self.seq += len(records)
+            imported = True
+
+        if imported:
+            self._compact()
+
+    def _collection(self, name):
+        if name not in self.collections:
+            self.collections[name] = Collection(self, name)
+        return self.collections[name]
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+    def _apply(self, entry):
+        collection = self._collection(entry['collection'])
+        if entry['op'] == 'put':
+            collection._put(entry['record'], entry['seq'])
+        elif entry['op'] == 'delete':
+            collection._remove(entry['id'])
+
+    @contextmanager
+    def _writing(self):
+        """Hold the write locks with an up to date view of the log."""
+        with self.lock, self._file_lock():
+            if self.shared:
+                self._catch_up(locked=True)
+                if os.fstat(self.log.fileno()).st_ino != self.log_inode:
+                    self._open_log()
+            yield
+
+    def _append(self, entry):
+        self.seq += 1
+        entry['seq'] = self.seq
+        line = json.dumps(entry, separators=(',', ':')).encode() + b'\n'
+        self.log.write(line)
+        self.log.flush()
+        if self.fsync:
+            os.fsync(self.log.fileno())
+
+        self._apply(entry)
+        self.log_offset += len(line)
+        self.log_entries += 1
+        if self.log_entries >= self.compact_every:
+            self._compact()
+
+    def put(self, collection, record):
+        """Insert or replace a record."""
+        with self._writing():
+            self._append({'op': 'put', 'collection': collection, 'record': record})
+
+    def merge(self, collection, record_id, changes):
+        """Apply ``changes`` to the latest version of a record; returns it, or None."""
+        with self._writing():
+            record = self.collections[collection].get(record_id)
+            if record is None:
+                return None
+            self._append({'op': 'put', 'collection': collection, 'record': {**record, **changes}})
+            return self.collections[collection].get(record_id)
+
+    def delete(self, collection, record_id):
+        """Delete a record by id; returns False if it did not exist."""
+        with self._writing():
+            if self.collections[collection].get(record_id) is None:
+                return False
+            self._append({'op': 'delete', 'collection': collection, 'id': record_id})
+            return True
+
+    def get(self, collection, record_id):
+        return self.collections[collection].get(record_id)
+
+    def all(self, collection):
+        """Get a collection's records in insertion order."""
+        return self.collections[collection].values()
+
+    def compact(self):
+        """Write the current state to a new snapshot and start an empty log."""
+        with self._writing():
+            self._compact()
+
+    def _compact(self):
+        snapshot = {
+            'seq': self.seq,
+            'collections': {
+                name: list(collection.records.values())
+                for name, collection in self.collections.items()
+            },
+            'positions': {
+                name: list(collection.positions.values())
+                for name, collection in self.collections.items()
+            }
+        }
+
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Entries up to self.seq are in the snapshot now, so a crash before the
+        # log is replaced only means they are skipped on the next replay. The
+        # new log is a new file, which tells other processes to reload.
+        tmp_path = self.log_path + '.tmp'
+        open(tmp_path, 'wb').close()
+        os.replace(tmp_path, self.log_path)
+        _fsync_dir(self.data_dir)
+
+        self._open_log()
+        self.log_offset = 0
+        self.log_entries = 0
+
+    def close(self):
+        with self.lock:
+            if self.log is not None:
+                self.log.close()
+                self.log = None
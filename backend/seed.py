@@ -1,9 +1,18 @@
 """
 Database seeder script for the AI Directory Platform.
+
+``python seed.py [--reset]`` adds the demo accounts, tools and their
+reviews. A synthetic catalog can be added on top, either at a named scale
+or with explicit row counts:
+
+    python seed.py --reset --scale 100k
+    python seed.py --reset --tools 50000 --reviews 200000 --seed 7
+
+Synthetic rows are bulk inserted in chunks from a seeded RNG (see
+src/dataset.py), so the same arguments always build the same data.
 """
 
-import os
-import sys
+import argparse
 from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
 from src.main import create_app
@@ -13,10 +22,19 @@ from src.models import (
     Subscription, ToolIndustry
 )
 from src.database import db
+from src.dataset import CHUNK_SIZE, SCALES, generate, insert_rows, rebuild_derived
 
-def seed_database():
-    """Seed the database with initial data."""
+def seed_database(synthetic=None, seed=42, chunk_size=CHUNK_SIZE):
+    """Seed the database with the demo data.
+    
+    ``synthetic`` is a dict of row counts for ``src.dataset.generate``
+    (tools, users, reviews, favorites, activities) to add afterwards.
+    """
     print("Seeding database...")
+    now = datetime.utcnow()
+    
+    # Hash the shared demo password once rather than per user
+    password_hash = generate_password_hash('password123')
     
     # Create admin user
     admin = User(
@@ -34,7 +52,7 @@ def seed_database():
         email='user@example.com',
         first_name='Test',
         last_name='User',
-        password_hash=generate_password_hash('password123'),
+        password_hash=password_hash,
         subscription_tier='Free'
     )
     db.session.add(test_user)
@@ -44,10 +62,10 @@ def seed_database():
         email='premium@example.com',
         first_name='Premium',
         last_name='User',
-        password_hash=generate_password_hash('password123'),
+        password_hash=password_hash,
         subscription_tier='Premium',
-        subscription_start_date=datetime.utcnow() - timedelta(days=15),
-        subscription_end_date=datetime.utcnow() + timedelta(days=15)
+        subscription_start_date=now - timedelta(days=15),
+        subscription_end_date=now + timedelta(days=15)
     )
     db.session.add(premium_user)
     
@@ -56,10 +74,10 @@ def seed_database():
         email='business@example.com',
         first_name='Business',
         last_name='User',
-        password_hash=generate_password_hash('password123'),
+        password_hash=password_hash,
         subscription_tier='Business',
-        subscription_start_date=datetime.utcnow() - timedelta(days=5),
-        subscription_end_date=datetime.utcnow() + timedelta(days=25)
+        subscription_start_date=now - timedelta(days=5),
+        subscription_end_date=now + timedelta(days=25)
     )
     db.session.add(business_user)
     
@@ -185,52 +203,42 @@ def seed_database():
     # Commit to get IDs
     db.session.commit()
     
-    # Add ratings and reviews
-    ai_tools = AITool.query.all()
+    # Add ratings, reviews and favorites as bulk inserts
+    tool_ids = [tool_id for tool_id, in db.session.query(AITool.id).order_by(AITool.id)]
     users = [test_user, premium_user, business_user]
     
-    for tool in ai_tools:
-        # Add reviews from different users
-        for i, user in enumerate(users):
-            rating = 4 + (i % 2)  # Ratings between 4 and 5
-            review = Review(
-                user_id=user.id,
-                tool_id=tool.id,
-                rating=rating,
-                comment=f"This is a great tool! I've been using it for {i+1} months and it has really improved my workflow.",
-                is_verified=(i == 0)  # Verify some reviews
-            )
-            db.session.add(review)
-        
-        # Add favorites
-        for i, user in enumerate(users):
-            if i % 2 == 0:  # Add favorites for some users
-                favorite = UserFavorite(
-                    user_id=user.id,
-                    tool_id=tool.id
-                )
-                db.session.add(favorite)
+    insert_rows(Review, (
+        {
+            'user_id': user.id,
+            'tool_id': tool_id,
+            'rating': 4 + (i % 2),  # Ratings between 4 and 5
+            'comment': f"This is a great tool! I've been using it for {i+1} months and it has really improved my workflow.",
+            'is_verified': (i == 0)  # Verify some reviews
+        }
+        for tool_id in tool_ids
+        for i, user in enumerate(users)
+    ), chunk_size)
     
-    # Update tool ratings
-    for tool in ai_tools:
-        tool.update_rating()
+    # Add favorites for some users
+    insert_rows(UserFavorite, (
+        {'user_id': user.id, 'tool_id': tool_id}
+        for tool_id in tool_ids
+        for i, user in enumerate(users)
+        if i % 2 == 0
+    ), chunk_size)
     
     # Add user activity logs
-    for user in users:
-        activities = [
-            ('login', 'User logged in'),
-            ('view_profile', None),
-            ('search_tools', 'Searched for "AI assistant"'),
-            ('view_tool', f'Viewed tool {ai_tools[0].id}')
-        ]
-        
-        for activity_type, details in activities:
-            log = UserActivityLog(
-                user_id=user.id,
-                activity_type=activity_type,
-                details=details
-            )
-            db.session.add(log)
+    activities = [
+        ('login', 'User logged in'),
+        ('view_profile', None),
+        ('search_tools', 'Searched for "AI assistant"'),
+        ('view_tool', f'Viewed tool {tool_ids[0]}')
+    ]
+    insert_rows(UserActivityLog, (
+        {'user_id': user.id, 'activity_type': activity_type, 'details': details}
+        for user in users
+        for activity_type, details in activities
+    ), chunk_size)
     
     # Add payment transactions for premium and business users
     transactions = [
@@ -241,7 +249,7 @@ def seed_database():
             'status': 'completed',
             'payment_method': 'card_1234',
             'subscription_tier': 'Premium',
-            'transaction_date': datetime.utcnow() - timedelta(days=15)
+            'transaction_date': now - timedelta(days=15)
         },
         {
             'user_id': business_user.id,
@@ -250,7 +258,7 @@ def seed_database():
             'status': 'completed',
             'payment_method': 'card_5678',
             'subscription_tier': 'Business',
-            'transaction_date': datetime.utcnow() - timedelta(days=5)
+            'transaction_date': now - timedelta(days=5)
         }
     ]
     
@@ -264,8 +272,8 @@ def seed_database():
             'user_id': premium_user.id,
             'plan_id': 'premium',
             'status': 'active',
-            'current_period_start': datetime.utcnow() - timedelta(days=15),
-            'current_period_end': datetime.utcnow() + timedelta(days=15),
+            'current_period_start': now - timedelta(days=15),
+            'current_period_end': now + timedelta(days=15),
             'cancel_at_period_end': False,
             'payment_method_id': 'card_1234'
         },
@@ -273,8 +281,8 @@ def seed_database():
             'user_id': business_user.id,
             'plan_id': 'business',
             'status': 'active',
-            'current_period_start': datetime.utcnow() - timedelta(days=5),
-            'current_period_end': datetime.utcnow() + timedelta(days=25),
+            'current_period_start': now - timedelta(days=5),
+            'current_period_end': now + timedelta(days=25),
             'cancel_at_period_end': False,
             'payment_method_id': 'card_5678'
         }
@@ -287,18 +295,48 @@ def seed_database():
     # Commit all changes
     db.session.commit()
     
+    if synthetic:
+        print("Adding synthetic data...")
+        generate(**synthetic, seed=seed, chunk_size=chunk_size, derive=False)
+    
+    # Ratings, category counts, the search index and the rollups are
+    # recomputed once for everything inserted above
+    rebuild_derived()
+    
     print("Database seeded successfully!")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Seed the AI Directory database.')
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables first')
+    parser.add_argument('--scale', choices=SCALES, help='add a synthetic catalog of this size')
+    for name in ('tools', 'users', 'reviews', 'favorites', 'activities'):
+        parser.add_argument(f'--{name}', type=int, help=f'synthetic {name} (overrides --scale)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed of the synthetic data')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='rows per bulk insert')
+    return parser.parse_args()
+
 if __name__ == '__main__':
+    args = parse_args()
+    
+    # Explicit counts start from the chosen scale, or from nothing
+    synthetic = dict(SCALES[args.scale]) if args.scale else None
+    overrides = {
+        name: getattr(args, name)
+        for name in ('tools', 'users', 'reviews', 'favorites', 'activities')
+        if getattr(args, name) is not None
+    }
+    if overrides:
+        synthetic = {name: 0 for name in SCALES['small']} if synthetic is None else synthetic
+        synthetic.update(overrides)
+    
     app = create_app()
     
     with app.app_context():
         # Check if database should be reset
-        if len(sys.argv) > 1 and sys.argv[1] == '--reset':
+        if args.reset:
             print("Resetting database...")
             db.drop_all()
             db.create_all()
         
         # Seed database
-        seed_database()
-
+        seed_database(synthetic, seed=args.seed, chunk_size=args.chunk_size)
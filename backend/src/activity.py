@@ -0,0 +1,167 @@
+"""
+Buffered user activity logging for the AI Directory Platform.
+
+Request handlers enqueue activity events in memory; a background thread
+writes them to ``user_activity_logs`` in bulk inserts whenever a batch fills
+up or the flush interval elapses. The queue is bounded: when it is full,
+events are dropped (or the caller waits briefly, with the ``block`` policy).
+A batch the database rejects is split in halves and retried, so only the
+offending events are lost; when the database itself is unavailable the
+whole batch is dropped.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import OperationalError
+
+from .database import db
+
+class ActivityLogWriter:
+    """Flask extension that batches UserActivityLog inserts off the request thread."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.queue = None
+        self.thread = None
+        self.pid = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.dropped = 0
+        self.written = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.get('ACTIVITY_LOG_ASYNC', True)
+        self.batch_size = app.config.get('ACTIVITY_LOG_BATCH_SIZE', 100)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0)
+        self.overflow = app.config.get('ACTIVITY_LOG_OVERFLOW', 'drop')
+        self.block_timeout = app.config.get('ACTIVITY_LOG_BLOCK_TIMEOUT', 0.05)
+        self.queue = queue.Queue(maxsize=app.config.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+        app.extensions['activity_log'] = self
+        atexit.register(self.stop)
+
+    def _ensure_worker(self):
+        # Started lazily so each forked gunicorn worker gets its own thread
+        if self.thread is not None and self.pid == os.getpid():
+            return
+
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.stopping.clear()
+                self.thread = threading.Thread(
+                    target=self._run, name='activity-log-writer', daemon=True
+                )
+                self.thread.start()
+
+    def enqueue(self, user_id, activity_type, details=None):
+        """Queue an activity event. Returns False if it was dropped."""
+        self._ensure_worker()
+
+        event = {
+            'user_id': user_id,
+            'activity_type': activity_type,
+            'details': details,
+            'created_at': datetime.utcnow()
+        }
+
+        try:
+            if self.overflow == 'block':
+                self.queue.put(event, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        return True
+
+    def _run(self):
+        while not self.stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self):
+        """Block until a batch is full or the flush interval has elapsed."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size and not self.stopping.is_set():
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _write(self, batch):
+        with self.app.app_context():
+            self._insert(batch)
+
+    def _insert(self, batch):
+        from .models import UserActivityLog
+
+        try:
+            db.session.execute(db.insert(UserActivityLog), batch)
+            db.session.commit()
+            self.written += len(batch)
+        except Exception as error:
+            db.session.rollback()
+            if len(batch) == 1 or isinstance(error, OperationalError):
+                self.dropped += len(batch)
+                self.app.logger.exception("Failed to write %d activity log entries", len(batch))
+                return
+
+            # Retry each half so only the rejected events are lost
+            middle = len(batch) // 2
+            self._insert(batch[:middle])
+            self._insert(batch[middle:])
+
+    def flush(self):
+        """Write every queued event now, on the calling thread."""
+        if self.queue is None:
+            return
+
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            for start in range(0, len(batch), self.batch_size):
+                self._write(batch[start:start + self.batch_size])
+
+    def stop(self):
+        """Stop the background thread and flush what is left in the queue."""
+        self.stopping.set()
+        if self.thread is not None and self.pid == os.getpid():
+            self.thread.join(timeout=self.flush_interval + 5)
+        self.thread = None
+        self.flush()
+
+    def stats(self):
+        """Get queue depth and write counters for this process."""
+        return {
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'written': self.written,
+            'dropped': self.dropped
+        }
+
+activity_log = ActivityLogWriter()
@@ -0,0 +1,288 @@
+"""
+Response cache for the public read endpoints of the AI Directory Platform.
+
+Views decorated with ``@cached`` store their encoded JSON body, keyed on the
+endpoint, the normalized query string and (for tier-gated content) the
+caller's subscription tier. Each entry carries tags such as ``tool:<id>``,
+``category:<id>`` or ``catalog``; write routes call ``invalidate`` with the
+tags they affect after committing.
+
+Backends:
+
+- ``memory``: a per-process LRU bounded by entry count and bytes. With
+  several workers, other workers' entries expire after RESPONSE_CACHE_TTL,
+  so it is only chosen by default for a single worker process, and a
+  warning is logged when it is configured for more.
+- ``redis``: shared by every worker (needs the ``redis`` package). Tags are
+  version counters, so an invalidation is one INCR per tag and applies to
+  all workers at once.
+- ``none``: caching disabled.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+class MemoryCacheBackend:
+    """In-process LRU cache with a tag index."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=2048, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.bytes = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            body, tags, expires = entry
+            if expires < time.monotonic():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return body
+
+    def set(self, key, body, tags, ttl):
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (body, tags, time.monotonic() + ttl)
+            self.bytes += len(body)
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+
+            while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        body, tags, expires = entry
+        self.bytes -= len(body)
+        for tag in tags:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+    def invalidate(self, tags):
+        with self.lock:
+            for tag in tags:
+                for key in list(self.tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tags.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.bytes, 'evictions': self.evictions}
+
+class RedisCacheBackend:
+    """Shared cache on Redis with versioned tags."""
+
+    name = 'redis'
+    prefix = 'response-cache:'
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def _tag_versions(self, tags):
+        keys = [f'{self.prefix}tag:{tag}' for tag in tags]
+        return [int(version or 0) for version in self.client.mget(keys)] if keys else []
+
+    def get(self, key):
+        stored = self.client.get(self.prefix + key)
+        if stored is None:
+            return None
+
+        header, body = stored.split(b'\n', 1)
+        versions = json.loads(header)
+        # The entry is stale if any of its tags was invalidated since it was stored
+        if self._tag_versions(list(versions)) != list(versions.values()):
+            return None
+        return body
+
+    def set(self, key, body, tags, ttl):
+        tags = sorted(tags)
+        header = json.dumps(dict(zip(tags, self._tag_versions(tags)))).encode()
+        self.client.setex(self.prefix + key, ttl, header + b'\n' + body)
+
+    def invalidate(self, tags):
+        pipeline = self.client.pipeline()
+        for tag in tags:
+            pipeline.incr(f'{self.prefix}tag:{tag}')
+        pipeline.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+    def stats(self):
+        return {}
+
+class ResponseCache:
+    """Flask extension owning the response cache backend and its hit/miss counters."""
+
+    def __init__(self, app=None):
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'stores': 0, 'invalidations': 0,
+                         'bytes_served': 0, 'bytes_stored': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('RESPONSE_CACHE_BACKEND')
+        workers = app.config.get('WORKER_PROCESSES', 1)
+        if backend is None:
+            if app.config.get('RESPONSE_CACHE_URL'):
+                backend = 'redis'
+            elif workers > 1:
+                app.logger.warning(
+                    "Response cache disabled: %d workers need a shared cache (set RESPONSE_CACHE_URL)", workers
+                )
+                backend = 'none'
+            else:
+                backend = 'memory'
+        elif backend == 'memory' and workers > 1:
+            app.logger.warning(
+                "The memory response cache is per worker: after a write, the other %d workers serve "
+                "stale entries for up to RESPONSE_CACHE_TTL seconds (use the redis backend)", workers - 1
+            )
+        
+        if backend == 'memory':
+            backend = MemoryCacheBackend(
+                max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 2048),
+                max_bytes=app.config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+            )
+        elif backend == 'redis':
+            backend = RedisCacheBackend(app.config['RESPONSE_CACHE_URL'])
+        else:
+            backend = None
+        app.extensions['response_cache'] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('response_cache')
+
+    def _count(self, **increments):
+        with self.lock:
+            for name, value in increments.items():
+                self.counters[name] += value
+
+    def get(self, key):
+        body = self.backend.get(key)
+        if body is None:
+            self._count(misses=1)
+        else:
+            self._count(hits=1, bytes_served=len(body))
+        return body
+
+    def set(self, key, body, tags):
+        self.backend.set(key, body, tags, current_app.config.get('RESPONSE_CACHE_TTL', 300))
+        self._count(stores=1, bytes_stored=len(body))
+
+    def invalidate(self, *tags):
+        """Drop every cached response carrying one of the tags."""
+        if self.backend is None or not tags:
+            return
+        self.backend.invalidate(tags)
+        self._count(invalidations=1)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        """Get hit rate, byte counts and backend size for this process."""
+        with self.lock:
+            stats = dict(self.counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        stats['backend'] = self.backend.name if self.backend is not None else None
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+response_cache = ResponseCache()
+
+def _caller_tier():
+    """Get the subscription tier the response is rendered for ('anonymous' if none)."""
+    from .utils import trusted_claims, load_current_user
+
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return 'anonymous'
+    if get_jwt_identity() is None:
+        return 'anonymous'
+
+    claims = trusted_claims()
+    if claims:
+        return claims['tier']
+    user = load_current_user()
+    return user.subscription_tier if user else 'unknown'
+
+def cache_key(vary_tier=False):
+    """Build the cache key for the current request."""
+    query = urlencode(sorted(request.args.items(multi=True)))
+    key = f'{request.endpoint}:{request.view_args}?{query}'
+    if vary_tier:
+        key += f'|tier={_caller_tier()}'
+    # Set by @conditional: entries from an older collection version are never served
+    if 'validator' in g:
+        key += f'|version={g.validator}'
+    return key
+
+def add_cache_tags(*tags):
+    """Tag the response being rendered (for tags only known inside the view)."""
+    if 'cache_tags' in g:
+        g.cache_tags.update(tags)
+
+def cached(tags=(), vary_tier=False):
+    """Cache a view's successful JSON responses.
+
+    ``tags`` may use the view's URL arguments, e.g. ``'tool:{tool_id}'``.
+    With ``vary_tier`` the caller's subscription tier is part of the key.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Profile captures (see src/profiling.py) measure the uncached view
+            if response_cache.backend is None or 'profile_capture' in g:
+                return fn(*args, **kwargs)
+
+            key = cache_key(vary_tier)
+            body = response_cache.get(key)
+            if body is not None:
+                response = current_app.response_class(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            g.cache_tags = {tag.format(**kwargs) for tag in tags}
+            response = current_app.make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                response_cache.set(key, response.get_data(), g.cache_tags)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+    return decorator
@@ -0,0 +1,74 @@
+"""
+CLI commands for the AI Directory Platform.
+
+Run with ``flask --app src.main <command>``.
+"""
+
+import click
+
+def register_commands(app):
+    """Register maintenance commands on the Flask CLI."""
+
+    @app.cli.command('search-reindex')
+    def search_reindex():
+        """Rebuild the AI tool full-text search index."""
+        from .search import tool_search
+
+        tool_search.rebuild()
+        click.echo(f"Search index rebuilt ({tool_search.backend.name})")
+    
+    @app.cli.command('db-upgrade')
+    def db_upgrade():
+        """Add model columns and indexes missing from an existing database."""
+        from .migrations import upgrade
+        
+        added = upgrade()
+        click.echo(f"Added columns and indexes: {', '.join(added)}" if added else "Database is up to date")
+    
+    @app.cli.command('db-index-audit')
+    @click.option('--verbose', is_flag=True, help='Print every query plan.')
+    def db_index_audit(verbose):
+        """Explain the hot route queries and flag full table scans."""
+        from .index_audit import audit
+        
+        flagged = 0
+        for label, plan, problems in audit():
+            click.echo(f"{'FLAG' if problems else 'ok  '} {label}")
+            for problem in problems:
+                click.echo(f"       {problem}")
+            if verbose:
+                for line in plan:
+                    click.echo(f"       | {line}")
+            flagged += bool(problems)
+        
+        click.echo(f"{flagged} queries flagged")
+        if flagged:
+            raise SystemExit(1)
+    
+    @app.cli.command('recompute-ratings')
+    def recompute_ratings():
+        """Recompute the denormalized tool rating aggregates from the reviews."""
+        from .models import AITool
+        
+        AITool.recompute_ratings()
+        click.echo(f"Recomputed ratings for {AITool.query.count()} tools")
+    
+    @app.cli.command('rollups-refresh')
+    @click.option('--rebuild', is_flag=True, help='Recompute the rollups from scratch.')
+    def rollups_refresh(rebuild):
+        """Roll up the admin dashboard analytics up to today (run daily from cron)."""
+        from .rollups import refresh
+        
+        refreshed = refresh(rebuild=rebuild)
+        for name, (since, until) in refreshed.items():
+            click.echo(f"{name}: rolled up {since.date() if since else 'all history'} to {until.date()}")
+        if not refreshed:
+            click.echo("Rollups are up to date")
+    
+    @app.cli.command('recount-categories')
+    def recount_categories():
+        """Recompute the denormalized category tool counters."""
+        from .models import Category
+        
+        Category.recount_tools()
+        click.echo(f"Recounted tools for {Category.query.count()} categories")
@@ -17,11 +17,39 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///ai_directory.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Engine settings (see src/engine.py). Each worker process has its own
+    # pool: one connection per gunicorn thread plus one for the activity log
+    # writer, so the database sees workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # connections at most.
+    WORKER_PROCESSES = int(os.environ.get('GUNICORN_WORKERS', 1))
+    WORKER_THREADS = int(os.environ.get('GUNICORN_THREADS', 1))
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', WORKER_THREADS + 1))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 2))
+    DB_POOL_TIMEOUT = 10  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE = 1800  # seconds
+    DB_POOL_PRE_PING = True
+    DB_STATEMENT_TIMEOUT = None  # milliseconds, PostgreSQL only
+    
+    # Applied to every new SQLite connection
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,  # milliseconds
+        'cache_size': -64000,  # KiB (64 MB)
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    }
+    
     # JWT settings
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-dev-key-please-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    # Seconds the tier claim in an access token is trusted without reloading
+    # the user (0, the default, always reads the database). Admin access is
+    # always checked against the database.
+    AUTH_CLAIMS_TTL = int(os.environ.get('AUTH_CLAIMS_TTL', 0))
+    
     # File upload settings
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
@@ -31,10 +59,60 @@ class Config:
     API_TITLE = 'AI Directory API'
     API_VERSION = '1.0.0'
     
+    # JSON encoding: 'orjson' (falls back to 'stdlib' if not installed).
+    # JSON_PRETTY indents responses and sorts their keys.
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    JSON_PRETTY = False
+    
+    # Activity log settings (events are bulk-inserted by a background thread)
+    ACTIVITY_LOG_ASYNC = True
+    ACTIVITY_LOG_BATCH_SIZE = 100
+    ACTIVITY_LOG_FLUSH_INTERVAL = 1.0  # seconds
+    ACTIVITY_LOG_QUEUE_SIZE = 10000
+    ACTIVITY_LOG_OVERFLOW = 'drop'  # 'drop' or 'block' when the queue is full
+    
+    # Pagination settings
+    PAGINATION_COUNT_TTL = 60  # seconds a count=estimate total is reused
+    
+    # Rating settings: sort=rating orders by the plain average ('average') or
+    # by a Bayesian average with RATING_PRIOR_WEIGHT reviews of RATING_PRIOR_MEAN
+    # ('bayesian'). Run `flask recompute-ratings` after changing the prior.
+    RATING_SORT = 'average'
+    RATING_PRIOR_MEAN = 3.0
+    RATING_PRIOR_WEIGHT = 5
+    
+    # Search settings
+    SEARCH_MAX_RESULTS = 1000
+    
+    # Response cache for the public catalog endpoints: 'memory' (per worker),
+    # 'redis' (shared, RESPONSE_CACHE_URL) or 'none'. Unset, it is 'redis'
+    # with a RESPONSE_CACHE_URL, else 'memory' for a single worker process and
+    # 'none' for several, whose memory caches would miss each other's writes
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND')
+    RESPONSE_CACHE_URL = os.environ.get('RESPONSE_CACHE_URL')
+    RESPONSE_CACHE_TTL = 300  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = 2048
+    RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    
+    # Request profiling: Server-Timing headers, a JSON log line per request
+    # and admin profile captures (see src/profiling.py)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_SLOW_STATEMENTS = 3  # slowest statements logged per request
+    PROFILING_SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+    
+    # Prometheus metrics at /metrics (see src/metrics.py). With METRICS_DIR
+    # every worker process writes its series there and a scrape merges them;
+    # gunicorn_config.py sets it for gunicorn's workers
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = 1.0  # seconds between writes of a worker's series
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # bearer token required by /metrics, if set
+    
     # CORS settings
     CORS_ORIGINS = ['*']
     
-    # Rate limiting
+    # Rate limiting (RATELIMIT_ENABLED=false turns it off, e.g. for load tests)
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() != 'false'
     RATELIMIT_DEFAULT = "100/minute"
     RATELIMIT_STORAGE_URL = "memory://"
     
@@ -90,12 +168,14 @@ class DevelopmentConfig(Config):
     
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///ai_directory_dev.db'
+    JSON_PRETTY = True
 
 class TestingConfig(Config):
     """Testing configuration."""
     
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///ai_directory_test.db'
+    ACTIVITY_LOG_ASYNC = False
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=5)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=10)
 
@@ -106,6 +186,7 @@ class ProductionConfig(Config):
     SECRET_KEY = os.environ.get('SECRET_KEY')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    DB_STATEMENT_TIMEOUT = int(os.environ.get('DB_STATEMENT_TIMEOUT', 30000))
     
     # Stricter CORS settings
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '').split(',')
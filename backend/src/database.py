@@ -4,9 +4,10 @@ This module provides a central SQLite database connection for all models.
 """
 
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
 
 # Create a metadata object with naming conventions for constraints
 convention = {
@@ -52,20 +53,57 @@ class BaseModel:
         return cls.query.all()
     
     def to_dict(self):
-        """Convert the model instance to a dictionary."""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        """Convert the model instance to a dictionary of its columns.
+        
+        API responses use the schemas in ``src.schemas`` instead.
+        """
+        from .schemas import columns_schema
+        return columns_schema(type(self)).dump(self)
+
+@contextmanager
+def count_statements():
+    """Count the SQL statements executed inside the block.
+
+    Yields a list that collects each statement's SQL text, so
+    ``len(statements)`` is the statement count once the block exits.
+    """
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
 
 def init_app(app):
     """Initialize the database with the Flask app."""
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
-        'DATABASE_URL', 'sqlite:///ai_directory.db'
+    from .engine import database_uri, engine_options, install
+    
+    # DATABASE_URL overrides the URI of the selected configuration
+    uri = database_uri(
+        os.environ.get('DATABASE_URL')
+        or app.config.get('SQLALCHEMY_DATABASE_URI')
+        or 'sqlite:///ai_directory.db'
     )
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config, uri)
     
     # Initialize the SQLAlchemy app
     db.init_app(app)
     
-    # Create tables
+    # Create tables and bring existing ones up to date
     with app.app_context():
+        install(db.engine, app.config)
+        
         db.create_all()
+        
+        from .migrations import upgrade
+        upgrade()
+        
+        from .models import TableVersion
+        TableVersion.ensure(db.metadata.tables)
 
@@ -0,0 +1,278 @@
+"""
+Synthetic catalog generator for seed.py and the benchmarks.
+
+``generate(**SCALES['10k'])`` fills the database with users, tools (with
+industries and guides), reviews, favorites, activity logs and payment
+transactions. Rows are built as plain dicts from a seeded RNG and inserted
+with one executemany per chunk, so a million tools take minutes rather
+than the hours an object-per-row seed would. Every synthetic user shares
+one precomputed password hash.
+
+The denormalized aggregates (tool ratings, category tool counts), the
+search index and the analytics rollups are rebuilt once at the end.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+from werkzeug.security import generate_password_hash
+
+from .database import db
+from .models import (
+    AITool, Category, Industry, PaymentTransaction, Review, ToolGuide,
+    ToolIndustry, User, UserActivityLog, UserFavorite
+)
+from .rollups import refresh
+from .search import tool_search
+
+# Row counts for the named scales of ``--scale``
+SCALES = {
+    'small': dict(tools=1_000, users=500, reviews=5_000, favorites=5_000, activities=10_000),
+    '10k': dict(tools=10_000, users=5_000, reviews=50_000, favorites=50_000, activities=100_000),
+    '100k': dict(tools=100_000, users=20_000, reviews=400_000, favorites=400_000, activities=1_000_000),
+    '1m': dict(tools=1_000_000, users=100_000, reviews=2_000_000, favorites=2_000_000, activities=5_000_000),
+}
+
+CHUNK_SIZE = 5_000
+
+SYNTHETIC_PASSWORD = 'password123'
+
+CATEGORIES = [
+    ('Conversational AI', 'message-circle'), ('Image Generation', 'image'),
+    ('Code Assistant', 'code'), ('Text Analysis', 'file-text'),
+    ('Data Analysis', 'bar-chart'), ('Audio Generation', 'music'),
+    ('Video Generation', 'video'), ('Search', 'search'),
+    ('Productivity', 'check-square'), ('Marketing', 'trending-up'),
+    ('Design', 'pen-tool'), ('Translation', 'globe'),
+]
+
+INDUSTRIES = [
+    'Technology', 'Healthcare', 'Finance', 'Education', 'Marketing',
+    'Retail', 'Legal', 'Manufacturing', 'Media', 'Real Estate',
+    'Logistics', 'Hospitality',
+]
+
+ADJECTIVES = ['Smart', 'Rapid', 'Deep', 'Bright', 'Open', 'Neural', 'Quantum', 'Clear', 'Swift', 'Vivid']
+NOUNS = ['Writer', 'Assistant', 'Studio', 'Analyst', 'Pilot', 'Lens', 'Forge', 'Scribe', 'Mind', 'Canvas']
+TASKS = [
+    'drafting marketing copy', 'summarizing long documents', 'writing and reviewing code',
+    'generating product images', 'transcribing meetings', 'analyzing spreadsheets',
+    'answering customer questions', 'translating content', 'editing video', 'composing music',
+]
+
+ACCESS_LEVELS = ['Public'] * 6 + ['Premium Only'] * 3 + ['Business Only']
+PRICE_POINTS = ['Free', 'Freemium', 'Subscription', 'Paid', 'Enterprise']
+TIERS = ['Free'] * 7 + ['Premium'] * 2 + ['Business']
+TIER_PRICES = {'Premium': 9.99, 'Business': 29.99}
+ACTIVITY_TYPES = ['login', 'view_tool', 'search_tools', 'view_profile', 'add_favorite']
+
+def insert_rows(model, rows, chunk_size=CHUNK_SIZE):
+    """Insert an iterable of row dicts with one executemany per chunk.
+    
+    Returns the number of rows inserted.
+    """
+    statement = model.__table__.insert()
+    chunk = []
+    count = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(statement, chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(statement, chunk)
+        count += len(chunk)
+    db.session.commit()
+    return count
+
+def next_id(model):
+    """Get the first free primary key of a model's table."""
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+def reset_sequences(*models):
+    """Move PostgreSQL id sequences past the explicitly inserted ids."""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for model in models:
+        table = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+    db.session.commit()
+
+def sample_pairs(rng, count, left, right):
+    """Get up to ``count`` distinct (left, right) pairs of 0-based indexes."""
+    count = min(count, left * right)
+    for pair in rng.sample(range(left * right), count):
+        yield divmod(pair, right)
+
+def generate(tools, users, reviews, favorites, activities, seed=42, days=365,
+             chunk_size=CHUNK_SIZE, derive=True, log=print):
+    """Generate a synthetic dataset and rebuild the derived data.
+    
+    Existing rows are kept; the new ones are added after them. The same
+    ``seed`` always produces the same rows. Pass ``derive=False`` to call
+    ``rebuild_derived`` yourself after further inserts. Returns
+    ``{table: rows added}``.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    span = days * 86400
+    counts = {}
+    
+    def timestamp():
+        return now - timedelta(seconds=rng.randrange(span))
+    
+    def step(name, model, rows):
+        started = time.perf_counter()
+        counts[name] = insert_rows(model, rows, chunk_size)
+        log(f'  {name:<22} {counts[name]:>10,} rows  {time.perf_counter() - started:6.1f}s')
+    
+    # Categories and industries are fixed vocabularies, added if missing
+    existing = {name for name, in db.session.query(Category.name)}
+    step('categories', Category, (
+        {'name': name, 'description': f'AI tools for {name.lower()}', 'icon': icon,
+         'created_at': now, 'updated_at': now}
+        for name, icon in CATEGORIES if name not in existing
+    ))
+    existing = {name for name, in db.session.query(Industry.name)}
+    step('industries', Industry, (
+        {'name': name, 'description': f'{name} organizations', 'created_at': now, 'updated_at': now}
+        for name in INDUSTRIES if name not in existing
+    ))
+    category_ids = [id for id, in db.session.query(Category.id)]
+    industry_ids = [id for id, in db.session.query(Industry.id)]
+    
+    first_user = next_id(User)
+    password_hash = generate_password_hash(SYNTHETIC_PASSWORD)
+    tiers = [rng.choice(TIERS) for _ in range(users)]
+    user_created = [timestamp() for _ in range(users)]
+    
+    def user_rows():
+        for index in range(users):
+            user_id = first_user + index
+            tier = tiers[index]
+            row = {
+                'id': user_id, 'email': f'user{user_id}@example.com', 'password_hash': password_hash,
+                'first_name': 'User', 'last_name': str(user_id), 'company': f'Company {index % 997}',
+                'job_title': 'Analyst', 'industry_id': rng.choice(industry_ids),
+                'subscription_tier': tier, 'subscription_start_date': None, 'subscription_end_date': None,
+                'is_admin': False, 'created_at': user_created[index], 'updated_at': user_created[index],
+            }
+            if tier != 'Free':
+                row['subscription_start_date'] = user_created[index]
+                row['subscription_end_date'] = now + timedelta(days=30)
+            yield row
+    
+    step('users', User, user_rows())
+    
+    first_tool = next_id(AITool)
+    
+    def tool_rows():
+        for index in range(tools):
+            tool_id = first_tool + index
+            task = rng.choice(TASKS)
+            created = timestamp()
+            yield {
+                'id': tool_id,
+                'name': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {tool_id}',
+                'category_id': rng.choice(category_ids),
+                'description': f'An AI tool for {task}. It helps teams spend less time on {task} '
+                               f'and more on the work that matters.',
+                'website_url': f'https://tool{tool_id}.example.com',
+                'image_path': None,
+                'access_level': rng.choice(ACCESS_LEVELS),
+                'rating': 0, 'rating_sum': 0, 'rating_count': 0, 'rating_score': 0,
+                'business_utility': f'Automates {task}.',
+                'price_point_type': rng.choice(PRICE_POINTS),
+                'price_point_details': {'monthly': rng.choice([0, 9, 19, 49, 99])},
+                'created_at': created, 'updated_at': created,
+            }
+    
+    step('ai_tools', AITool, tool_rows())
+    
+    def tool_industry_rows():
+        for index in range(tools):
+            for industry_id in rng.sample(industry_ids, rng.randint(1, min(3, len(industry_ids)))):
+                yield {'tool_id': first_tool + index, 'industry_id': industry_id}
+    
+    step('tool_industries', ToolIndustry, tool_industry_rows())
+    
+    def guide_rows():
+        for index in range(0, tools, 4):
+            yield {
+                'tool_id': first_tool + index, 'title': 'Getting started',
+                'content': 'Sign up, connect your data and run your first task. ' * 10,
+                'author_id': None, 'guide_type': 'Tutorial', 'order_index': 0,
+                'created_at': now, 'updated_at': now,
+            }
+    
+    step('tool_guides', ToolGuide, guide_rows())
+    
+    def review_rows():
+        for user_index, tool_index in sample_pairs(rng, reviews, users, tools):
+            created = timestamp()
+            yield {
+                'user_id': first_user + user_index, 'tool_id': first_tool + tool_index,
+                'rating': rng.choices([1, 2, 3, 4, 5], [1, 1, 3, 6, 5])[0],
+                'comment': 'Useful for our team.', 'is_verified': rng.random() < 0.2,
+                'created_at': created, 'updated_at': created,
+            }
+    
+    step('reviews', Review, review_rows())
+    
+    def favorite_rows():
+        for user_index, tool_index in sample_pairs(rng, favorites, users, tools):
+            created = timestamp()
+            yield {
+                'user_id': first_user + user_index, 'tool_id': first_tool + tool_index,
+                'created_at': created, 'updated_at': created,
+            }
+    
+    step('user_favorites', UserFavorite, favorite_rows())
+    
+    def activity_rows():
+        for _ in range(activities):
+            created = timestamp()
+            yield {
+                'user_id': first_user + rng.randrange(users), 'activity_type': rng.choice(ACTIVITY_TYPES),
+                'details': None, 'created_at': created, 'updated_at': created,
+            }
+    
+    step('user_activity_logs', UserActivityLog, activity_rows() if users else ())
+    
+    def transaction_rows():
+        for index in range(users):
+            tier = tiers[index]
+            if tier == 'Free':
+                continue
+            yield {
+                'user_id': first_user + index, 'amount': TIER_PRICES[tier], 'currency': 'USD',
+                'status': 'completed', 'payment_method': 'card', 'subscription_tier': tier,
+                'transaction_date': user_created[index], 'created_at': user_created[index],
+                'updated_at': user_created[index],
+            }
+    
+    step('payment_transactions', PaymentTransaction, transaction_rows())
+    
+    reset_sequences(User, AITool)
+    
+    if derive:
+        rebuild_derived(log)
+    
+    return counts
+
+def rebuild_derived(log=print):
+    """Recompute what bulk inserts bypass: tool ratings, category tool counts,
+    the search index and the analytics rollups.
+    """
+    started = time.perf_counter()
+    AITool.recompute_ratings()
+    Category.recount_tools()
+    tool_search.rebuild()
+    refresh(rebuild=True)
+    log(f'  {"derived data":<22} {"":>10}       {time.perf_counter() - started:6.1f}s')
@@ -0,0 +1,162 @@
+"""
+Database engine configuration for the AI Directory Platform.
+
+``engine_options`` turns the DB_* and SQLITE_PRAGMAS settings into
+SQLAlchemy engine options for the configured database:
+
+- SQLite: the SQLITE_PRAGMAS (WAL journal, synchronous, busy timeout, page
+  cache and mmap sizes) are applied to every new connection.
+- Server databases: a QueuePool of DB_POOL_SIZE connections per worker
+  process (by default one per gunicorn thread, plus one for the activity
+  log writer), with pre-ping, recycling and, on PostgreSQL, a statement
+  timeout.
+
+Connections are never shared with forked worker processes, so the app can
+be preloaded by gunicorn with any worker class. ``pool_metrics`` counts
+checkouts, the time spent waiting for a pooled connection, and connections
+opened and closed.
+"""
+
+import os
+import threading
+import time
+import weakref
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    """Per-process counters for the connection pool."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {
+            'checkouts': 0,
+            'checkout_timeouts': 0,
+            'checkout_wait_seconds': 0.0,
+            'checkout_wait_max_seconds': 0.0,
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'connections_invalidated': 0,
+        }
+
+    def record_checkout(self, wait, timed_out=False):
+        with self.lock:
+            self.counters['checkouts'] += 1
+            self.counters['checkout_wait_seconds'] += wait
+            if wait > self.counters['checkout_wait_max_seconds']:
+                self.counters['checkout_wait_max_seconds'] = wait
+            if timed_out:
+                self.counters['checkout_timeouts'] += 1
+
+    def increment(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self, engine):
+        """Get the counters plus the pool's current connection counts."""
+        with self.lock:
+            stats = dict(self.counters)
+        pool = engine.pool
+        stats['pool'] = type(pool).__name__
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+            })
+        return stats
+
+pool_metrics = PoolMetrics()
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+def database_uri(uri):
+    """Normalize a DATABASE_URL (``postgres://`` is not accepted by SQLAlchemy)."""
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+def engine_options(config, uri):
+    """Build SQLAlchemy engine options for ``uri`` from the app config.
+
+    Options already in SQLALCHEMY_ENGINE_OPTIONS take precedence.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    options = {}
+
+    if backend != 'sqlite' or url.database not in (None, '', ':memory:'):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+        )
+
+    if backend != 'sqlite':
+        options.update(
+            pool_pre_ping=config['DB_POOL_PRE_PING'],
+            pool_recycle=config['DB_POOL_RECYCLE'],
+        )
+
+    if backend == 'postgresql' and config.get('DB_STATEMENT_TIMEOUT'):
+        options['connect_args'] = {
+            'options': f"-c statement_timeout={int(config['DB_STATEMENT_TIMEOUT'])}"
+        }
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+# Engines whose pools a forked child drops; weak, so apps can be discarded
+_installed_engines = weakref.WeakSet()
+
+def _dispose_after_fork():
+    # A forked worker (gunicorn preload_app) must not reuse the parent's
+    # connections; it drops the inherited pools without closing the sockets
+    for engine in list(_installed_engines):
+        engine.dispose(close=False)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+def install(engine, config):
+    """Register connect-time pragmas and pool metrics on an engine."""
+    _installed_engines.add(engine)
+
+    if engine.dialect.name == 'sqlite':
+        pragmas = [f'PRAGMA {name}={value}' for name, value in config.get('SQLITE_PRAGMAS', {}).items()]
+
+        @event.listens_for(engine, 'connect')
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    @event.listens_for(engine, 'connect')
+    def count_connect(dbapi_connection, connection_record):
+        pool_metrics.increment('connections_opened')
+
+    @event.listens_for(engine, 'close')
+    def count_close(dbapi_connection, connection_record):
+        pool_metrics.increment('connections_closed')
+
+    @event.listens_for(engine, 'invalidate')
+    def count_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.increment('connections_invalidated')
@@ -0,0 +1,129 @@
+"""
+HTTP validators for the AI Directory Platform API.
+
+Views decorated with ``@conditional`` send a strong ``ETag`` and a
+``Cache-Control`` policy, and answer a matching ``If-None-Match`` with
+``304 Not Modified``.
+
+For collection endpoints the ETag is built from the write counters of the
+tables the response is built from (see ``TableVersion``), read with one
+primary key lookup before the view runs, so a revalidation of an unchanged
+collection never loads, scans or serializes rows. The counters of every
+table named in a ``collections`` list are bumped for every transaction that
+writes to it: the session records the tables written by ORM flushes,
+``Session.execute`` DML (bulk updates and inserts) and, for writes issued on
+a raw connection, ``mark_tables_written``, and bumps their counters once it
+commits.
+
+The bump is a short transaction of its own, so writers to the same tables
+queue on a counter row only for that UPDATE, not for the length of their
+whole transaction. Until it lands the ETag is the previous one, which only
+delays revalidation by that long: ETags are read before the response is
+built. A process dying between the two leaves the counters behind until the
+next write to those tables.
+
+Other views get an ETag hashed from the response body.
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .models.table_version import TableVersion
+
+# Tables some collection ETag depends on; only these are versioned
+VERSIONED_TABLES = set()
+
+# session.info key of the versioned tables written in the session's transaction
+WRITTEN_TABLES_KEY = 'http_cache.written_tables'
+
+def mark_tables_written(session, tables):
+    """Have the counters of the versioned tables among ``tables`` bumped when ``session`` commits."""
+    tables = VERSIONED_TABLES.intersection(tables)
+    if tables:
+        session.info.setdefault(WRITTEN_TABLES_KEY, set()).update(tables)
+
+def _written_tables(session):
+    tables = set()
+    for instance in session.new | session.deleted:
+        mapper = inspect(instance).mapper
+        tables.update(table.name for table in mapper.tables)
+        tables.update(rel.secondary.name for rel in mapper.relationships if rel.secondary is not None)
+    for instance in session.dirty:
+        if not session.is_modified(instance):
+            continue
+        state = inspect(instance)
+        tables.update(table.name for table in state.mapper.tables)
+        tables.update(
+            rel.secondary.name for rel in state.mapper.relationships
+            if rel.secondary is not None and state.attrs[rel.key].history.has_changes()
+        )
+    return tables
+
+@event.listens_for(Session, 'before_flush')
+def _mark_flushed_tables(session, flush_context, instances):
+    mark_tables_written(session, _written_tables(session))
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_executed_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_tables_written(orm_execute_state.session, [orm_execute_state.statement.table.name])
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_tables(session):
+    tables = session.info.pop(WRITTEN_TABLES_KEY, None)
+    if tables:
+        with session.get_bind(TableVersion).begin() as connection:
+            TableVersion.bump(connection, tables)
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_written_tables(session):
+    session.info.pop(WRITTEN_TABLES_KEY, None)
+
+def collection_version(*models):
+    """Get the write counters of each model's table."""
+    return TableVersion.current([model.__tablename__ for model in models])
+
+def collection_etag(*models):
+    """Get a strong ETag for the current state of the given tables."""
+    version = (current_app.config['API_VERSION'], request.full_path, collection_version(*models))
+    return hashlib.sha1(repr(version).encode()).hexdigest()
+
+def conditional(cache_control, collections=()):
+    """Add validators and a Cache-Control policy to a view's 200 responses.
+
+    ``collections`` lists the models whose tables the response is built
+    from; without it the ETag is a hash of the body.
+    """
+    VERSIONED_TABLES.update(model.__tablename__ for model in collections)
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag = None
+            if collections:
+                etag = collection_etag(*collections)
+                # Lets the response cache key entries on the same version
+                g.validator = etag
+                if request.if_none_match.contains_weak(etag):
+                    response = current_app.response_class(status=304)
+                    response.set_etag(etag)
+                    response.headers['Cache-Control'] = cache_control
+                    return response
+
+            response = current_app.make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            if etag:
+                response.set_etag(etag)
+            else:
+                response.add_etag()
+            response.headers['Cache-Control'] = cache_control
+            return response.make_conditional(request)
+
+        return wrapper
+    return decorator
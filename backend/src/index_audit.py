@@ -0,0 +1,97 @@
+"""
+Query plan audit for the AI Directory Platform.
+
+``audit()`` runs EXPLAIN on a representative query for each hot route and
+flags plans that scan a whole table or sort rows without an index, so a
+missing or unused index shows up before it shows up in production latency.
+"""
+
+from datetime import datetime, timedelta
+
+from .database import db
+from .models import (
+    AITool, Review, User, UserFavorite, UserActivityLog,
+    PaymentTransaction, Subscription
+)
+
+def audit_queries():
+    """Get ``(label, query)`` pairs mirroring the queries the routes run."""
+    since = datetime.utcnow() - timedelta(days=30)
+
+    return [
+        ('tools.get_tools (default sort=name)',
+         AITool.query.order_by(AITool.name, AITool.id).limit(20)),
+        ('tools.get_tools category (default sort=name)',
+         AITool.query.filter(AITool.category_id == 1).order_by(AITool.name, AITool.id).limit(20)),
+        ('tools.get_tools category, sort=rating',
+         AITool.query.filter(AITool.category_id == 1)
+         .order_by(AITool.rating.desc(), AITool.id.desc()).limit(20)),
+        ('tools.get_tools access_level, sort=created_at',
+         AITool.query.filter(AITool.access_level == 'public')
+         .order_by(AITool.created_at.desc(), AITool.id.desc()).limit(20)),
+        ('tools.get_tools sort=rating',
+         AITool.query.order_by(AITool.rating.desc(), AITool.id.desc()).limit(20)),
+        ('tools.get_tools sort=rating (bayesian)',
+         AITool.query.order_by(AITool.rating_score.desc(), AITool.id.desc()).limit(20)),
+        ('tools.get_tools sort=created_at',
+         AITool.query.order_by(AITool.created_at.desc(), AITool.id.desc()).limit(20)),
+        ('reviews.get_tool_reviews',
+         Review.query.filter(Review.tool_id == 1)
+         .order_by(Review.created_at.desc(), Review.id.desc()).limit(20)),
+        ('reviews.create_review',
+         Review.query.filter_by(user_id=1, tool_id=1).limit(1)),
+        ('tools.add_favorite',
+         UserFavorite.query.filter_by(user_id=1, tool_id=1).limit(1)),
+        ('users.get_favorites',
+         UserFavorite.query.filter_by(user_id=1).order_by(UserFavorite.id).limit(20)),
+        ('auth.login',
+         User.query.filter_by(email='user@example.com').limit(1)),
+        ('user activity',
+         UserActivityLog.query.filter_by(user_id=1)
+         .order_by(UserActivityLog.created_at.desc()).limit(20)),
+        ('admin.get_revenue_stats',
+         PaymentTransaction.query.filter(
+             PaymentTransaction.status == 'completed',
+             PaymentTransaction.transaction_date >= since
+         )),
+        ('subscriptions.get_payment_method',
+         PaymentTransaction.query.filter_by(user_id=1)
+         .order_by(PaymentTransaction.transaction_date.desc()).limit(1)),
+        ('subscriptions.get_subscription',
+         Subscription.query.filter_by(user_id=1, status='active').limit(1)),
+    ]
+
+def _explain(query):
+    dialect = db.engine.dialect
+    compiled = query.statement.compile(dialect=dialect)
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql(prefix + str(compiled), params).all()
+    # SQLite returns (id, parent, notused, detail); PostgreSQL one text column
+    return [row[-1] for row in rows]
+
+def _problems(plan):
+    problems = []
+    for line in plan:
+        detail = line.strip()
+        if detail.startswith('SCAN ') and 'USING' not in detail:
+            problems.append(f'full scan: {detail}')
+        elif 'Seq Scan on' in detail:
+            problems.append(f'full scan: {detail.lstrip("-> ")}')
+        elif 'TEMP B-TREE' in detail:
+            problems.append(f'unindexed sort: {detail}')
+    return problems
+
+def audit():
+    """Explain every audit query.
+
+    Returns ``(label, plan, problems)`` triples; ``problems`` lists the full
+    table scans and unindexed sorts found in the plan.
+    """
+    results = []
+    for label, query in audit_queries():
+        plan = _explain(query)
+        results.append((label, plan, _problems(plan)))
+    return results
@@ -0,0 +1,74 @@
+"""
+Eager-loading query plans for the AI Directory Platform.
+
+Each bundle matches the relationships one serialization shape touches, so a
+page of results is loaded in a fixed number of statements instead of one
+lazy-load SELECT per related row. Apply them with ``query.options(*BUNDLE)``.
+
+Listing cards skip the ORM entirely: ``tool_cards()`` selects just the
+columns ``schemas.TOOL_CARD`` needs, as plain rows.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
+from .database import db
+from .models import AITool, Category, Review, ToolGuide, User, UserFavorite
+
+# Characters of the description shown on a listing card
+SUMMARY_LENGTH = 160
+
+# schemas.USER
+USER = (
+    joinedload(User.industry),
+)
+
+# schemas.REVIEW
+REVIEW = (
+    joinedload(Review.user),
+)
+
+# schemas.GUIDE
+GUIDE = (
+    joinedload(ToolGuide.author),
+)
+
+# Admin summaries that only show the tool's category name
+TOOL_SUMMARY = (
+    joinedload(AITool.category),
+)
+
+# schemas.TOOL_LIST (guide summaries: no content, no authors)
+TOOL = (
+    joinedload(AITool.category),
+    selectinload(AITool.industries),
+    selectinload(AITool.guides).load_only(
+        ToolGuide.id, ToolGuide.tool_id, ToolGuide.title,
+        ToolGuide.guide_type, ToolGuide.order_index
+    ),
+)
+
+# schemas.TOOL_CARD; rating_score and created_at back the sort cursors
+TOOL_CARD = (
+    AITool.id, AITool.name,
+    func.substr(AITool.description, 1, SUMMARY_LENGTH).label('summary'),
+    AITool.image_path, AITool.access_level, AITool.rating, AITool.rating_count,
+    AITool.rating_score, AITool.price_point_type, AITool.category_id,
+    Category.name.label('category_name'), AITool.created_at,
+)
+
+def tool_cards(*columns):
+    """Query ``TOOL_CARD`` rows (plus ``columns``) without loading AITool objects."""
+    return db.session.query(*TOOL_CARD, *columns).outerjoin(Category, Category.id == AITool.category_id)
+
+# schemas.TOOL_DETAIL
+TOOL_DETAIL = (
+    joinedload(AITool.category),
+    selectinload(AITool.industries),
+    selectinload(AITool.guides).options(*GUIDE),
+    selectinload(AITool.reviews).options(*REVIEW),
+)
+
+# schemas.FAVORITE
+FAVORITE = (
+    selectinload(UserFavorite.tool).options(*TOOL),
+)
@@ -2,8 +2,9 @@
 Main application module for the AI Directory Platform.
 """
 
+import hmac
 import os
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_limiter import Limiter
@@ -12,6 +13,15 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .config import config
 from .database import init_app as init_db
+from .json_provider import init_app as init_json
+from .search import tool_search
+from .activity import activity_log
+from .cache import response_cache
+from .profiling import request_profiler
+from .metrics import metrics
+from .commands import register_commands
+from .utils import InvalidCursor, format_error
+from .schemas import InvalidFields
 from .routes.auth import auth_bp
 from .routes.tools import tools_bp
 from .routes.users import users_bp
@@ -28,6 +38,9 @@ def create_app(config_name='default'):
     # Load configuration
     app.config.from_object(config[config_name])
     
+    # Install the JSON encoder used by jsonify
+    init_json(app)
+    
     # Configure middleware
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1)
     
@@ -44,6 +57,21 @@ def create_app(config_name='default'):
     # Initialize database
     init_db(app)
     
+    # Initialize the tool search index
+    tool_search.init_app(app)
+    
+    # Initialize the buffered activity log writer
+    activity_log.init_app(app)
+    
+    # Initialize the response cache
+    response_cache.init_app(app)
+    
+    # Initialize request profiling (opt-in with PROFILING_ENABLED)
+    request_profiler.init_app(app)
+    
+    # Initialize Prometheus metrics
+    metrics.init_app(app)
+    
     # Create upload directory if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
@@ -57,6 +85,9 @@ def create_app(config_name='default'):
     app.register_blueprint(subscriptions_bp)
     app.register_blueprint(admin_bp)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # Root route
     @app.route('/')
     def index():
@@ -76,6 +107,16 @@ def create_app(config_name='default'):
             'message': 'AI Directory API is running'
         })
     
+    # Prometheus metrics, exempt from rate limiting so scrapes are never rejected
+    if app.config['METRICS_ENABLED']:
+        @app.route('/metrics')
+        @limiter.exempt
+        def prometheus_metrics():
+            token = app.config['METRICS_TOKEN']
+            if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+                return format_error('A valid metrics token is required', 'UNAUTHORIZED', status_code=401)
+            return Response(metrics.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    
     # Serve uploaded files
     @app.route('/uploads/<path:filename>')
     def uploaded_file(filename):
@@ -102,6 +143,14 @@ def create_app(config_name='default'):
             }
         }), 405
     
+    @app.errorhandler(InvalidCursor)
+    def invalid_cursor(error):
+        return format_error(str(error), "INVALID_CURSOR")
+    
+    @app.errorhandler(InvalidFields)
+    def invalid_fields(error):
+        return format_error(str(error), "INVALID_FIELDS")
+    
     @app.errorhandler(500)
     def internal_server_error(error):
         return jsonify({
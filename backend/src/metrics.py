@@ -0,0 +1,383 @@
+"""
+Prometheus metrics for the AI Directory Platform.
+
+``GET /metrics`` serves, in the Prometheus text exposition format:
+
+- request counts by blueprint, endpoint, method and status, and latency
+  histograms by blueprint and endpoint
+- requests rejected by the rate limiter (429 responses)
+- database pool checkouts, waits, timeouts and connection counts, and the
+  pool's current size, checked out, idle and overflow connections
+- response cache lookups by result, stores, invalidations, bytes and size
+- activity log queue depth and written/dropped events
+
+Every worker process counts its own requests. Gunicorn's preforked
+workers each answer a scrape with only their share, so with METRICS_DIR
+set every process also writes its series to ``<METRICS_DIR>/<pid>.json``
+(atomically, at most every METRICS_FLUSH_INTERVAL seconds) and a scrape
+merges the files of all processes: counters and histograms are summed,
+and gauges are reported per live process with a ``pid`` label. When a
+worker exits, its counters are folded into ``archive.json`` so totals
+stay monotonic across worker restarts (see ``archive_process`` and the
+hooks in gunicorn_config.py).
+"""
+
+import bisect
+import glob
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, request
+
+from .activity import activity_log
+from .cache import response_cache
+from .database import db
+from .engine import pool_metrics
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
+# Upper bounds in seconds of the request latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Type and help text of every metric family
+FAMILIES = {
+    'http_requests_total': ('counter', 'HTTP requests by blueprint, endpoint, method and status.'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by blueprint and endpoint.'),
+    'http_rate_limited_total': ('counter', 'Requests rejected by the rate limiter.'),
+    'db_pool_checkouts_total': ('counter', 'Connections checked out of the pool.'),
+    'db_pool_checkout_timeouts_total': ('counter', 'Checkouts that timed out waiting for a connection.'),
+    'db_pool_checkout_wait_seconds_total': ('counter', 'Time spent waiting for a pooled connection.'),
+    'db_pool_connections_opened_total': ('counter', 'Database connections opened.'),
+    'db_pool_connections_closed_total': ('counter', 'Database connections closed.'),
+    'db_pool_connections_invalidated_total': ('counter', 'Database connections invalidated.'),
+    'db_pool_size': ('gauge', 'Configured connections of the pool.'),
+    'db_pool_checked_out': ('gauge', 'Connections currently checked out.'),
+    'db_pool_idle': ('gauge', 'Connections currently idle in the pool.'),
+    'db_pool_overflow': ('gauge', 'Connections currently open beyond the pool size.'),
+    'response_cache_lookups_total': ('counter', 'Response cache lookups by result.'),
+    'response_cache_stores_total': ('counter', 'Responses stored in the cache.'),
+    'response_cache_invalidations_total': ('counter', 'Response cache tag invalidations.'),
+    'response_cache_served_bytes_total': ('counter', 'Bytes served from the response cache.'),
+    'response_cache_stored_bytes_total': ('counter', 'Bytes stored in the response cache.'),
+    'response_cache_evictions_total': ('counter', 'Entries evicted from the in-memory response cache.'),
+    'response_cache_entries': ('gauge', 'Entries in the in-memory response cache.'),
+    'response_cache_bytes': ('gauge', 'Bytes held by the in-memory response cache.'),
+    'activity_log_queue_depth': ('gauge', 'Activity events waiting to be written.'),
+    'activity_log_written_total': ('counter', 'Activity events written to the database.'),
+    'activity_log_dropped_total': ('counter', 'Activity events dropped.'),
+}
+
+ARCHIVE = 'archive.json'
+LOCK = '.lock'
+
+def _labels(**labels):
+    return tuple(sorted(labels.items()))
+
+class Metrics:
+    """Flask extension counting requests and rendering the /metrics exposition."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.engine = None
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.durations = {}
+        self.rejections = defaultdict(int)
+        self.enabled = False
+        self.directory = None
+        self.thread = None
+        self.pid = None
+        self.stopping = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.directory = app.config.get('METRICS_DIR') or None
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 1.0)
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        with app.app_context():
+            self.engine = db.engine
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _ensure_flusher(self):
+        # Started lazily so each forked gunicorn worker gets its own thread
+        if self.directory is None or (self.thread is not None and self.pid == os.getpid()):
+            return
+
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.stopping.clear()
+                self.thread = threading.Thread(target=self._run, name='metrics-flusher', daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while not self.stopping.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError:
+                self.app.logger.exception('Failed to write metrics to %s', self.directory)
+
+    def _start(self):
+        g.metrics_started = time.perf_counter()
+
+    def _finish(self, response):
+        # The rate limiter rejects requests before _start runs, so they are
+        # counted without a duration
+        started = g.pop('metrics_started', None)
+        blueprint = request.blueprint or 'app'
+        endpoint = request.endpoint or 'unmatched'
+        status = response.status_code
+
+        with self.lock:
+            self.requests[blueprint, endpoint, request.method, status] += 1
+            if status == 429:
+                self.rejections[blueprint, endpoint] += 1
+            if started is not None:
+                duration = time.perf_counter() - started
+                histogram = self.durations.get((blueprint, endpoint))
+                if histogram is None:
+                    histogram = self.durations[blueprint, endpoint] = [0] * (len(BUCKETS) + 1) + [0.0]
+                histogram[bisect.bisect_left(BUCKETS, duration)] += 1
+                histogram[-1] += duration
+
+        self._ensure_flusher()
+        return response
+
+    def collect(self):
+        """Get this process's series as ``{'counters': ..., 'histograms': ..., 'gauges': ...}``.
+
+        Counters and gauges map ``(name, labels)`` to a value; histograms map
+        it to per-bucket counts (the last one for +Inf) followed by the sum.
+        """
+        with self.lock:
+            counters = {
+                ('http_requests_total', _labels(blueprint=blueprint, endpoint=endpoint,
+                                                method=method, status=str(status))): count
+                for (blueprint, endpoint, method, status), count in self.requests.items()
+            }
+            counters.update({
+                ('http_rate_limited_total', _labels(blueprint=blueprint, endpoint=endpoint)): count
+                for (blueprint, endpoint), count in self.rejections.items()
+            })
+            histograms = {
+                ('http_request_duration_seconds', _labels(blueprint=blueprint, endpoint=endpoint)): list(values)
+                for (blueprint, endpoint), values in self.durations.items()
+            }
+        gauges = {}
+
+        pool = pool_metrics.stats(self.engine)
+        for key in ('checkouts', 'checkout_timeouts', 'checkout_wait_seconds'):
+            counters[f'db_pool_{key}_total', ()] = pool[key]
+        for key in ('opened', 'closed', 'invalidated'):
+            counters[f'db_pool_connections_{key}_total', ()] = pool[f'connections_{key}']
+        for key in ('pool_size', 'checked_out', 'idle', 'overflow'):
+            if key in pool:
+                gauges['db_pool_' + key.replace('pool_', ''), ()] = pool[key]
+
+        with self.app.app_context():
+            cache = response_cache.stats()
+        if cache['backend'] is not None:
+            counters['response_cache_lookups_total', _labels(result='hit')] = cache['hits']
+            counters['response_cache_lookups_total', _labels(result='miss')] = cache['misses']
+            counters['response_cache_stores_total', ()] = cache['stores']
+            counters['response_cache_invalidations_total', ()] = cache['invalidations']
+            counters['response_cache_served_bytes_total', ()] = cache['bytes_served']
+            counters['response_cache_stored_bytes_total', ()] = cache['bytes_stored']
+            if 'evictions' in cache:
+                counters['response_cache_evictions_total', ()] = cache['evictions']
+                gauges['response_cache_entries', ()] = cache['entries']
+                gauges['response_cache_bytes', ()] = cache['bytes']
+
+        activity = activity_log.stats()
+        gauges['activity_log_queue_depth', ()] = activity['queue_depth']
+        counters['activity_log_written_total', ()] = activity['written']
+        counters['activity_log_dropped_total', ()] = activity['dropped']
+
+        return {'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+    def flush(self):
+        """Write this process's series to its file in METRICS_DIR."""
+        if self.directory is None:
+            return
+        _write_json(os.path.join(self.directory, f'{os.getpid()}.json'), _dump(self.collect()))
+
+    def stop(self):
+        """Stop the flusher thread and write the final series."""
+        self.stopping.set()
+        if self.thread is not None and self.pid == os.getpid():
+            self.thread.join(timeout=self.flush_interval + 5)
+            self.flush()
+
+    def exposition(self):
+        """Render every process's series in the Prometheus text format."""
+        if self.directory is None:
+            return render(self.collect())
+
+        self.flush()
+        with _locked(self.directory, exclusive=False):
+            merged = {'counters': defaultdict(float), 'histograms': {}, 'gauges': {}}
+            archive = _read_json(os.path.join(self.directory, ARCHIVE))
+            if archive is not None:
+                _merge(merged, _load(archive))
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                name = os.path.basename(path)[:-len('.json')]
+                if not name.isdigit():
+                    continue
+                data = _read_json(path)
+                if data is None:
+                    continue
+                series = _load(data)
+                # Gauges of exited processes are stale; their counters still count
+                if not _alive(int(name)):
+                    series['gauges'] = {}
+                _merge(merged, series, pid=name)
+        return render(merged)
+
+metrics = Metrics()
+
+def render(series):
+    """Format ``collect()``-shaped series as Prometheus text exposition."""
+    families = defaultdict(list)
+    for kind in ('counters', 'gauges'):
+        for (name, labels), value in series[kind].items():
+            families[name].append((labels, [f'{name}{_format_labels(labels)} {_format_value(value)}']))
+    for (name, labels), values in series['histograms'].items():
+        lines, cumulative = [], 0
+        for bound, count in zip(BUCKETS + (math.inf,), values):
+            cumulative += count
+            bucket_labels = labels + (('le', _format_value(bound)),)
+            lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(values[-1])}')
+        lines.append(f'{name}_count{_format_labels(labels)} {_format_value(cumulative)}')
+        families[name].append((labels, lines))
+
+    lines = []
+    for name in sorted(families):
+        kind, description = FAMILIES[name]
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for _, series_lines in sorted(families[name]):
+            lines.extend(series_lines)
+    return '\n'.join(lines) + '\n'
+
+def archive_process(directory, pid):
+    """Fold an exited process's counters and histograms into ``archive.json``.
+
+    Called by gunicorn's master when a worker exits, so the directory holds
+    one file per live worker plus the archive.
+    """
+    path = os.path.join(directory, f'{pid}.json')
+    with _locked(directory, exclusive=True):
+        data = _read_json(path)
+        if data is None:
+            return
+        merged = {'counters': defaultdict(float), 'histograms': {}, 'gauges': {}}
+        archive = _read_json(os.path.join(directory, ARCHIVE))
+        if archive is not None:
+            _merge(merged, _load(archive))
+        series = _load(data)
+        series['gauges'] = {}
+        _merge(merged, series)
+        _write_json(os.path.join(directory, ARCHIVE), _dump(merged))
+        os.remove(path)
+
+def clear_directory(directory):
+    """Remove the series files of a previous run."""
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+
+def _merge(merged, series, pid=None):
+    for key, value in series['counters'].items():
+        merged['counters'][key] += value
+    for key, values in series['histograms'].items():
+        total = merged['histograms'].get(key)
+        merged['histograms'][key] = values if total is None else [a + b for a, b in zip(total, values)]
+    for (name, labels), value in series['gauges'].items():
+        if pid is not None:
+            labels = tuple(sorted(labels + (('pid', pid),)))
+        merged['gauges'][name, labels] = value
+
+def _dump(series):
+    return {kind: [[name, [list(label) for label in labels], value]
+                   for (name, labels), value in series[kind].items()]
+            for kind in ('counters', 'histograms', 'gauges')}
+
+def _load(data):
+    return {kind: {(name, tuple(tuple(label) for label in labels)): value
+                   for name, labels, value in data.get(kind, [])}
+            for kind in ('counters', 'histograms', 'gauges')}
+
+def _write_json(path, data):
+    # Written to a temporary file and renamed, so readers never see a partial file
+    descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(descriptor, 'w') as file:
+        json.dump(data, file, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+class _locked:
+    """Hold a shared or exclusive lock on the metrics directory."""
+
+    def __init__(self, directory, exclusive):
+        self.path = os.path.join(directory, LOCK)
+        self.exclusive = exclusive
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
@@ -0,0 +1,99 @@
+"""
+Schema migrations for existing AI Directory Platform databases.
+
+``db.create_all()`` creates missing tables but never alters existing ones.
+``upgrade()`` adds any model columns and indexes an older database is
+missing, running the backfill registered for each added column and the
+preparation registered for each added index.
+"""
+
+from sqlalchemy import inspect, text
+from .database import db
+
+def _backfill_category_tool_counts():
+    from .models import Category
+    Category.recount_tools()
+
+def _backfill_tool_ratings():
+    from .models import AITool
+    AITool.recompute_ratings()
+
+# Data backfills to run after a column is added, keyed by "table.column"
+BACKFILLS = {
+    'categories.tools_count': _backfill_category_tool_counts,
+    'ai_tools.rating_sum': _backfill_tool_ratings,
+}
+
+def _dedupe_favorites():
+    # Keep the oldest row of each (user_id, tool_id) pair
+    db.session.execute(text(
+        "DELETE FROM user_favorites WHERE id NOT IN "
+        "(SELECT min(id) FROM user_favorites GROUP BY user_id, tool_id)"
+    ))
+
+# Data fixes to run before an index is created, keyed by index name
+INDEX_PREPARES = {
+    'uq_user_favorites_user_id_tool_id': _dedupe_favorites,
+}
+
+def _column_ddl(column):
+    """Render the column definition used in ALTER TABLE ... ADD COLUMN."""
+    ddl = f'{column.name} {column.type.compile(dialect=db.engine.dialect)}'
+    
+    if column.server_default is not None:
+        ddl += f' DEFAULT {column.server_default.arg}'
+        if not column.nullable:
+            ddl += ' NOT NULL'
+    
+    return ddl
+
+def _add_indexes(inspector):
+    """Create model indexes missing from existing tables."""
+    added = []
+    
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing:
+                continue
+            
+            prepare = INDEX_PREPARES.get(index.name)
+            if prepare:
+                prepare()
+            index.create(db.session.connection())
+            added.append(index.name)
+    
+    db.session.commit()
+    return added
+
+def upgrade():
+    """Add missing columns and indexes to existing tables.
+    
+    Returns the list of ``table.column`` and index names that were added.
+    """
+    inspector = inspect(db.engine)
+    added = []
+    
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            
+            db.session.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {_column_ddl(column)}'))
+            added.append(f'{table.name}.{column.name}')
+    
+    db.session.commit()
+    
+    for name in added:
+        backfill = BACKFILLS.get(name)
+        if backfill:
+            backfill()
+    
+    return added + _add_indexes(inspector)
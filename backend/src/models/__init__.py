@@ -9,6 +9,11 @@ from src.models.user_activity_log import UserActivityLog
 from src.models.payment_transaction import PaymentTransaction
 from src.models.subscription import Subscription
 from src.models.tool_guide import ToolGuide
+from src.models.analytics_rollup import (
+    DailySignupRollup, DailyRevenueRollup, DailyToolRollup,
+    ToolRollupTotal, RollupWatermark, RollupTotal
+)
+from src.models.table_version import TableVersion
 
 __all__ = [
     'User',
@@ -21,6 +26,13 @@ __all__ = [
     'UserActivityLog',
     'PaymentTransaction',
     'Subscription',
-    'ToolGuide'
+    'ToolGuide',
+    'DailySignupRollup',
+    'DailyRevenueRollup',
+    'DailyToolRollup',
+    'ToolRollupTotal',
+    'RollupWatermark',
+    'RollupTotal',
+    'TableVersion'
 ]
 
@@ -1,9 +1,22 @@
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import Float, case, cast, event, func, inspect, select, update
+from sqlalchemy.orm import object_session
 from src.database import db
 
 class AITool(db.Model):
     __tablename__ = 'ai_tools'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Listing filters and sorts; the trailing id matches the keyset tiebreaker
+        db.Index('ix_ai_tools_name', 'name', 'id'),
+        db.Index('ix_ai_tools_category_id_name', 'category_id', 'name', 'id'),
+        db.Index('ix_ai_tools_category_id_rating', 'category_id', 'rating', 'id'),
+        db.Index('ix_ai_tools_access_level_created_at', 'access_level', 'created_at', 'id'),
+        db.Index('ix_ai_tools_rating', 'rating', 'id'),
+        db.Index('ix_ai_tools_rating_score', 'rating_score', 'id'),
+        db.Index('ix_ai_tools_created_at', 'created_at', 'id'),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
@@ -14,6 +27,13 @@ class AITool(db.Model):
     access_level = db.Column(db.String(50), nullable=False, default='public')
     rating = db.Column(db.Float, default=0)
     
+    # Denormalized review aggregates, adjusted by update_rating in the same
+    # transaction as each review write
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bayesian average that pulls tools with few reviews towards the prior
+    rating_score = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    
     # New fields
     business_utility = db.Column(db.Text)
     price_point_type = db.Column(db.String(50))  # Free, Freemium, Paid, Enterprise, etc.
@@ -32,22 +52,100 @@ class AITool(db.Model):
     def __repr__(self):
         return f'<AITool {self.name}>'
 
-    def to_dict(self):
+    @staticmethod
+    def _rating_values(rating_sum, rating_count):
+        """Build the rating/rating_score expressions for the given aggregates."""
+        prior_mean = current_app.config.get('RATING_PRIOR_MEAN', 3.0)
+        prior_weight = current_app.config.get('RATING_PRIOR_WEIGHT', 5)
+        
         return {
-            'id': self.id,
-            'name': self.name,
-            'category': self.category.to_dict() if self.category else None,
-            'description': self.description,
-            'website_url': self.website_url,
-            'image_path': self.image_path,
-            'access_level': self.access_level,
-            'rating': self.rating,
-            'business_utility': self.business_utility,
-            'price_point_type': self.price_point_type,
-            'price_point_details': self.price_point_details,
-            'industries': [industry.to_dict() for industry in self.industries],
-            'guides': [guide.to_dict() for guide in self.guides],
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'rating': case(
+                (rating_count > 0, cast(rating_sum, Float) / rating_count),
+                else_=0.0
+            ),
+            'rating_score': case(
+                (rating_count + prior_weight > 0,
+                 (cast(rating_sum, Float) + prior_mean * prior_weight) / (rating_count + prior_weight)),
+                else_=0.0
+            )
         }
+    
+    def update_rating(self, rating_delta, count_delta=0):
+        """Atomically apply a review change to the tool's rating aggregates.
+        
+        Pass ``(rating, 1)`` for a new review, ``(new - old, 0)`` for an edited
+        rating and ``(-rating, -1)`` for a deleted review. The UPDATE runs in
+        the current transaction, so commit it together with the review write.
+        """
+        table = AITool.__table__
+        rating_sum = table.c.rating_sum + rating_delta
+        rating_count = table.c.rating_count + count_delta
+        
+        db.session.execute(
+            table.update()
+            .where(table.c.id == self.id)
+            .values(
+                rating_sum=rating_sum,
+                rating_count=rating_count,
+                **AITool._rating_values(rating_sum, rating_count)
+            )
+        )
+        db.session.expire(self, ['rating', 'rating_sum', 'rating_count', 'rating_score', 'updated_at'])
+    
+    @classmethod
+    def recompute_ratings(cls):
+        """Recompute every tool's rating aggregates from the reviews table."""
+        from src.models.review import Review
+        
+        rating_sum = select(func.coalesce(func.sum(Review.rating), 0)).where(
+            Review.tool_id == cls.id
+        ).scalar_subquery()
+        rating_count = select(func.count(Review.id)).where(
+            Review.tool_id == cls.id
+        ).scalar_subquery()
+        
+        db.session.execute(
+            update(cls).values(
+                rating_sum=rating_sum,
+                rating_count=rating_count,
+                **cls._rating_values(rating_sum, rating_count)
+            ),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+
+def _category_key(category_id):
+    return int(category_id) if category_id not in (None, '') else None
+
+def _mark_categories_written(tool):
+    # The counters are updated on the flush's connection, where the
+    # session-level version hooks do not see them
+    from src.http_cache import mark_tables_written
+    from src.models.category import Category
+    mark_tables_written(object_session(tool), [Category.__tablename__])
+
+@event.listens_for(AITool, 'after_insert')
+def _count_inserted_tool(mapper, connection, tool):
+    from src.models.category import Category
+    Category.adjust_tool_count(connection, _category_key(tool.category_id), 1)
+    _mark_categories_written(tool)
+
+@event.listens_for(AITool, 'after_delete')
+def _count_deleted_tool(mapper, connection, tool):
+    from src.models.category import Category
+    Category.adjust_tool_count(connection, _category_key(tool.category_id), -1)
+    _mark_categories_written(tool)
+
+@event.listens_for(AITool, 'after_update')
+def _count_moved_tool(mapper, connection, tool):
+    from src.models.category import Category
+    history = inspect(tool).attrs.category_id.history
+    if not history.deleted:
+        return
 
+    old_category_id = _category_key(history.deleted[0])
+    new_category_id = _category_key(tool.category_id)
+    if old_category_id != new_category_id:
+        Category.adjust_tool_count(connection, old_category_id, -1)
+        Category.adjust_tool_count(connection, new_category_id, 1)
+        _mark_categories_written(tool)
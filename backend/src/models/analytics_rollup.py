@@ -0,0 +1,105 @@
+"""
+Analytics rollup models for the AI Directory Platform.
+
+Daily summaries behind the admin dashboard, refreshed incrementally by
+``flask rollups-refresh`` (see src/rollups.py).
+"""
+
+from ..database import db
+
+class DailySignupRollup(db.Model):
+    """Number of users who signed up on a day, per subscription tier."""
+    
+    __tablename__ = 'daily_signup_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'subscription_tier'),
+        {'extend_existing': True}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    subscription_tier = db.Column(db.String(50), nullable=False)
+    signups = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DailySignupRollup {self.day} {self.subscription_tier}>'
+
+class DailyRevenueRollup(db.Model):
+    """Completed payment revenue on a day, per subscription tier."""
+    
+    __tablename__ = 'daily_revenue_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'subscription_tier'),
+        {'extend_existing': True}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    subscription_tier = db.Column(db.String(50), nullable=False)
+    amount = db.Column(db.Float, nullable=False, default=0)
+    transactions = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DailyRevenueRollup {self.day} {self.subscription_tier}>'
+
+class DailyToolRollup(db.Model):
+    """Reviews and favorites a tool received on a day."""
+    
+    __tablename__ = 'daily_tool_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'tool_id'),
+        {'extend_existing': True}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    tool_id = db.Column(db.Integer, nullable=False, index=True)
+    reviews = db.Column(db.Integer, nullable=False, default=0)
+    favorites = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DailyToolRollup {self.day} {self.tool_id}>'
+
+class ToolRollupTotal(db.Model):
+    """Running review and favorite totals per tool, up to the rollup watermark."""
+    
+    __tablename__ = 'tool_rollup_totals'
+    __table_args__ = {'extend_existing': True}
+    
+    tool_id = db.Column(db.Integer, primary_key=True)
+    reviews = db.Column(db.Integer, nullable=False, default=0)
+    favorites = db.Column(db.Integer, nullable=False, default=0, index=True)
+    
+    def __repr__(self):
+        return f'<ToolRollupTotal {self.tool_id}>'
+
+class RollupWatermark(db.Model):
+    """Exclusive upper bound of the data a rollup has summarized."""
+    
+    __tablename__ = 'rollup_watermarks'
+    __table_args__ = {'extend_existing': True}
+    
+    name = db.Column(db.String(50), primary_key=True)
+    rolled_until = db.Column(db.DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f'<RollupWatermark {self.name} {self.rolled_until}>'
+
+class RollupTotal(db.Model):
+    """One shard of a running total, kept exact by mapper events.
+    
+    A total is the sum of its ``SHARDS`` rows. Each write adjusts the shard
+    picked by its row id, so concurrent writers rarely wait on the same row.
+    """
+    
+    SHARDS = 8
+    
+    __tablename__ = 'rollup_totals'
+    __table_args__ = {'extend_existing': True}
+    
+    name = db.Column(db.String(50), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<RollupTotal {self.name}[{self.shard}] {self.value}>'
@@ -2,6 +2,7 @@
 Category model for the AI Directory Platform.
 """
 
+from sqlalchemy import func, select, update
 from ..database import db, BaseModel
 
 class Category(db.Model, BaseModel):
@@ -15,21 +16,36 @@ class Category(db.Model, BaseModel):
     description = db.Column(db.Text)
     icon = db.Column(db.String(100))
     
+    # Denormalized count of ai_tools rows, maintained by the AITool mapper events
+    tools_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     def tool_count(self):
         """Get the number of tools in this category."""
-        return len(self.tools)
+        return self.tools_count or 0
+    
+    @classmethod
+    def adjust_tool_count(cls, connection, category_id, delta):
+        """Atomically add ``delta`` to a category's tool counter."""
+        if category_id is None:
+            return
+        
+        connection.execute(
+            cls.__table__.update()
+            .where(cls.__table__.c.id == category_id)
+            .values(tools_count=cls.__table__.c.tools_count + delta)
+        )
     
-    def to_dict(self):
-        """Convert the model instance to a dictionary."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'icon': self.icon,
-            'tool_count': self.tool_count(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    @classmethod
+    def recount_tools(cls):
+        """Recompute every category's tool counter from the ai_tools table."""
+        from .ai_tool import AITool
+        
+        count = select(func.count(AITool.id)).where(
+            AITool.category_id == cls.id
+        ).scalar_subquery()
+        
+        db.session.execute(update(cls).values(tools_count=count))
+        db.session.commit()
     
     def __repr__(self):
         return f'<Category {self.name}>'
@@ -14,16 +14,6 @@ class Industry(db.Model, BaseModel):
     name = db.Column(db.String(100), nullable=False, unique=True)
     description = db.Column(db.Text)
     
-    def to_dict(self):
-        """Convert the model instance to a dictionary."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
-    
     def __repr__(self):
         return f'<Industry {self.name}>'
 
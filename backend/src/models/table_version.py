@@ -0,0 +1,55 @@
+"""
+Table version model for the AI Directory Platform.
+"""
+
+from sqlalchemy import exc, select
+
+from ..database import db
+
+class TableVersion(db.Model):
+    """Write counter of a table, bumped after every transaction that writes to it.
+
+    Collection ETags (see src/http_cache.py) are built from these counters,
+    so revalidating a collection costs a primary key lookup rather than a
+    scan of its tables.
+    """
+
+    __tablename__ = 'table_versions'
+    __table_args__ = {'extend_existing': True}
+
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def ensure(cls, names):
+        """Add the missing counter rows for the given table names."""
+        existing = {name for name, in db.session.execute(select(cls.name))}
+        missing = [{'name': name, 'version': 0} for name in sorted(set(names) - existing)]
+        if not missing:
+            return
+
+        try:
+            db.session.execute(cls.__table__.insert(), missing)
+            db.session.commit()
+        except exc.IntegrityError:
+            # Another worker added them first
+            db.session.rollback()
+
+    @classmethod
+    def bump(cls, connection, names):
+        """Increment the counters of the given tables on ``connection``."""
+        table = cls.__table__
+        # One row at a time in a fixed order, so concurrent writers lock them alike
+        for name in sorted(names):
+            connection.execute(
+                table.update().where(table.c.name == name).values(version=table.c.version + 1)
+            )
+
+    @classmethod
+    def current(cls, names):
+        """Get the counters of the given tables, in order."""
+        versions = dict(db.session.execute(select(cls.name, cls.version).where(cls.name.in_(names))).all())
+        return tuple(versions.get(name, 0) for name in names)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name} {self.version}>'
@@ -20,17 +20,3 @@ class ToolGuide(db.Model):
 
     def __repr__(self):
         return f'<ToolGuide {self.title}>'
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'tool_id': self.tool_id,
-            'title': self.title,
-            'content': self.content,
-            'author': self.author.to_dict() if self.author else None,
-            'guide_type': self.guide_type,
-            'order_index': self.order_index,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-
@@ -46,35 +46,6 @@ class User(db.Model, BaseModel):
         """Check password."""
         return check_password_hash(self.password_hash, password)
     
-    def to_dict(self):
-        """Convert the model instance to a dictionary."""
-        data = {
-            'id': self.id,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'company': self.company,
-            'job_title': self.job_title,
-            'subscription_tier': self.subscription_tier,
-            'is_admin': self.is_admin,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
-        
-        if self.industry:
-            data['industry'] = {
-                'id': self.industry.id,
-                'name': self.industry.name
-            }
-        
-        if self.subscription_start_date:
-            data['subscription_start_date'] = self.subscription_start_date.isoformat()
-        
-        if self.subscription_end_date:
-            data['subscription_end_date'] = self.subscription_end_date.isoformat()
-        
-        return data
-    
     def __repr__(self):
         return f'<User {self.email}>'
 
@@ -2,13 +2,17 @@
 User Activity Log model for the AI Directory Platform.
 """
 
+from flask import current_app
 from ..database import db, BaseModel
 
 class UserActivityLog(db.Model, BaseModel):
     """User Activity Log model for tracking user activity."""
     
     __tablename__ = 'user_activity_logs'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index('ix_user_activity_logs_user_id_created_at', 'user_id', 'created_at'),
+        {'extend_existing': True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -17,7 +21,17 @@ class UserActivityLog(db.Model, BaseModel):
     
     @classmethod
     def log_activity(cls, user_id, activity_type, details=None):
-        """Log a user activity."""
+        """Log a user activity.
+        
+        When the buffered writer is enabled (ACTIVITY_LOG_ASYNC) the event is
+        queued for a background bulk insert and None is returned. Otherwise
+        the row is committed immediately and returned.
+        """
+        writer = current_app.extensions.get('activity_log')
+        if writer is not None and writer.enabled:
+            writer.enqueue(user_id, activity_type, details)
+            return None
+        
         log = cls(
             user_id=user_id,
             activity_type=activity_type,
@@ -27,16 +41,6 @@ class UserActivityLog(db.Model, BaseModel):
         db.session.commit()
         return log
     
-    def to_dict(self):
-        """Convert the model instance to a dictionary."""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'activity_type': self.activity_type,
-            'details': self.details,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-    
     def __repr__(self):
         return f'<UserActivityLog {self.id}>'
 
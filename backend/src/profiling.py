@@ -0,0 +1,278 @@
+"""
+Request profiling for the AI Directory Platform.
+
+With PROFILING_ENABLED every request records its wall time, the time and
+number of SQL statements it executed, the time spent serializing JSON in
+``format_response``/``format_error``, and its slowest statements. These
+are sent back in a ``Server-Timing`` header (shown by browser dev tools),
+written as one JSON log line on the ``src.profiling`` logger and summed
+per endpoint for ``/profiling/stats``.
+
+Admins can also capture a profile of a single request by sending an
+``X-Profile`` header or a ``_profile`` query parameter:
+
+- ``folded`` (or ``1``): a sampling profile of the request's thread as
+  folded stacks, one ``frame;frame;frame count`` line per distinct stack,
+  ready for flamegraph.pl or speedscope
+- ``cprofile``: cProfile statistics sorted by cumulative time
+
+The profile replaces the response body. The request still runs normally,
+so captures of writes take effect.
+"""
+
+import cProfile
+import heapq
+import io
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from sqlalchemy import event
+
+from .database import db
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = {'1': 'folded', 'folded': 'folded', 'cprofile': 'cprofile'}
+
+class RequestProfile:
+    """Timings collected for one request."""
+
+    __slots__ = ('started', 'db_time', 'statements', 'serialize_time', 'slowest', 'statement_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.statements = 0
+        self.serialize_time = 0.0
+        self.slowest = []
+        self.statement_started = None
+
+    def record_statement(self, statement, duration, keep):
+        self.db_time += duration
+        self.statements += 1
+        entry = (duration, self.statements, statement)
+        if len(self.slowest) < keep:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval into folded stack counts."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+class RequestProfiler:
+    """Flask extension timing requests and serving admin profile captures."""
+
+    def __init__(self, app=None):
+        self.lock = threading.Lock()
+        self.endpoints = defaultdict(lambda: {
+            'requests': 0, 'wall_seconds': 0.0, 'db_seconds': 0.0,
+            'serialize_seconds': 0.0, 'statements': 0, 'max_wall_seconds': 0.0
+        })
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PROFILING_ENABLED', False)
+        self.slow_statements = app.config.get('PROFILING_SLOW_STATEMENTS', 3)
+        self.sample_interval = app.config.get('PROFILING_SAMPLE_INTERVAL', 0.001)
+        app.extensions['request_profiler'] = self
+        if not self.enabled:
+            return
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._stop_capture)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Statements of other threads (e.g. the activity log writer) have no request profile
+        profile = g.get('request_profile') if has_request_context() else None
+        if profile is not None:
+            profile.statement_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = g.get('request_profile') if has_request_context() else None
+        if profile is not None and profile.statement_started is not None:
+            profile.record_statement(statement, time.perf_counter() - profile.statement_started,
+                                     self.slow_statements)
+            profile.statement_started = None
+
+    def _start(self):
+        g.request_profile = RequestProfile()
+
+        mode = CAPTURE_MODES.get(request.headers.get('X-Profile') or request.args.get('_profile', ''))
+        if mode is None or not self._is_admin():
+            return
+
+        if mode == 'cprofile':
+            g.profile_capture = (mode, cProfile.Profile())
+            g.profile_capture[1].enable()
+        else:
+            sampler = StackSampler(threading.get_ident(), self.sample_interval)
+            g.profile_capture = (mode, sampler)
+            sampler.start()
+
+    def _is_admin(self):
+        from flask_jwt_extended import verify_jwt_in_request
+        from .utils import load_current_user
+
+        try:
+            if verify_jwt_in_request(optional=True) is None:
+                return False
+        except (JWTExtendedException, PyJWTError):
+            return False
+
+        user = load_current_user()
+        return bool(user and user.is_admin)
+
+    def _finish(self, response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+
+        capture = g.pop('profile_capture', None)
+        if capture is not None:
+            response = self._capture_response(response, *capture)
+
+        wall = time.perf_counter() - profile.started
+        endpoint = request.endpoint or 'unmatched'
+        self._aggregate(endpoint, wall, profile)
+
+        timings = [
+            f'app;dur={wall * 1000:.2f}',
+            f'db;dur={profile.db_time * 1000:.2f};desc="{profile.statements} queries"',
+            f'serialize;dur={profile.serialize_time * 1000:.2f}',
+        ]
+        response.headers.add('Server-Timing', ', '.join(timings))
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'wall_ms': round(wall * 1000, 2),
+            'db_ms': round(profile.db_time * 1000, 2),
+            'sql_statements': profile.statements,
+            'serialize_ms': round(profile.serialize_time * 1000, 2),
+            'slowest_statements': [
+                {'ms': round(duration * 1000, 2), 'sql': ' '.join(statement.split())[:500]}
+                for duration, _, statement in sorted(profile.slowest, reverse=True)
+            ],
+        }))
+        return response
+
+    def _stop_capture(self, exception=None):
+        # Requests that raised never reach _finish
+        capture = g.pop('profile_capture', None)
+        if capture is not None:
+            mode, profiler = capture
+            if mode == 'cprofile':
+                profiler.disable()
+            else:
+                profiler.stop()
+
+    def _capture_response(self, response, mode, profiler):
+        if mode == 'cprofile':
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(80)
+            body = output.getvalue()
+        else:
+            profiler.stop()
+            body = profiler.folded()
+
+        response.set_data(body)
+        response.mimetype = 'text/plain'
+        response.headers['X-Profile'] = mode
+        # A captured body must never be cached or revalidated as the real one
+        response.headers['Cache-Control'] = 'no-store'
+        response.headers.pop('ETag', None)
+        return response
+
+    def _aggregate(self, endpoint, wall, profile):
+        with self.lock:
+            totals = self.endpoints[endpoint]
+            totals['requests'] += 1
+            totals['wall_seconds'] += wall
+            totals['db_seconds'] += profile.db_time
+            totals['serialize_seconds'] += profile.serialize_time
+            totals['statements'] += profile.statements
+            totals['max_wall_seconds'] = max(totals['max_wall_seconds'], wall)
+
+    def stats(self):
+        """Get per-endpoint request counts and mean timings, slowest mean first."""
+        with self.lock:
+            endpoints = {name: dict(totals) for name, totals in self.endpoints.items()}
+
+        summary = []
+        for name, totals in endpoints.items():
+            count = totals['requests']
+            summary.append({
+                'endpoint': name,
+                'requests': count,
+                'mean_wall_ms': round(totals['wall_seconds'] / count * 1000, 2),
+                'mean_db_ms': round(totals['db_seconds'] / count * 1000, 2),
+                'mean_serialize_ms': round(totals['serialize_seconds'] / count * 1000, 2),
+                'mean_statements': round(totals['statements'] / count, 1),
+                'max_wall_ms': round(totals['max_wall_seconds'] * 1000, 2),
+            })
+        summary.sort(key=lambda item: item['mean_wall_ms'], reverse=True)
+        return {'enabled': self.enabled, 'endpoints': summary}
+
+@contextmanager
+def timed_serialization():
+    """Add the time spent in the block to the request's serialization time."""
+    profile = g.get('request_profile') if has_request_context() else None
+    if profile is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialize_time += time.perf_counter() - started
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,383 @@
+"""
+Analytics rollups for the admin dashboard of the AI Directory Platform.
+
+``refresh()`` summarizes every whole UTC day since each rollup's watermark
+into the daily rollup tables and moves the watermark to today's midnight.
+Readers combine the rollups (everything before the watermark) with a live
+query over the small tail after it, so results are always current and the
+live part only covers the time since the last refresh.
+
+Rollups count rows as they exist when a day is rolled up. Deleting a row
+that was already rolled up subtracts it again (see the mapper events at the
+end of this module), so counts never drift above the live tables. Rows
+backdated into rolled-up days are only picked up by ``refresh(rebuild=True)``.
+
+The user and review counts and the completed revenue of the dashboard are
+running totals in ``RollupTotal``, kept exact by mapper events on every
+insert, update and delete, so reading one costs a few rows no matter how
+much history there is. Each total is split over a few shard rows so that
+concurrent writers do not all wait on one row lock.
+
+Bulk ``insert()``/``delete()`` statements bypass the mapper events: follow
+them with ``refresh(rebuild=True)``, as ``src.dataset.rebuild_derived``
+does after seeding.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time
+
+from sqlalchemy import event, exists, func, inspect, select
+
+from .database import db
+from .models import (
+    User, AITool, Review, UserFavorite, PaymentTransaction,
+    DailySignupRollup, DailyRevenueRollup, DailyToolRollup,
+    ToolRollupTotal, RollupWatermark, RollupTotal
+)
+
+
+def as_date(value):
+    """Normalize a DATE() result (a string on SQLite, a date on PostgreSQL)."""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def rolled_until(name):
+    """Get a rollup's watermark, or None if it was never refreshed."""
+    watermark = db.session.get(RollupWatermark, name)
+    return watermark.rolled_until if watermark else None
+
+def _in_range(column, since, until):
+    clauses = []
+    if since is not None:
+        clauses.append(column >= since)
+    if until is not None:
+        clauses.append(column < until)
+    return clauses
+
+def _live_signups(since, until=None):
+    day = func.date(User.created_at)
+    return [
+        (as_date(row_day), tier, count)
+        for row_day, tier, count in db.session.query(
+            day, User.subscription_tier, func.count(User.id)
+        ).filter(*_in_range(User.created_at, since, until)).group_by(day, User.subscription_tier)
+    ]
+
+def _live_revenue(since, until=None):
+    day = func.date(PaymentTransaction.transaction_date)
+    return [
+        (as_date(row_day), tier, amount or 0, count)
+        for row_day, tier, amount, count in db.session.query(
+            day,
+            PaymentTransaction.subscription_tier,
+            func.sum(PaymentTransaction.amount),
+            func.count(PaymentTransaction.id)
+        ).filter(
+            PaymentTransaction.status == 'completed',
+            *_in_range(PaymentTransaction.transaction_date, since, until)
+        ).group_by(day, PaymentTransaction.subscription_tier)
+    ]
+
+def _live_tool_activity(since, until=None):
+    """Get ``{(day, tool_id): [reviews, favorites]}`` from the live tables."""
+    activity = defaultdict(lambda: [0, 0])
+
+    for index, model in enumerate((Review, UserFavorite)):
+        day = func.date(model.created_at)
+        rows = db.session.query(day, model.tool_id, func.count(model.id)).filter(
+            *_in_range(model.created_at, since, until)
+        ).group_by(day, model.tool_id)
+        for row_day, tool_id, count in rows:
+            activity[(as_date(row_day), tool_id)][index] += count
+
+    return activity
+
+def _refresh_signups(since, until):
+    DailySignupRollup.query.filter(*_in_range(DailySignupRollup.day, since and since.date(), None)).delete()
+    rows = [
+        {'day': day, 'subscription_tier': tier, 'signups': count}
+        for day, tier, count in _live_signups(since, until)
+    ]
+    if rows:
+        db.session.execute(DailySignupRollup.__table__.insert(), rows)
+
+def _refresh_revenue(since, until):
+    DailyRevenueRollup.query.filter(*_in_range(DailyRevenueRollup.day, since and since.date(), None)).delete()
+    rows = [
+        {'day': day, 'subscription_tier': tier, 'amount': amount, 'transactions': count}
+        for day, tier, amount, count in _live_revenue(since, until)
+    ]
+    if rows:
+        db.session.execute(DailyRevenueRollup.__table__.insert(), rows)
+
+def _refresh_tool_activity(since, until):
+    if since is None:
+        DailyToolRollup.query.delete()
+        ToolRollupTotal.query.delete()
+    else:
+        DailyToolRollup.query.filter(DailyToolRollup.day >= since.date()).delete()
+
+    activity = _live_tool_activity(since, until)
+    if not activity:
+        return
+
+    db.session.execute(DailyToolRollup.__table__.insert(), [
+        {'day': day, 'tool_id': tool_id, 'reviews': reviews, 'favorites': favorites}
+        for (day, tool_id), (reviews, favorites) in activity.items()
+    ])
+
+    # Fold the newly rolled days into the running per-tool totals
+    deltas = defaultdict(lambda: [0, 0])
+    for (day, tool_id), (reviews, favorites) in activity.items():
+        deltas[tool_id][0] += reviews
+        deltas[tool_id][1] += favorites
+
+    # A rebuild starts from no totals, so they are all bulk inserted
+    totals = {} if since is None else {
+        total.tool_id: total
+        for total in ToolRollupTotal.query.filter(ToolRollupTotal.tool_id.in_(deltas))
+    }
+    new_totals = []
+    for tool_id, (reviews, favorites) in deltas.items():
+        total = totals.get(tool_id)
+        if total is None:
+            new_totals.append({'tool_id': tool_id, 'reviews': reviews, 'favorites': favorites})
+        else:
+            total.reviews += reviews
+            total.favorites += favorites
+    if new_totals:
+        db.session.execute(ToolRollupTotal.__table__.insert(), new_totals)
+
+ROLLUPS = {
+    'signups': _refresh_signups,
+    'revenue': _refresh_revenue,
+    'tool_activity': _refresh_tool_activity
+}
+
+def _cents(amount):
+    return round(amount * 100)
+
+def _count_rows(model):
+    return lambda: db.session.query(func.count(model.id)).scalar()
+
+def _count_revenue_cents():
+    amount = db.session.query(func.sum(PaymentTransaction.amount)).filter(
+        PaymentTransaction.status == 'completed'
+    ).scalar()
+    return _cents(amount or 0)
+
+# Running totals by name, with the live query that recounts each one
+TOTALS = {
+    'users': _count_rows(User),
+    'reviews': _count_rows(Review),
+    'revenue_cents': _count_revenue_cents
+}
+
+def _refresh_totals(rebuild):
+    """Count the running totals that are missing (all of them with ``rebuild``)."""
+    existing = {name for name, in db.session.query(RollupTotal.name).distinct()}
+    for name, count in TOTALS.items():
+        if name in existing and not rebuild:
+            continue
+        RollupTotal.query.filter(RollupTotal.name == name).delete()
+        value = count()
+        db.session.execute(RollupTotal.__table__.insert(), [
+            {'name': name, 'shard': shard, 'value': value if shard == 0 else 0}
+            for shard in range(RollupTotal.SHARDS)
+        ])
+    db.session.commit()
+
+def refresh(rebuild=False, now=None):
+    """Roll up every whole day between each rollup's watermark and today.
+
+    With ``rebuild`` the rollups and running totals are recomputed from
+    scratch. Returns the ``{name: (since, until)}`` ranges that were rolled up.
+    """
+    _refresh_totals(rebuild)
+    until = datetime.combine((now or datetime.utcnow()).date(), time.min)
+    refreshed = {}
+
+    for name, refresh_rollup in ROLLUPS.items():
+        since = None if rebuild else rolled_until(name)
+        if since is not None and since >= until:
+            continue
+
+        refresh_rollup(since, until)
+
+        watermark = db.session.get(RollupWatermark, name)
+        if watermark is None:
+            db.session.add(RollupWatermark(name=name, rolled_until=until))
+        else:
+            watermark.rolled_until = until
+
+        db.session.commit()
+        refreshed[name] = (since, until)
+
+    return refreshed
+
+def signups_by_day(since=None):
+    """Get ``(day, tier, signups)`` rows from ``since`` until now."""
+    watermark = rolled_until('signups')
+    rows = []
+
+    if watermark is not None:
+        rows += db.session.query(
+            DailySignupRollup.day, DailySignupRollup.subscription_tier, DailySignupRollup.signups
+        ).filter(*_in_range(DailySignupRollup.day, since and since.date(), watermark.date())).all()
+
+    tail_start = max(since, watermark) if since and watermark else (since or watermark)
+    return rows + _live_signups(tail_start)
+
+def revenue_by_day(since=None):
+    """Get ``(day, tier, amount)`` rows of completed payments from ``since`` until now."""
+    watermark = rolled_until('revenue')
+    rows = []
+
+    if watermark is not None:
+        rows += db.session.query(
+            DailyRevenueRollup.day, DailyRevenueRollup.subscription_tier, DailyRevenueRollup.amount
+        ).filter(*_in_range(DailyRevenueRollup.day, since and since.date(), watermark.date())).all()
+
+    tail_start = max(since, watermark) if since and watermark else (since or watermark)
+    return rows + [(day, tier, amount) for day, tier, amount, count in _live_revenue(tail_start)]
+
+def total(name):
+    """Get the current value of one of the TOTALS."""
+    value = db.session.query(func.sum(RollupTotal.value)).filter(RollupTotal.name == name).scalar()
+    if value is None:
+        # Not counted yet: no refresh has run since the table was added
+        return TOTALS[name]()
+    return value
+
+def revenue_total():
+    """Get the amount of all completed payments."""
+    return total('revenue_cents') / 100
+
+def most_favorited(limit=5):
+    """Get ``(tool_id, favorites)`` for the most favorited tools."""
+    watermark = rolled_until('tool_activity')
+    if watermark is None:
+        return db.session.query(
+            UserFavorite.tool_id, func.count(UserFavorite.id).label('favorites')
+        ).group_by(UserFavorite.tool_id).order_by(func.count(UserFavorite.id).desc(), UserFavorite.tool_id).limit(limit).all()
+
+    counts = dict(
+        db.session.query(ToolRollupTotal.tool_id, ToolRollupTotal.favorites)
+        .order_by(ToolRollupTotal.favorites.desc(), ToolRollupTotal.tool_id).limit(limit).all()
+    )
+
+    # Only tools favorited since the watermark can overtake the rolled-up top list
+    tail = dict(
+        db.session.query(UserFavorite.tool_id, func.count(UserFavorite.id))
+        .filter(UserFavorite.created_at >= watermark).group_by(UserFavorite.tool_id).all()
+    )
+    if tail:
+        rolled = dict(
+            db.session.query(ToolRollupTotal.tool_id, ToolRollupTotal.favorites)
+            .filter(ToolRollupTotal.tool_id.in_(tail)).all()
+        )
+        for tool_id, count in tail.items():
+            counts[tool_id] = rolled.get(tool_id, 0) + count
+
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return [(tool_id, count) for tool_id, count in ranked[:limit] if count > 0]
+
+def _adjust_total(connection, name, row_id, delta):
+    table = RollupTotal.__table__
+    connection.execute(
+        table.update().where(table.c.name == name, table.c.shard == row_id % RollupTotal.SHARDS)
+        .values(value=table.c.value + delta)
+    )
+
+def _rolled(name, moment):
+    """SQL condition that ``moment`` is before a rollup's watermark, i.e. already rolled up."""
+    table = RollupWatermark.__table__
+    return exists().where(table.c.name == name, table.c.rolled_until > moment)
+
+def _unroll_tool_activity(connection, tool_id, created_at, column):
+    rolled = _rolled('tool_activity', created_at)
+    for table, clauses in (
+        (ToolRollupTotal.__table__, ()),
+        (DailyToolRollup.__table__, (DailyToolRollup.__table__.c.day == created_at.date(),)),
+    ):
+        connection.execute(
+            table.update().where(table.c.tool_id == tool_id, rolled, *clauses)
+            .values({column: table.c[column] - 1})
+        )
+
+@event.listens_for(User, 'after_insert')
+def _count_inserted_user(mapper, connection, user):
+    _adjust_total(connection, 'users', user.id, 1)
+
+@event.listens_for(User, 'after_delete')
+def _uncount_deleted_user(mapper, connection, user):
+    _adjust_total(connection, 'users', user.id, -1)
+
+    # The signup was rolled up under the tier the user had then, which may
+    # since have changed; any tier's row of the day keeps the day's sum right
+    table = DailySignupRollup.__table__
+    row_id = connection.execute(
+        select(table.c.id).where(
+            table.c.day == user.created_at.date(), table.c.signups > 0, _rolled('signups', user.created_at)
+        ).order_by((table.c.subscription_tier == user.subscription_tier).desc()).limit(1)
+    ).scalar()
+    if row_id is not None:
+        connection.execute(table.update().where(table.c.id == row_id).values(signups=table.c.signups - 1))
+
+@event.listens_for(Review, 'after_insert')
+def _count_inserted_review(mapper, connection, review):
+    _adjust_total(connection, 'reviews', review.id, 1)
+
+@event.listens_for(Review, 'after_delete')
+def _uncount_deleted_review(mapper, connection, review):
+    _adjust_total(connection, 'reviews', review.id, -1)
+    _unroll_tool_activity(connection, review.tool_id, review.created_at, 'reviews')
+
+@event.listens_for(UserFavorite, 'after_delete')
+def _uncount_deleted_favorite(mapper, connection, favorite):
+    _unroll_tool_activity(connection, favorite.tool_id, favorite.created_at, 'favorites')
+
+def _revenue_cents(status, amount):
+    return _cents(amount) if status == 'completed' else 0
+
+def _previous_value(instance, key):
+    history = inspect(instance).attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(instance, key)
+
+@event.listens_for(PaymentTransaction, 'after_insert')
+def _count_inserted_payment(mapper, connection, payment):
+    cents = _revenue_cents(payment.status, payment.amount)
+    if cents:
+        _adjust_total(connection, 'revenue_cents', payment.id, cents)
+
+@event.listens_for(PaymentTransaction, 'after_update')
+def _recount_updated_payment(mapper, connection, payment):
+    cents = _revenue_cents(payment.status, payment.amount) - _revenue_cents(
+        _previous_value(payment, 'status'), _previous_value(payment, 'amount')
+    )
+    if cents:
+        _adjust_total(connection, 'revenue_cents', payment.id, cents)
+
+@event.listens_for(PaymentTransaction, 'after_delete')
+def _uncount_deleted_payment(mapper, connection, payment):
+    if payment.status != 'completed':
+        return
+
+    _adjust_total(connection, 'revenue_cents', payment.id, -_cents(payment.amount))
+
+    table = DailyRevenueRollup.__table__
+    connection.execute(
+        table.update().where(
+            table.c.day == payment.transaction_date.date(),
+            table.c.subscription_tier == payment.subscription_tier,
+            _rolled('revenue', payment.transaction_date)
+        ).values(amount=table.c.amount - payment.amount, transactions=table.c.transactions - 1)
+    )
+
+@event.listens_for(AITool, 'after_delete')
+def _drop_deleted_tool(mapper, connection, tool):
+    # Its reviews and favorites were deleted (and unrolled) with it; the
+    # emptied rows would only take up space in the top lists
+    for table in (ToolRollupTotal.__table__, DailyToolRollup.__table__):
+        connection.execute(table.delete().where(table.c.tool_id == tool.id))
@@ -9,30 +9,65 @@ from src.models.user import User
 from src.models.ai_tool import AITool
 from src.models.category import Category
 from src.models.industry import Industry
-from src.models.review import Review
-from src.models.user_favorite import UserFavorite
 from src.models.user_activity_log import UserActivityLog
-from src.models.payment_transaction import PaymentTransaction
 from src.models.subscription import Subscription
 from src.database import db
+from src import loaders, rollups
+from src.cache import response_cache
+from src.engine import pool_metrics
+from src.profiling import request_profiler
 from src.utils import format_response, format_error, admin_required
 
 admin_bp = Blueprint('admin', __name__)
 
+GRANULARITIES = ('day', 'week', 'month')
+
+def bucket_start(day, granularity):
+    """Get the first day of the day/week/month bucket containing ``day``."""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+def date_buckets(start_day, end_day, granularity):
+    """List the bucket start dates covering ``start_day`` to ``end_day`` inclusive."""
+    buckets = []
+    current = bucket_start(start_day, granularity)
+    
+    while current <= end_day:
+        buckets.append(current)
+        if granularity == 'week':
+            current += timedelta(days=7)
+        elif granularity == 'month':
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=1)
+    
+    return buckets
+
+def stats_range():
+    """Parse the days/granularity query parameters of the stats endpoints."""
+    days = int(request.args.get('days', 30))
+    granularity = request.args.get('granularity', 'day')
+    
+    end_date = datetime.utcnow()
+    start_date = datetime.combine((end_date - timedelta(days=days)).date(), datetime.min.time())
+    
+    return start_date, end_date, granularity
+
 @admin_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
 @admin_required
 def get_dashboard_stats():
     """Get dashboard statistics."""
-    # Get counts
-    user_count = User.query.count()
-    tool_count = AITool.query.count()
-    review_count = Review.query.count()
+    # Get counts from the running totals and denormalized counters
+    user_count = rollups.total('users')
+    tool_count = db.session.query(func.sum(Category.tools_count)).scalar() or 0
+    review_count = rollups.total('reviews')
     
     # Get revenue
-    revenue = db.session.query(func.sum(PaymentTransaction.amount)).filter(
-        PaymentTransaction.status == 'completed'
-    ).scalar() or 0
+    revenue = rollups.revenue_total()
     
     # Get recent users
     recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
@@ -42,20 +77,22 @@ def get_dashboard_stats():
             'email': user.email,
             'name': f"{user.first_name} {user.last_name}",
             'subscription_tier': user.subscription_tier,
-            'created_at': user.created_at.isoformat() if user.created_at else None
+            'created_at': user.created_at
         }
         for user in recent_users
     ]
     
     # Get recent tools
-    recent_tools = AITool.query.order_by(AITool.created_at.desc()).limit(5).all()
+    recent_tools = AITool.query.options(*loaders.TOOL_SUMMARY).order_by(
+        AITool.created_at.desc()
+    ).limit(5).all()
     recent_tools_data = [
         {
             'id': tool.id,
             'name': tool.name,
             'category': tool.category.name if tool.category else None,
             'access_level': tool.access_level,
-            'created_at': tool.created_at.isoformat() if tool.created_at else None
+            'created_at': tool.created_at
         }
         for tool in recent_tools
     ]
@@ -77,48 +114,34 @@ def get_dashboard_stats():
 def get_user_stats():
     """Get user statistics."""
     # Get query parameters
-    days = int(request.args.get('days', 30))
+    start_date, end_date, granularity = stats_range()
+    if granularity not in GRANULARITIES:
+        return format_error("Granularity must be day, week or month", "VALIDATION_ERROR")
     
-    # Calculate date range
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get daily signups
-    daily_signups = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        next_date = current_date + timedelta(days=1)
-        
-        count = User.query.filter(
-            User.created_at >= current_date,
-            User.created_at < next_date
-        ).count()
-        
-        daily_signups.append({
-            'date': current_date.strftime('%Y-%m-%d'),
-            'count': count
-        })
-        
-        current_date = next_date
+    # Get signups per day from the rollups and live tail, then fold them into buckets
+    counts = {bucket: 0 for bucket in date_buckets(start_date.date(), end_date.date(), granularity)}
+    for day, tier, count in rollups.signups_by_day(start_date):
+        bucket = bucket_start(day, granularity)
+        if bucket in counts:
+            counts[bucket] += count
+    
+    daily_signups = [
+        {'date': bucket.strftime('%Y-%m-%d'), 'count': count}
+        for bucket, count in counts.items()
+    ]
     
     # Get subscription distribution
+    tier_counts = dict(
+        db.session.query(User.subscription_tier, func.count(User.id))
+        .group_by(User.subscription_tier).all()
+    )
     subscription_distribution = [
-        {
-            'name': 'Free',
-            'count': User.query.filter_by(subscription_tier='Free').count()
-        },
-        {
-            'name': 'Premium',
-            'count': User.query.filter_by(subscription_tier='Premium').count()
-        },
-        {
-            'name': 'Business',
-            'count': User.query.filter_by(subscription_tier='Business').count()
-        }
+        {'name': tier, 'count': tier_counts.get(tier, 0)}
+        for tier in ['Free', 'Premium', 'Business']
     ]
     
     return format_response({
+        'granularity': granularity,
         'daily_signups': daily_signups,
         'subscription_distribution': subscription_distribution
     })
@@ -128,35 +151,26 @@ def get_user_stats():
 @admin_required
 def get_tool_stats():
     """Get tool statistics."""
-    # Get category distribution
-    categories = Category.query.all()
-    category_distribution = []
-    
-    for category in categories:
-        count = AITool.query.filter_by(category_id=category.id).count()
-        category_distribution.append({
-            'name': category.name,
-            'count': count
-        })
+    # Get category distribution from the denormalized counters
+    category_distribution = [
+        {'name': name, 'count': count}
+        for name, count in db.session.query(Category.name, Category.tools_count).all()
+    ]
     
     # Get access level distribution
+    access_level_counts = dict(
+        db.session.query(AITool.access_level, func.count(AITool.id))
+        .group_by(AITool.access_level).all()
+    )
     access_level_distribution = [
-        {
-            'name': 'Public',
-            'count': AITool.query.filter_by(access_level='Public').count()
-        },
-        {
-            'name': 'Premium Only',
-            'count': AITool.query.filter_by(access_level='Premium Only').count()
-        },
-        {
-            'name': 'Business Only',
-            'count': AITool.query.filter_by(access_level='Business Only').count()
-        }
+        {'name': access_level, 'count': access_level_counts.get(access_level, 0)}
+        for access_level in ['Public', 'Premium Only', 'Business Only']
     ]
     
     # Get top rated tools
-    top_rated_tools = AITool.query.order_by(AITool.rating.desc()).limit(5).all()
+    top_rated_tools = AITool.query.options(*loaders.TOOL_SUMMARY).order_by(
+        AITool.rating.desc()
+    ).limit(5).all()
     top_rated = [
         {
             'id': tool.id,
@@ -168,28 +182,23 @@ def get_tool_stats():
     ]
     
     # Get most favorited tools
-    most_favorited_subquery = db.session.query(
-        UserFavorite.tool_id,
-        func.count(UserFavorite.id).label('favorite_count')
-    ).group_by(UserFavorite.tool_id).subquery()
-    
-    most_favorited_tools = db.session.query(
-        AITool, most_favorited_subquery.c.favorite_count
-    ).join(
-        most_favorited_subquery,
-        AITool.id == most_favorited_subquery.c.tool_id
-    ).order_by(
-        most_favorited_subquery.c.favorite_count.desc()
-    ).limit(5).all()
+    favorite_counts = rollups.most_favorited(limit=5)
+    favorited_tools = {
+        tool.id: tool
+        for tool in AITool.query.options(*loaders.TOOL_SUMMARY).filter(
+            AITool.id.in_([tool_id for tool_id, count in favorite_counts])
+        )
+    }
     
     most_favorited = [
         {
-            'id': tool.id,
-            'name': tool.name,
+            'id': tool_id,
+            'name': favorited_tools[tool_id].name,
             'favorite_count': favorite_count,
-            'category': tool.category.name if tool.category else None
+            'category': favorited_tools[tool_id].category.name if favorited_tools[tool_id].category else None
         }
-        for tool, favorite_count in most_favorited_tools
+        for tool_id, favorite_count in favorite_counts
+        if tool_id in favorited_tools
     ]
     
     return format_response({
@@ -205,49 +214,54 @@ def get_tool_stats():
 def get_revenue_stats():
     """Get revenue statistics."""
     # Get query parameters
-    days = int(request.args.get('days', 30))
+    start_date, end_date, granularity = stats_range()
+    if granularity not in GRANULARITIES:
+        return format_error("Granularity must be day, week or month", "VALIDATION_ERROR")
     
-    # Calculate date range
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get daily revenue
-    daily_revenue = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        next_date = current_date + timedelta(days=1)
-        
-        amount = db.session.query(func.sum(PaymentTransaction.amount)).filter(
-            PaymentTransaction.transaction_date >= current_date,
-            PaymentTransaction.transaction_date < next_date,
-            PaymentTransaction.status == 'completed'
-        ).scalar() or 0
-        
-        daily_revenue.append({
-            'date': current_date.strftime('%Y-%m-%d'),
-            'amount': round(amount, 2)
-        })
-        
-        current_date = next_date
-    
-    # Get revenue by subscription tier
-    revenue_by_tier = []
-    
-    for tier in ['Premium', 'Business']:
-        amount = db.session.query(func.sum(PaymentTransaction.amount)).filter(
-            PaymentTransaction.subscription_tier == tier,
-            PaymentTransaction.transaction_date >= start_date,
-            PaymentTransaction.status == 'completed'
-        ).scalar() or 0
-        
-        revenue_by_tier.append({
-            'name': tier,
-            'amount': round(amount, 2)
-        })
+    # Get revenue per day and tier from the rollups and live tail; both the
+    # time series and the per-tier totals are folded from it
+    amounts = {bucket: 0 for bucket in date_buckets(start_date.date(), end_date.date(), granularity)}
+    tier_amounts = {'Premium': 0, 'Business': 0}
+    
+    for day, tier, amount in rollups.revenue_by_day(start_date):
+        bucket = bucket_start(day, granularity)
+        if bucket in amounts:
+            amounts[bucket] += amount or 0
+        if tier in tier_amounts:
+            tier_amounts[tier] += amount or 0
+    
+    daily_revenue = [
+        {'date': bucket.strftime('%Y-%m-%d'), 'amount': round(amount, 2)}
+        for bucket, amount in amounts.items()
+    ]
+    revenue_by_tier = [
+        {'name': tier, 'amount': round(amount, 2)}
+        for tier, amount in tier_amounts.items()
+    ]
     
     return format_response({
+        'granularity': granularity,
         'daily_revenue': daily_revenue,
         'revenue_by_tier': revenue_by_tier
     })
 
+@admin_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    """Get response cache hit rate and size for the worker serving the request."""
+    return format_response(response_cache.stats())
+
+@admin_bp.route('/database/stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_database_stats():
+    """Get connection pool usage and checkout wait times for the worker serving the request."""
+    return format_response(pool_metrics.stats(db.engine))
+
+@admin_bp.route('/profiling/stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_profiling_stats():
+    """Get per-endpoint request timings for the worker serving the request."""
+    return format_response(request_profiler.stats())
@@ -10,7 +10,7 @@ from flask_jwt_extended import (
 from datetime import datetime, timezone, timedelta
 from ..models import User
 from ..database import db
-from ..utils import format_response, format_error
+from ..utils import format_response, format_error, load_current_user, user_claims
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/v1/auth')
 
@@ -48,7 +48,7 @@ def register():
     db.session.commit()
     
     # Generate tokens
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims=user_claims(user))
     refresh_token = create_refresh_token(identity=user.id)
     
     # Return user data and tokens
@@ -79,7 +79,7 @@ def login():
         return format_error("Invalid email or password", "INVALID_CREDENTIALS", status_code=401)
     
     # Generate tokens
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims=user_claims(user))
     refresh_token = create_refresh_token(identity=user.id)
     
     # Return user data and tokens
@@ -99,9 +99,13 @@ def login():
 def refresh():
     """Refresh an expired JWT token."""
     current_user_id = get_jwt_identity()
+    user = load_current_user()
     
-    # Generate new access token
-    access_token = create_access_token(identity=current_user_id)
+    if not user:
+        return format_error("User not found", "USER_NOT_FOUND", status_code=404)
+    
+    # Generate new access token with up-to-date access claims
+    access_token = create_access_token(identity=current_user_id, additional_claims=user_claims(user))
     
     return format_response({
         'token': access_token
@@ -112,7 +116,7 @@ def refresh():
 def verify():
     """Verify a JWT token."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -132,7 +136,7 @@ def change_password():
     """Change user password."""
     data = request.get_json()
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -6,21 +6,27 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from ..models import Category
 from ..database import db
+from .. import schemas
 from ..utils import format_response, format_error, admin_required
+from ..cache import response_cache, cached
+from ..http_cache import conditional
 
 categories_bp = Blueprint('categories', __name__, url_prefix='/api/v1/categories')
 
 @categories_bp.route('', methods=['GET'])
+@conditional('public, max-age=300', collections=(Category,))
+@cached(tags=['catalog'])
 def get_categories():
     """Get a list of all categories."""
     categories = Category.query.all()
     
     # Format response
-    category_list = [category.to_dict() for category in categories]
+    category_list = schemas.for_request(schemas.CATEGORY).dump_many(categories)
     
     return format_response(category_list)
 
 @categories_bp.route('/<int:category_id>', methods=['GET'])
+@conditional('public, max-age=300')
 def get_category(category_id):
     """Get a specific category by ID."""
     category = Category.query.get(category_id)
@@ -28,7 +34,7 @@ def get_category(category_id):
     if not category:
         return format_error("Category not found", "CATEGORY_NOT_FOUND", status_code=404)
     
-    return format_response(category.to_dict())
+    return format_response(schemas.for_request(schemas.CATEGORY).dump(category))
 
 @categories_bp.route('', methods=['POST'])
 @jwt_required()
@@ -55,8 +61,9 @@ def create_category():
     # Save category to database
     db.session.add(category)
     db.session.commit()
+    response_cache.invalidate('catalog')
     
-    return format_response(category.to_dict(), "Category created successfully", status_code=201)
+    return format_response(schemas.CATEGORY.dump(category), "Category created successfully", status_code=201)
 
 @categories_bp.route('/<int:category_id>', methods=['PUT'])
 @jwt_required()
@@ -87,8 +94,9 @@ def update_category(category_id):
     
     # Save changes to database
     db.session.commit()
+    response_cache.invalidate(f'category:{category_id}', 'catalog')
     
-    return format_response(category.to_dict(), "Category updated successfully")
+    return format_response(schemas.CATEGORY.dump(category), "Category updated successfully")
 
 @categories_bp.route('/<int:category_id>', methods=['DELETE'])
 @jwt_required()
@@ -110,6 +118,7 @@ def delete_category(category_id):
     # Delete category from database
     db.session.delete(category)
     db.session.commit()
+    response_cache.invalidate(f'category:{category_id}', 'catalog')
     
     return format_response(message="Category deleted successfully")
 
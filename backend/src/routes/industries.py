@@ -6,21 +6,27 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from ..models import Industry
 from ..database import db
+from .. import schemas
 from ..utils import format_response, format_error, admin_required
+from ..cache import response_cache, cached
+from ..http_cache import conditional
 
 industries_bp = Blueprint('industries', __name__, url_prefix='/api/v1/industries')
 
 @industries_bp.route('', methods=['GET'])
+@conditional('public, max-age=300', collections=(Industry,))
+@cached(tags=['catalog'])
 def get_industries():
     """Get a list of all industries."""
     industries = Industry.query.all()
     
     # Format response
-    industry_list = [industry.to_dict() for industry in industries]
+    industry_list = schemas.for_request(schemas.INDUSTRY).dump_many(industries)
     
     return format_response(industry_list)
 
 @industries_bp.route('/<int:industry_id>', methods=['GET'])
+@conditional('public, max-age=300')
 def get_industry(industry_id):
     """Get a specific industry by ID."""
     industry = Industry.query.get(industry_id)
@@ -28,7 +34,7 @@ def get_industry(industry_id):
     if not industry:
         return format_error("Industry not found", "INDUSTRY_NOT_FOUND", status_code=404)
     
-    return format_response(industry.to_dict())
+    return format_response(schemas.for_request(schemas.INDUSTRY).dump(industry))
 
 @industries_bp.route('', methods=['POST'])
 @jwt_required()
@@ -54,8 +60,9 @@ def create_industry():
     # Save industry to database
     db.session.add(industry)
     db.session.commit()
+    response_cache.invalidate('catalog')
     
-    return format_response(industry.to_dict(), "Industry created successfully", status_code=201)
+    return format_response(schemas.INDUSTRY.dump(industry), "Industry created successfully", status_code=201)
 
 @industries_bp.route('/<int:industry_id>', methods=['PUT'])
 @jwt_required()
@@ -83,8 +90,9 @@ def update_industry(industry_id):
     
     # Save changes to database
     db.session.commit()
+    response_cache.invalidate(f'industry:{industry_id}', 'catalog')
     
-    return format_response(industry.to_dict(), "Industry updated successfully")
+    return format_response(schemas.INDUSTRY.dump(industry), "Industry updated successfully")
 
 @industries_bp.route('/<int:industry_id>', methods=['DELETE'])
 @jwt_required()
@@ -106,6 +114,7 @@ def delete_industry(industry_id):
     # Delete industry from database
     db.session.delete(industry)
     db.session.commit()
+    response_cache.invalidate(f'industry:{industry_id}', 'catalog')
     
     return format_response(message="Industry deleted successfully")
 
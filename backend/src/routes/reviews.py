@@ -4,13 +4,21 @@ Review routes for the AI Directory Platform.
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..models import Review, AITool, User
+from ..models import Review, AITool
 from ..database import db
-from ..utils import format_response, format_error, admin_required, paginate, subscription_required
+from .. import loaders, schemas
+from ..cache import response_cache, cached
+from ..http_cache import conditional
+from ..utils import (
+    format_response, format_error, admin_required, paginate,
+    subscription_required, load_current_user
+)
 
 reviews_bp = Blueprint('reviews', __name__, url_prefix='/api/v1')
 
 @reviews_bp.route('/tools/<int:tool_id>/reviews', methods=['GET'])
+@conditional('public, max-age=60')
+@cached(tags=['tool:{tool_id}'])
 def get_tool_reviews(tool_id):
     """Get reviews for a specific AI tool."""
     # Check if tool exists
@@ -23,19 +31,20 @@ def get_tool_reviews(tool_id):
     sort_order = request.args.get('order', 'desc')
     
     # Start with base query
-    query = Review.query.filter_by(tool_id=tool_id)
+    query = Review.query.options(*loaders.REVIEW).filter_by(tool_id=tool_id)
     
-    # Apply sorting
+    # Apply sorting (the id tiebreaker makes the order usable as a keyset cursor)
+    order_by = None
     if sort_by == 'rating':
-        query = query.order_by(Review.rating.desc() if sort_order == 'desc' else Review.rating.asc())
+        order_by = [(Review.rating, sort_order == 'desc'), (Review.id, sort_order == 'desc')]
     elif sort_by == 'created_at':
-        query = query.order_by(Review.created_at.desc() if sort_order == 'desc' else Review.created_at.asc())
+        order_by = [(Review.created_at, sort_order == 'desc'), (Review.id, sort_order == 'desc')]
     
     # Paginate results
-    result = paginate(query)
+    result = paginate(query, order_by=order_by)
     
     # Format response
-    reviews = [review.to_dict() for review in result['items']]
+    reviews = schemas.for_request(schemas.REVIEW).dump_many(result['items'])
     
     return format_response({
         'reviews': reviews,
@@ -82,14 +91,13 @@ def create_review(tool_id):
         is_verified=False
     )
     
-    # Save review to database
+    # Save review and tool rating in one transaction
     db.session.add(review)
+    tool.update_rating(rating, 1)
     db.session.commit()
+    response_cache.invalidate(f'tool:{tool_id}', 'catalog')
     
-    # Update tool rating
-    tool.update_rating()
-    
-    return format_response(review.to_dict(), "Review submitted successfully", status_code=201)
+    return format_response(schemas.REVIEW.dump(review), "Review submitted successfully", status_code=201)
 
 @reviews_bp.route('/reviews/<int:review_id>', methods=['PUT'])
 @jwt_required()
@@ -103,11 +111,12 @@ def update_review(review_id):
     current_user_id = get_jwt_identity()
     
     # Check if user is the author of the review or an admin
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     if review.user_id != current_user_id and not user.is_admin:
         return format_error("You are not authorized to update this review", "UNAUTHORIZED", status_code=403)
     
     data = request.get_json()
+    old_rating = review.rating
     
     # Update review fields
     if 'rating' in data:
@@ -123,14 +132,15 @@ def update_review(review_id):
     if user.is_admin and 'is_verified' in data:
         review.is_verified = data['is_verified']
     
-    # Save changes to database
-    db.session.commit()
+    # Update tool rating and save changes in one transaction
+    if review.rating != old_rating:
+        tool = AITool.query.get(review.tool_id)
+        tool.update_rating(review.rating - old_rating)
     
-    # Update tool rating
-    tool = AITool.query.get(review.tool_id)
-    tool.update_rating()
+    db.session.commit()
+    response_cache.invalidate(f'tool:{review.tool_id}', 'catalog')
     
-    return format_response(review.to_dict(), "Review updated successfully")
+    return format_response(schemas.REVIEW.dump(review), "Review updated successfully")
 
 @reviews_bp.route('/reviews/<int:review_id>', methods=['DELETE'])
 @jwt_required()
@@ -144,20 +154,16 @@ def delete_review(review_id):
     current_user_id = get_jwt_identity()
     
     # Check if user is the author of the review or an admin
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     if review.user_id != current_user_id and not user.is_admin:
         return format_error("You are not authorized to delete this review", "UNAUTHORIZED", status_code=403)
     
-    # Get tool ID before deleting the review
-    tool_id = review.tool_id
-    
-    # Delete review from database
+    # Delete review and update tool rating in one transaction
+    tool = AITool.query.get(review.tool_id)
+    tool.update_rating(-review.rating, -1)
     db.session.delete(review)
     db.session.commit()
-    
-    # Update tool rating
-    tool = AITool.query.get(tool_id)
-    tool.update_rating()
+    response_cache.invalidate(f'tool:{tool.id}', 'catalog')
     
     return format_response(message="Review deleted successfully")
 
@@ -174,10 +180,11 @@ def verify_review(review_id):
     # Update verification status
     review.is_verified = True
     db.session.commit()
+    response_cache.invalidate(f'tool:{review.tool_id}')
     
     return format_response({
         'id': review.id,
         'is_verified': review.is_verified,
-        'updated_at': review.updated_at.isoformat()
+        'updated_at': review.updated_at
     }, "Review verified successfully")
 
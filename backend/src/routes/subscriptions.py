@@ -5,13 +5,18 @@ Subscription routes for the AI Directory Platform.
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
-from ..models import User, Subscription, PaymentTransaction
+from ..models import Subscription, PaymentTransaction
 from ..database import db
-from ..utils import format_response, format_error, admin_required
+from .. import schemas
+from ..utils import format_response, format_error, admin_required, load_current_user
+from ..cache import cached
+from ..http_cache import conditional
 
 subscriptions_bp = Blueprint('subscriptions', __name__, url_prefix='/api/v1/subscriptions')
 
 @subscriptions_bp.route('/plans', methods=['GET'])
+@conditional('public, max-age=3600')
+@cached()
 def get_subscription_plans():
     """Get available subscription plans."""
     plans = current_app.config['SUBSCRIPTION_PLANS']
@@ -24,7 +29,7 @@ def subscribe():
     """Subscribe to a plan."""
     data = request.get_json()
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -57,7 +62,7 @@ def subscribe():
                 'name': plan['name']
             },
             'status': 'active',
-            'current_period_start': user.subscription_start_date.isoformat(),
+            'current_period_start': user.subscription_start_date,
             'current_period_end': None
         }, "Subscription created successfully")
     
@@ -106,8 +111,8 @@ def subscribe():
             'name': plan['name']
         },
         'status': 'active',
-        'current_period_start': subscription.current_period_start.isoformat(),
-        'current_period_end': subscription.current_period_end.isoformat()
+        'current_period_start': subscription.current_period_start,
+        'current_period_end': subscription.current_period_end
     }, "Subscription created successfully")
 
 @subscriptions_bp.route('/me', methods=['GET'])
@@ -115,7 +120,7 @@ def subscribe():
 def get_current_subscription():
     """Get the current user's subscription."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -135,8 +140,8 @@ def get_current_subscription():
                 'name': user.subscription_tier
             },
             'status': 'active',
-            'current_period_start': user.subscription_start_date.isoformat() if user.subscription_start_date else None,
-            'current_period_end': user.subscription_end_date.isoformat() if user.subscription_end_date else None,
+            'current_period_start': user.subscription_start_date,
+            'current_period_end': user.subscription_end_date,
             'cancel_at_period_end': False
         })
     
@@ -162,8 +167,8 @@ def get_current_subscription():
             'name': user.subscription_tier
         },
         'status': subscription.status,
-        'current_period_start': subscription.current_period_start.isoformat(),
-        'current_period_end': subscription.current_period_end.isoformat(),
+        'current_period_start': subscription.current_period_start,
+        'current_period_end': subscription.current_period_end,
         'cancel_at_period_end': subscription.cancel_at_period_end,
         'payment_method': payment_method
     })
@@ -174,7 +179,7 @@ def cancel_subscription():
     """Cancel the current user's subscription."""
     data = request.get_json()
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -216,7 +221,7 @@ def cancel_subscription():
             'subscription_id': subscription.id,
             'status': 'active',
             'cancel_at_period_end': True,
-            'current_period_end': subscription.current_period_end.isoformat()
+            'current_period_end': subscription.current_period_end
         }, "Subscription will be canceled at the end of the billing period")
 
 @subscriptions_bp.route('/admin/subscriptions', methods=['GET'])
@@ -242,7 +247,7 @@ def get_all_subscriptions():
     subscriptions = query.all()
     
     # Format response
-    subscription_list = [subscription.to_dict() for subscription in subscriptions]
+    subscription_list = schemas.SUBSCRIPTION.dump_many(subscriptions)
     
     return format_response(subscription_list)
 
@@ -2,20 +2,26 @@
 AI Tools routes for the AI Directory Platform.
 """
 
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
-from ..models import AITool, Category, Industry, ToolIndustry, User, ToolGuide
+from flask import Blueprint, request, jsonify, current_app, g
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from ..models import AITool, Category, Industry, ToolIndustry, ToolGuide
 from ..database import db
+from .. import loaders, schemas
+from ..search import tool_search, tool_highlights
+from ..cache import response_cache, cached, add_cache_tags
+from ..http_cache import conditional
 from ..utils import (
     format_response, format_error, admin_required, 
-    subscription_required, paginate, save_image, delete_image
+    subscription_required, paginate, save_image, delete_image, load_current_user
 )
 import json
+from sqlalchemy.exc import IntegrityError
 
 tools_bp = Blueprint('tools', __name__, url_prefix='/api/v1/tools')
 
 @tools_bp.route('', methods=['GET'])
+@conditional('public, max-age=60', collections=(AITool, Category, Industry, ToolIndustry, ToolGuide))
+@cached(tags=['catalog'])
 def get_tools():
     """Get a list of AI tools."""
     # Get query parameters
@@ -23,20 +29,25 @@ def get_tools():
     category_id = request.args.get('category_id')
     industry_id = request.args.get('industry_id')
     access_level = request.args.get('access_level')
-    sort_by = request.args.get('sort', 'name')
+    sort_by = request.args.get('sort', 'relevance' if search else 'name')
     sort_order = request.args.get('order', 'asc')
-    
-    # Start with base query
-    query = AITool.query
+    view = request.args.get('view', 'full')
+    
+    # Start with base query: the full view (the default) loads each tool with
+    # its category, industries and guide summaries, cards are plain column rows
+    if view == 'card':
+        query = loaders.tool_cards(*([AITool.description] if search else []))
+        schema = schemas.TOOL_CARD
+    elif view == 'full':
+        query = AITool.query.options(*loaders.TOOL)
+        schema = schemas.TOOL_LIST
+    else:
+        return format_error("View must be card or full", "VALIDATION_ERROR")
     
     # Apply search filter
+    relevance = None
     if search:
-        query = query.filter(
-            or_(
-                AITool.name.ilike(f'%{search}%'),
-                AITool.description.ilike(f'%{search}%')
-            )
-        )
+        query, relevance = tool_search.apply(query, search)
     
     # Apply category filter
     if category_id:
@@ -50,19 +61,40 @@ def get_tools():
     if access_level:
         query = query.filter(AITool.access_level == access_level)
     
-    # Apply sorting
+    # Apply sorting (the id tiebreaker makes the order usable as a keyset cursor)
+    order_by = None
     if sort_by == 'name':
-        query = query.order_by(AITool.name.asc() if sort_order == 'asc' else AITool.name.desc())
+        order_by = [(AITool.name, sort_order != 'asc'), (AITool.id, sort_order != 'asc')]
     elif sort_by == 'rating':
-        query = query.order_by(AITool.rating.desc() if sort_order == 'asc' else AITool.rating.asc())
+        rating = AITool.rating_score if current_app.config['RATING_SORT'] == 'bayesian' else AITool.rating
+        order_by = [(rating, sort_order == 'asc'), (AITool.id, sort_order == 'asc')]
     elif sort_by == 'created_at':
-        query = query.order_by(AITool.created_at.desc() if sort_order == 'asc' else AITool.created_at.asc())
+        order_by = [(AITool.created_at, sort_order == 'asc'), (AITool.id, sort_order == 'asc')]
+    elif sort_by == 'relevance' and relevance is not None:
+        # Like rating, asc lists the best matches first
+        score, descending = relevance
+        reverse = sort_order != 'asc'
+        query = query.order_by(
+            score.desc() if descending != reverse else score.asc(),
+            AITool.id.desc() if reverse else AITool.id.asc()
+        )
     
     # Paginate results
-    result = paginate(query)
+    result = paginate(query, order_by=order_by)
+    
+    # The in-process search index ranks at most SEARCH_MAX_RESULTS matches
+    if search and 'search_matches' in g:
+        result['pagination']['truncated'] = True
+        result['pagination']['matches'] = g.search_matches
     
     # Format response
-    tools = [tool.to_dict() for tool in result['items']]
+    schema = schemas.for_request(schema)
+    tools = []
+    for tool in result['items']:
+        tool_data = schema.dump(tool)
+        if search:
+            tool_data['highlights'] = tool_highlights(tool, search)
+        tools.append(tool_data)
     
     return format_response({
         'tools': tools,
@@ -70,24 +102,29 @@ def get_tools():
     })
 
 @tools_bp.route('/<int:tool_id>', methods=['GET'])
+@conditional('private, no-cache')
+@cached(tags=['tool:{tool_id}'], vary_tier=True)
 def get_tool(tool_id):
     """Get a specific AI tool by ID."""
-    tool = AITool.query.get(tool_id)
+    tool = AITool.query.options(*loaders.TOOL_DETAIL).get(tool_id)
     
     if not tool:
         return format_error("Tool not found", "TOOL_NOT_FOUND", status_code=404)
     
+    # The response embeds the category and industries
+    add_cache_tags(f'category:{tool.category_id}', *[f'industry:{industry.id}' for industry in tool.industries])
+    
     # Check if user is authenticated and has access to the tool
     current_user_id = None
     try:
-        from flask_jwt_extended import get_jwt_identity
+        verify_jwt_in_request(optional=True)
         current_user_id = get_jwt_identity()
     except:
         pass
     
     # If tool is not public, check if user has access
     if tool.access_level != 'Public' and current_user_id:
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         if not user:
             return format_error("Tool access restricted", "ACCESS_RESTRICTED", status_code=403)
         
@@ -101,7 +138,7 @@ def get_tool(tool_id):
         return format_error("Authentication required", "AUTHENTICATION_REQUIRED", status_code=401)
     
     # Return tool details with reviews
-    return format_response(tool.to_dict(include_reviews=True))
+    return format_response(schemas.for_request(schemas.TOOL_DETAIL).dump(tool))
 
 @tools_bp.route('', methods=['POST'])
 @jwt_required()
@@ -156,6 +193,8 @@ def create_tool():
     
     # Save tool to database
     db.session.add(tool)
+    db.session.flush()
+    tool_search.index_tool(tool)
     db.session.commit()
     
     # Process industry associations
@@ -194,8 +233,10 @@ def create_tool():
         # Just log the error but don't fail the request
         current_app.logger.error("Failed to parse guides JSON")
     
+    response_cache.invalidate('catalog')
+    
     # Return tool data
-    return format_response(tool.to_dict(), "Tool created successfully", status_code=201)
+    return format_response(schemas.TOOL.dump(tool), "Tool created successfully", status_code=201)
 
 @tools_bp.route('/<int:tool_id>', methods=['PUT'])
 @jwt_required()
@@ -272,11 +313,15 @@ def update_tool(tool_id):
                 )
                 db.session.add(tool_industry)
     
+    # Refresh the search index entry
+    tool_search.index_tool(tool)
+    
     # Save changes to database
     db.session.commit()
+    response_cache.invalidate(f'tool:{tool_id}', 'catalog')
     
     # Return updated tool data
-    return format_response(tool.to_dict(), "Tool updated successfully")
+    return format_response(schemas.TOOL.dump(tool), "Tool updated successfully")
 
 @tools_bp.route('/<int:tool_id>', methods=['DELETE'])
 @jwt_required()
@@ -293,8 +338,10 @@ def delete_tool(tool_id):
         delete_image(tool.image_path)
     
     # Delete tool from database
+    tool_search.remove_tool(tool.id)
     db.session.delete(tool)
     db.session.commit()
+    response_cache.invalidate(f'tool:{tool_id}', 'catalog')
     
     return format_response(message="Tool deleted successfully")
 
@@ -327,12 +374,17 @@ def add_favorite(tool_id):
     )
     
     db.session.add(favorite)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request added the same favorite first
+        db.session.rollback()
+        return format_error("Tool already in favorites", "ALREADY_FAVORITED")
     
     return format_response({
         'id': favorite.id,
         'tool_id': tool_id,
-        'created_at': favorite.created_at.isoformat()
+        'created_at': favorite.created_at
     }, "Tool added to favorites")
 
 @tools_bp.route('/<int:tool_id>/favorite', methods=['DELETE'])
@@ -359,6 +411,8 @@ def remove_favorite(tool_id):
     return format_response(message="Tool removed from favorites")
 
 @tools_bp.route('/<int:tool_id>/guides', methods=['GET'])
+@conditional('public, max-age=60')
+@cached(tags=['tool:{tool_id}'])
 def get_tool_guides(tool_id):
     """Get all guides for a specific tool."""
     tool = AITool.query.get(tool_id)
@@ -366,10 +420,12 @@ def get_tool_guides(tool_id):
     if not tool:
         return format_error("Tool not found", "TOOL_NOT_FOUND", status_code=404)
     
-    guides = ToolGuide.query.filter_by(tool_id=tool_id).order_by(ToolGuide.order_index).all()
+    guides = ToolGuide.query.options(*loaders.GUIDE).filter_by(
+        tool_id=tool_id
+    ).order_by(ToolGuide.order_index).all()
     
     return format_response({
-        'guides': [guide.to_dict() for guide in guides]
+        'guides': schemas.for_request(schemas.GUIDE).dump_many(guides)
     })
 
 @tools_bp.route('/<int:tool_id>/guides', methods=['POST'])
@@ -402,6 +458,7 @@ def create_tool_guide(tool_id):
     
     db.session.add(guide)
     db.session.commit()
+    response_cache.invalidate(f'tool:{tool_id}', 'catalog')
     
-    return format_response(guide.to_dict(), "Guide created successfully", status_code=201)
+    return format_response(schemas.GUIDE.dump(guide), "Guide created successfully", status_code=201)
 
@@ -4,18 +4,23 @@ User routes for the AI Directory Platform.
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..models import User, UserActivityLog
+from sqlalchemy import func
+from ..models import AITool, Review, User, UserActivityLog
 from ..database import db
-from ..utils import format_response, format_error, admin_required, paginate
+from .. import loaders, schemas
+from ..cache import response_cache
+from ..http_cache import conditional
+from ..utils import format_response, format_error, admin_required, paginate, load_current_user
 
 users_bp = Blueprint('users', __name__, url_prefix='/api/v1/users')
 
 @users_bp.route('/me', methods=['GET'])
 @jwt_required()
+@conditional('private, no-cache')
 def get_current_user():
     """Get the current user's profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -26,14 +31,14 @@ def get_current_user():
         activity_type='view_profile'
     )
     
-    return format_response(user.to_dict())
+    return format_response(schemas.for_request(schemas.USER).dump(user))
 
 @users_bp.route('/me', methods=['PUT'])
 @jwt_required()
 def update_current_user():
     """Update the current user's profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
@@ -65,7 +70,7 @@ def update_current_user():
         activity_type='update_profile'
     )
     
-    return format_response(user.to_dict(), "Profile updated successfully")
+    return format_response(schemas.USER.dump(user), "Profile updated successfully")
 
 @users_bp.route('', methods=['GET'])
 @jwt_required()
@@ -77,7 +82,7 @@ def get_users():
     subscription_tier = request.args.get('subscription_tier')
     
     # Start with base query
-    query = User.query
+    query = User.query.options(*loaders.USER)
     
     # Apply search filter
     if search:
@@ -92,10 +97,10 @@ def get_users():
         query = query.filter(User.subscription_tier == subscription_tier)
     
     # Paginate results
-    result = paginate(query)
+    result = paginate(query, order_by=[(User.id, False)])
     
     # Format response
-    users = [user.to_dict() for user in result['items']]
+    users = schemas.for_request(schemas.USER).dump_many(result['items'])
     
     return format_response({
         'users': users,
@@ -112,7 +117,7 @@ def get_user(user_id):
     if not user:
         return format_error("User not found", "USER_NOT_FOUND", status_code=404)
     
-    return format_response(user.to_dict())
+    return format_response(schemas.for_request(schemas.USER).dump(user))
 
 @users_bp.route('/<int:user_id>', methods=['PUT'])
 @jwt_required()
@@ -159,7 +164,7 @@ def update_user(user_id):
         details=f"Updated user {user.id}"
     )
     
-    return format_response(user.to_dict(), "User updated successfully")
+    return format_response(schemas.USER.dump(user), "User updated successfully")
 
 @users_bp.route('/<int:user_id>', methods=['DELETE'])
 @jwt_required()
@@ -179,14 +184,30 @@ def delete_user(user_id):
         details=f"Deleted user {user.id} ({user.email})"
     )
     
+    # Take the user's reviews out of the tool rating aggregates, one update per tool
+    removed = {
+        tool_id: (rating_sum, review_count)
+        for tool_id, rating_sum, review_count in db.session.query(
+            Review.tool_id, func.sum(Review.rating), func.count(Review.id)
+        ).filter(Review.user_id == user.id).group_by(Review.tool_id)
+    }
+    reviewed_tool_ids = list(removed)
+    if removed:
+        for tool in AITool.query.filter(AITool.id.in_(removed)):
+            rating_sum, review_count = removed[tool.id]
+            tool.update_rating(-rating_sum, -review_count)
+    
     # Delete user from database
     db.session.delete(user)
     db.session.commit()
+    if reviewed_tool_ids:
+        response_cache.invalidate(*[f'tool:{tool_id}' for tool_id in reviewed_tool_ids], 'catalog')
     
     return format_response(message="User deleted successfully")
 
 @users_bp.route('/me/favorites', methods=['GET'])
 @jwt_required()
+@conditional('private, no-cache')
 def get_favorites():
     """Get the current user's favorite AI tools."""
     from ..models import UserFavorite
@@ -194,13 +215,13 @@ def get_favorites():
     current_user_id = get_jwt_identity()
     
     # Start with base query
-    query = UserFavorite.query.filter_by(user_id=current_user_id)
+    query = UserFavorite.query.options(*loaders.FAVORITE).filter_by(user_id=current_user_id)
     
     # Paginate results
-    result = paginate(query)
+    result = paginate(query, order_by=[(UserFavorite.id, False)])
     
     # Format response
-    favorites = [favorite.to_dict() for favorite in result['items']]
+    favorites = schemas.for_request(schemas.FAVORITE).dump_many(result['items'])
     
     return format_response({
         'favorites': favorites,
@@ -0,0 +1,239 @@
+"""
+Response schemas for the AI Directory Platform.
+
+A ``Schema`` declares the fields of one representation of a model, such as a
+tool on a listing page or on its detail page. It is compiled once into a
+function that builds the dict with direct attribute reads, so serializing a
+row costs no per-field lookups or ``getattr`` loops.
+
+``for_request(schema)`` honours a ``fields`` query parameter listing the
+fields to return (``fields=id,name,category.name``); each distinct field set
+is compiled on first use and then reused.
+"""
+
+from flask import request
+
+from .models import Category
+
+# Distinct ?fields= subsets kept per schema
+MAX_SUBSETS = 256
+
+class InvalidFields(ValueError):
+    """Raised when ``fields`` names a field the schema does not have."""
+
+class Field:
+    """An output field read from the attribute ``source`` (default: ``name``).
+
+    ``method`` computes the value from the object instead, and ``omit_none``
+    leaves the key out when the value is None.
+    """
+
+    def __init__(self, name, source=None, method=None, omit_none=False):
+        self.name = name
+        self.source = source or name
+        self.method = method
+        self.omit_none = omit_none
+        if not self.source.isidentifier():
+            raise ValueError(f'Invalid field source {self.source!r}')
+
+    def expression(self, ref, namespace):
+        """Get the Python expression reading this field from ``obj``."""
+        if self.method is not None:
+            namespace[ref] = self.method
+            return f'{ref}(obj)'
+        return f'obj.{self.source}'
+
+class Nested(Field):
+    """A related object (or list of them, with ``many``) serialized by ``schema``."""
+
+    def __init__(self, name, schema, many=False, source=None, omit_none=False):
+        super().__init__(name, source=source, omit_none=omit_none)
+        self.schema = schema
+        self.many = many
+
+    def narrow(self, schema):
+        return Nested(self.name, schema, many=self.many, source=self.source, omit_none=self.omit_none)
+
+    def expression(self, ref, namespace):
+        namespace[ref] = self.schema.dump
+        if self.many:
+            return f'[{ref}(item) for item in obj.{self.source}]'
+        return f'({ref}({ref}_value) if ({ref}_value := obj.{self.source}) is not None else None)'
+
+class Schema:
+    """An ordered set of fields, compiled into ``dump(obj)``."""
+
+    def __init__(self, *fields):
+        self.fields = {}
+        for field in fields:
+            field = Field(field) if isinstance(field, str) else field
+            self.fields[field.name] = field
+        self.dump = self._compile()
+        self._subsets = {}
+
+    def extend(self, *fields):
+        """Get a schema with ``fields`` added after this one's."""
+        return Schema(*self.fields.values(), *fields)
+
+    def dump_many(self, objects):
+        dump = self.dump
+        return [dump(obj) for obj in objects]
+
+    def _compile(self):
+        namespace = {}
+        items = []
+        optional = []
+        for index, field in enumerate(self.fields.values()):
+            expression = field.expression(f'_f{index}', namespace)
+            if field.omit_none:
+                optional.append((field.name, expression))
+            else:
+                items.append(f'{field.name!r}: {expression}')
+
+        lines = ['def dump(obj):', f'    data = {{{", ".join(items)}}}']
+        for name, expression in optional:
+            lines += [
+                f'    value = {expression}',
+                '    if value is not None:',
+                f'        data[{name!r}] = value'
+            ]
+        lines.append('    return data')
+
+        exec('\n'.join(lines), namespace)
+        return namespace['dump']
+
+    def only(self, names):
+        """Get a schema with just ``names``; ``a.b`` selects field ``b`` of nested ``a``."""
+        key = tuple(sorted(set(names)))
+        schema = self._subsets.get(key)
+        if schema is None:
+            if len(self._subsets) >= MAX_SUBSETS:
+                self._subsets.clear()
+            schema = self._subsets[key] = self._select(key)
+        return schema
+
+    def _select(self, names):
+        selected = {}
+        for name in names:
+            head, _, rest = name.partition('.')
+            field = self.fields.get(head)
+            if field is None or (rest and not isinstance(field, Nested)):
+                raise InvalidFields(f"Unknown field '{name}'")
+            selected.setdefault(head, []).append(rest)
+
+        fields = []
+        for name, field in self.fields.items():
+            if name not in selected:
+                continue
+            nested_names = selected[name]
+            # 'a' alone keeps all of a nested field; 'a.b' narrows it
+            if isinstance(field, Nested) and '' not in nested_names:
+                field = field.narrow(field.schema.only(nested_names))
+            fields.append(field)
+        return Schema(*fields)
+
+def for_request(schema):
+    """Get ``schema`` narrowed to the request's ``fields`` parameter, if any."""
+    fields = request.args.get('fields')
+    if not fields:
+        return schema
+    return schema.only(name.strip() for name in fields.split(',') if name.strip())
+
+_column_schemas = {}
+
+def columns_schema(model):
+    """Get a schema of all of a model's table columns."""
+    schema = _column_schemas.get(model)
+    if schema is None:
+        schema = _column_schemas[model] = Schema(*[column.key for column in model.__mapper__.column_attrs])
+    return schema
+
+# References embedded in other resources
+INDUSTRY_REF = Schema('id', 'name')
+CATEGORY_REF = Schema('id', 'name', 'icon')
+USER_REF = Schema('id', 'first_name', 'last_name')
+
+INDUSTRY = Schema('id', 'name', 'description', 'created_at', 'updated_at')
+
+CATEGORY = Schema(
+    'id', 'name', 'description', 'icon',
+    Field('tool_count', method=Category.tool_count),
+    'created_at', 'updated_at'
+)
+
+USER = Schema(
+    'id', 'email', 'first_name', 'last_name', 'company', 'job_title',
+    'subscription_tier', 'is_admin', 'created_at', 'updated_at',
+    Nested('industry', INDUSTRY_REF, omit_none=True),
+    Field('subscription_start_date', omit_none=True),
+    Field('subscription_end_date', omit_none=True)
+)
+
+REVIEW = Schema(
+    'id', 'rating', 'comment', 'is_verified', 'created_at', 'updated_at',
+    Nested('user', USER_REF, omit_none=True)
+)
+
+# Listing pages show guide titles only; the content is on the guide itself
+GUIDE_SUMMARY = Schema('id', 'tool_id', 'title', 'guide_type', 'order_index')
+
+GUIDE = Schema(
+    'id', 'tool_id', 'title', 'content',
+    Nested('author', USER_REF),
+    'guide_type', 'order_index', 'created_at', 'updated_at'
+)
+
+def _card_category(row):
+    if row.category_id is None:
+        return None
+    return {'id': row.category_id, 'name': row.category_name}
+
+# Listing cards, dumped from loaders.tool_cards() rows rather than AITool objects
+TOOL_CARD = Schema(
+    'id', 'name', 'summary', 'image_path', 'access_level', 'rating',
+    'rating_count', 'price_point_type',
+    Field('category', method=_card_category),
+    'created_at'
+)
+
+TOOL_LIST = Schema(
+    'id', 'name',
+    Nested('category', CATEGORY_REF),
+    'description', 'website_url', 'image_path', 'access_level', 'rating',
+    'business_utility', 'price_point_type', 'price_point_details',
+    Nested('industries', INDUSTRY_REF, many=True),
+    Nested('guides', GUIDE_SUMMARY, many=True),
+    'created_at', 'updated_at'
+)
+
+TOOL = Schema(
+    'id', 'name',
+    Nested('category', CATEGORY),
+    'description', 'website_url', 'image_path', 'access_level', 'rating',
+    'business_utility', 'price_point_type', 'price_point_details',
+    Nested('industries', INDUSTRY, many=True),
+    Nested('guides', GUIDE, many=True),
+    'created_at', 'updated_at'
+)
+
+TOOL_DETAIL = TOOL.extend(
+    Nested('reviews', REVIEW, many=True)
+)
+
+FAVORITE = Schema(
+    'id', 'user_id', 'tool_id', 'created_at',
+    Nested('tool', TOOL_LIST, omit_none=True)
+)
+
+SUBSCRIPTION = Schema(
+    'id', 'user_id', 'plan_id', 'status', 'current_period_start',
+    'current_period_end', 'cancel_at_period_end', 'payment_method_id',
+    'subscription_metadata', 'created_at', 'updated_at'
+)
+
+PAYMENT_TRANSACTION = Schema(
+    'id', 'user_id', 'amount', 'currency', 'status', 'payment_method',
+    'subscription_tier', 'transaction_date', 'transaction_metadata', 'created_at'
+)
+
+ACTIVITY = Schema('id', 'user_id', 'activity_type', 'details', 'created_at')
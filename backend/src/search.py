@@ -0,0 +1,387 @@
+"""
+Full-text search for AI tools in the AI Directory Platform.
+
+The search index is picked from the database dialect when the app starts:
+
+- SQLite: an FTS5 virtual table keyed on the tool id, ranked with bm25.
+- PostgreSQL: a weighted tsvector expression backed by a GIN index.
+- Anything else (or SQLite built without FTS5): an in-process inverted index.
+
+Routes keep the index in sync by calling ``index_tool`` / ``remove_tool``
+inside the same transaction as the tool write. The SQL indexes are written
+in that transaction; the in-process index is versioned instead (see
+``InvertedIndexBackend``).
+"""
+
+import bisect
+import math
+import re
+from collections import defaultdict
+from threading import RLock
+
+from flask import current_app, g
+from markupsafe import escape
+from sqlalchemy import Float, Integer, case, func, literal_column, text
+from sqlalchemy.exc import OperationalError
+
+from .database import db
+from .http_cache import VERSIONED_TABLES, mark_tables_written
+from .models.table_version import TableVersion
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Relative weight of each indexed field when ranking results
+FIELD_WEIGHTS = {
+    'name': 10.0,
+    'description': 1.0,
+    'business_utility': 0.5
+}
+
+MAX_TERMS = 8
+
+def tokenize(value):
+    """Split text into lowercase search terms."""
+    if not value:
+        return []
+    return [token.lower() for token in TOKEN_RE.findall(value)]
+
+def query_terms(search):
+    """Get the distinct terms of a search string, capped at MAX_TERMS."""
+    terms = []
+    for token in tokenize(search):
+        if token not in terms:
+            terms.append(token)
+    return terms[:MAX_TERMS]
+
+def highlight(value, terms, max_length=None):
+    """Wrap every word starting with one of the search terms in <mark> tags.
+
+    The text is HTML-escaped first. When ``max_length`` is given, the result
+    is a snippet of roughly that many characters around the first match.
+    """
+    if not value:
+        return value
+
+    if max_length and len(value) > max_length:
+        first = None
+        for match in TOKEN_RE.finditer(value):
+            if any(match.group().lower().startswith(term) for term in terms):
+                first = match.start()
+                break
+        start = max(0, (first or 0) - max_length // 4)
+        end = start + max_length
+        value = ('…' if start else '') + value[start:end] + ('…' if end < len(value) else '')
+
+    parts = []
+    last = 0
+    for match in TOKEN_RE.finditer(value):
+        if any(match.group().lower().startswith(term) for term in terms):
+            parts.append(str(escape(value[last:match.start()])))
+            parts.append(f'<mark>{escape(match.group())}</mark>')
+            last = match.end()
+    parts.append(str(escape(value[last:])))
+    return ''.join(parts)
+
+def tool_highlights(tool, search):
+    """Get the match highlights for a tool in a search result page."""
+    terms = query_terms(search)
+    return {
+        'name': highlight(tool.name, terms),
+        'description': highlight(tool.description, terms, max_length=200)
+    }
+
+class SQLiteFTSBackend:
+    """Search backend on an SQLite FTS5 virtual table."""
+
+    name = 'fts5'
+    table = 'ai_tools_fts'
+
+    def setup(self):
+        db.session.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+            f"USING fts5(name, description, business_utility, prefix='2 3')"
+        ))
+        db.session.commit()
+
+    def is_stale(self):
+        from .models import AITool
+        indexed = db.session.execute(text(f"SELECT count(*) FROM {self.table}")).scalar()
+        return indexed != db.session.query(func.count(AITool.id)).scalar()
+
+    def index_tool(self, tool):
+        self.remove_tool(tool.id)
+        db.session.execute(
+            text(
+                f"INSERT INTO {self.table} (rowid, name, description, business_utility) "
+                f"VALUES (:id, :name, :description, :business_utility)"
+            ),
+            {
+                'id': tool.id,
+                'name': tool.name or '',
+                'description': tool.description or '',
+                'business_utility': tool.business_utility or ''
+            }
+        )
+
+    def remove_tool(self, tool_id):
+        db.session.execute(text(f"DELETE FROM {self.table} WHERE rowid = :id"), {'id': tool_id})
+
+    def rebuild(self):
+        # One INSERT ... SELECT rather than a round trip per tool
+        db.session.execute(text(f"DELETE FROM {self.table}"))
+        db.session.execute(text(
+            f"INSERT INTO {self.table} (rowid, name, description, business_utility) "
+            f"SELECT id, coalesce(name, ''), coalesce(description, ''), coalesce(business_utility, '') "
+            f"FROM ai_tools"
+        ))
+        db.session.commit()
+
+    def apply(self, query, search):
+        from .models import AITool
+        terms = query_terms(search)
+        if not terms:
+            return query, None
+
+        # Every term must match; the last one as a prefix for search-as-you-type
+        match = ' '.join(f'"{term}"' for term in terms[:-1])
+        match = f'{match} "{terms[-1]}"*'.strip()
+        weights = ', '.join(str(weight) for weight in FIELD_WEIGHTS.values())
+
+        matches = text(
+            f"SELECT rowid AS tool_id, bm25({self.table}, {weights}) AS score "
+            f"FROM {self.table} WHERE {self.table} MATCH :match"
+        ).bindparams(match=match).columns(tool_id=Integer, score=Float).subquery()
+
+        query = query.join(matches, AITool.id == matches.c.tool_id)
+        # bm25 scores are negative; lower is more relevant
+        return query, (matches.c.score, False)
+
+class PostgresFTSBackend:
+    """Search backend on a weighted PostgreSQL tsvector with a GIN index."""
+
+    name = 'tsvector'
+    vector_sql = (
+        "setweight(to_tsvector('english', coalesce({table}name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce({table}description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce({table}business_utility, '')), 'C')"
+    )
+
+    def setup(self):
+        db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_ai_tools_search ON ai_tools "
+            f"USING GIN (({self.vector_sql.format(table='')}))"
+        ))
+        db.session.commit()
+
+    def is_stale(self):
+        # The expression index is maintained by PostgreSQL itself
+        return False
+
+    def index_tool(self, tool):
+        pass
+
+    def remove_tool(self, tool_id):
+        pass
+
+    def rebuild(self):
+        db.session.execute(text("REINDEX INDEX ix_ai_tools_search"))
+        db.session.commit()
+
+    def apply(self, query, search):
+        terms = query_terms(search)
+        if not terms:
+            return query, None
+
+        # Must stay identical to the indexed expression for the GIN index to apply
+        vector = literal_column(f"({self.vector_sql.format(table='ai_tools.')})")
+        tsquery = func.to_tsquery('english', ' & '.join(f'{term}:*' for term in terms))
+        query = query.filter(vector.op('@@')(tsquery))
+        return query, (func.ts_rank_cd(vector, tsquery), True)
+
+class InvertedIndexBackend:
+    """In-process inverted index used when the database has no full-text support.
+
+    Postings map each term to ``{tool_id: weight}``. The sorted vocabulary is
+    kept alongside so prefix lookups are a bisect instead of a scan.
+
+    Every worker process holds its own copy, so tool writes do not touch it
+    directly: ``index_tool`` / ``remove_tool`` have the ``search_index``
+    write counter bumped once the transaction commits (a rollback leaves it
+    alone), and each search first compares that counter with the one the
+    index was loaded at, reloading it from the database when they differ.
+
+    At most ``max_results`` matches are ranked; ``apply`` records the real
+    number of matches in ``g.search_matches`` when it cuts them off.
+    """
+
+    name = 'inverted_index'
+    version_name = 'search_index'
+
+    def __init__(self, max_results=1000):
+        self.max_results = max_results
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.vocabulary = []
+        self.version = None
+        self.lock = RLock()
+
+    def setup(self):
+        VERSIONED_TABLES.add(self.version_name)
+        TableVersion.ensure([self.version_name])
+
+    def is_stale(self):
+        # Loaded lazily on the first search
+        return False
+
+    def index_tool(self, tool):
+        mark_tables_written(db.session, [self.version_name])
+
+    def remove_tool(self, tool_id):
+        mark_tables_written(db.session, [self.version_name])
+
+    def _add(self, tool):
+        weights = defaultdict(float)
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(tool, field, None)):
+                weights[token] += field_weight
+        for token, weight in weights.items():
+            if token not in self.postings:
+                bisect.insort(self.vocabulary, token)
+            self.postings[token][tool.id] = weight
+        self.documents[tool.id] = list(weights)
+
+    def rebuild(self):
+        self._load(TableVersion.current([self.version_name])[0])
+
+    def _load(self, version):
+        # Callers read the counter first: a write committing meanwhile is
+        # either loaded now or leaves the counter past ``version``
+        from .models import AITool
+        with self.lock:
+            self.postings = defaultdict(dict)
+            self.documents = {}
+            self.vocabulary = []
+            columns = [AITool.id] + [getattr(AITool, field) for field in FIELD_WEIGHTS]
+            for tool in db.session.query(*columns).yield_per(1000):
+                self._add(tool)
+            self.version = version
+
+    def _expand(self, term, prefix):
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + '\uffff')
+        return self.vocabulary[start:end]
+
+    def rank(self, search):
+        """Get ``(tool_id, score)`` pairs for a search, best match first."""
+        terms = query_terms(search)
+        if not terms:
+            return []
+
+        version = TableVersion.current([self.version_name])[0]
+        with self.lock:
+            if version != self.version:
+                self._load(version)
+
+            total = max(len(self.documents), 1)
+            scores = None
+            for position, term in enumerate(terms):
+                term_scores = defaultdict(float)
+                for token in self._expand(term, prefix=position == len(terms) - 1):
+                    postings = self.postings[token]
+                    idf = math.log(1 + total / len(postings))
+                    for tool_id, weight in postings.items():
+                        term_scores[tool_id] += weight * idf
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        tool_id: score + term_scores[tool_id]
+                        for tool_id, score in scores.items()
+                        if tool_id in term_scores
+                    }
+                if not scores:
+                    return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def apply(self, query, search):
+        from .models import AITool
+        if not query_terms(search):
+            return query, None
+
+        ranked = self.rank(search)
+        if not ranked:
+            return query.filter(db.false()), None
+
+        if len(ranked) > self.max_results:
+            g.search_matches = len(ranked)
+            ranked = ranked[:self.max_results]
+
+        positions = {tool_id: position for position, (tool_id, _) in enumerate(ranked)}
+        query = query.filter(AITool.id.in_(positions))
+        return query, (case(positions, value=AITool.id), False)
+
+class ToolSearch:
+    """Flask extension that owns the tool search backend for an app."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        with app.app_context():
+            backend = self._create_backend(app)
+            if backend.is_stale():
+                backend.rebuild()
+        app.extensions['tool_search'] = backend
+
+    def _create_backend(self, app):
+        dialect = db.engine.dialect.name
+        max_results = app.config.get('SEARCH_MAX_RESULTS', 1000)
+
+        if dialect == 'sqlite':
+            backend = SQLiteFTSBackend()
+            try:
+                backend.setup()
+                return backend
+            except OperationalError:
+                # SQLite was compiled without FTS5
+                db.session.rollback()
+                app.logger.warning("FTS5 unavailable, using in-process search index")
+        elif dialect == 'postgresql':
+            backend = PostgresFTSBackend()
+            backend.setup()
+            return backend
+
+        backend = InvertedIndexBackend(max_results=max_results)
+        backend.setup()
+        return backend
+
+    @property
+    def backend(self):
+        return current_app.extensions['tool_search']
+
+    def apply(self, query, search):
+        """Filter a tool query by a search string.
+
+        Returns the filtered query and a ``(score, descending)`` pair, the
+        relevance score and the direction that puts the best matches first
+        (or ``None`` if the search has no usable terms).
+        """
+        return self.backend.apply(query, search)
+
+    def index_tool(self, tool):
+        """Add or refresh a tool in the search index."""
+        self.backend.index_tool(tool)
+
+    def remove_tool(self, tool_id):
+        """Remove a tool from the search index."""
+        self.backend.remove_tool(tool_id)
+
+    def rebuild(self):
+        """Rebuild the search index from the ai_tools table."""
+        self.backend.rebuild()
+
+tool_search = ToolSearch()
@@ -2,12 +2,27 @@
 Utility functions for the AI Directory Platform.
 """
 import os
+import time
 import uuid
+import json
+import base64
+import binascii
+import threading
 from datetime import datetime
+from decimal import Decimal
 from werkzeug.utils import secure_filename
-from flask import current_app, request, jsonify
+from sqlalchemy import and_, or_
+from flask import current_app, request, jsonify, g
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, jwt_required
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request, jwt_required
+from .profiling import timed_serialization
+
+# Subscription tier hierarchy
+TIER_LEVELS = {
+    'Free': 0,
+    'Premium': 1,
+    'Business': 2
+}
 
 def allowed_file(filename):
     """Check if the file extension is allowed."""
@@ -47,15 +62,49 @@ def delete_image(image_path):
     if os.path.exists(file_path):
         os.remove(file_path)
 
+def user_claims(user):
+    """Get the access claims embedded in a user's JWTs."""
+    return {
+        'tier': user.subscription_tier
+    }
+
+def trusted_claims():
+    """Get the current JWT's access claims if they can be used without a DB lookup.
+    
+    Claims are trusted for AUTH_CLAIMS_TTL seconds after the token was issued
+    (0, the default, disables them). They only carry the subscription tier:
+    admin access is never taken from a token, so a demoted or deleted admin
+    loses it at once. Callers only rely on a tier that grants access; one
+    that denies it is re-checked against the database, so upgrades apply
+    immediately and downgrades within the TTL.
+    """
+    ttl = current_app.config.get('AUTH_CLAIMS_TTL', 0)
+    if not ttl:
+        return None
+    
+    claims = get_jwt()
+    if 'tier' not in claims or time.time() - claims.get('iat', 0) > ttl:
+        return None
+    
+    return claims
+
+def load_current_user():
+    """Get the authenticated user, loading it at most once per request."""
+    if 'current_user' not in g:
+        from src.models.user import User
+        
+        current_user_id = get_jwt_identity()
+        g.current_user = User.query.get(current_user_id) if current_user_id is not None else None
+    
+    return g.current_user
+
 def admin_required(fn):
     """Decorator to require admin privileges."""
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        from src.models.user import User
         
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = load_current_user()
         
         if not current_user or not current_user.is_admin:
             return jsonify({
@@ -76,10 +125,12 @@ def subscription_required(min_tier='Premium'):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
-            from src.models.user import User
             
-            current_user_id = get_jwt_identity()
-            current_user = User.query.get(current_user_id)
+            claims = trusted_claims()
+            if claims and TIER_LEVELS.get(claims['tier'], -1) >= TIER_LEVELS.get(min_tier, 0):
+                return fn(*args, **kwargs)
+            
+            current_user = load_current_user()
             
             if not current_user:
                 return jsonify({
@@ -90,14 +141,7 @@ def subscription_required(min_tier='Premium'):
                     }
                 }), 401
             
-            # Define tier hierarchy
-            tiers = {
-                'Free': 0,
-                'Premium': 1,
-                'Business': 2
-            }
-            
-            if tiers.get(current_user.subscription_tier, -1) < tiers.get(min_tier, 0):
+            if TIER_LEVELS.get(current_user.subscription_tier, -1) < TIER_LEVELS.get(min_tier, 0):
                 return jsonify({
                     'success': False,
                     'error': {
@@ -112,20 +156,191 @@ def subscription_required(min_tier='Premium'):
     
     return decorator
 
-def paginate(query, page=1, per_page=20):
-    """Paginate a SQLAlchemy query."""
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+# Cached totals for count=estimate, keyed by the count query's SQL and parameters
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+_COUNT_CACHE_SIZE = 1024
+
+def encode_cursor(data):
+    """Encode cursor data as an opaque URL-safe token."""
+    def default(value):
+        if isinstance(value, datetime):
+            return {'$dt': value.isoformat()}
+        raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+    
+    raw = json.dumps(data, default=default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor."""
+    def object_hook(value):
+        if '$dt' in value:
+            return datetime.fromisoformat(value['$dt'])
+        return value
+    
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        return json.loads(raw, object_hook=object_hook)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursor('Invalid pagination cursor') from e
+
+def count_query(query, mode='exact'):
+    """Count the rows of a query.
+    
+    ``mode`` is ``exact`` (always run COUNT(*)), ``estimate`` (reuse a count
+    cached for PAGINATION_COUNT_TTL seconds) or ``none`` (skip counting).
+    """
+    if mode == 'none':
+        return None
+    
+    query = query.order_by(None)
+    if mode != 'estimate':
+        return query.count()
+    
+    compiled = query.statement.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    now = time.monotonic()
+    
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    total = query.count()
+    with _count_cache_lock:
+        if len(_count_cache) >= _COUNT_CACHE_SIZE:
+            _count_cache.clear()
+        _count_cache[key] = (now + current_app.config.get('PAGINATION_COUNT_TTL', 60), total)
+    return total
+
+def _nullable(column):
+    return getattr(column.expression, 'nullable', True)
+
+def _cursor_value(column, value):
+    """Check a decoded cursor value against the type of its sort column."""
+    if value is None:
+        if _nullable(column):
+            return value
+        raise InvalidCursor('Invalid pagination cursor')
+    
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    
+    if python_type in (float, Decimal):
+        python_type = (int, float)
+    if isinstance(value, bool) and python_type is not bool or not isinstance(value, python_type):
+        raise InvalidCursor('Invalid pagination cursor')
+    return value
+
+def _order_clause(column, descending):
+    clause = column.desc() if descending else column.asc()
+    # NULLs sort last either way, whatever the database's default
+    return clause.nulls_last() if _nullable(column) else clause
+
+def _keyset_filter(order_by, values):
+    """Build the WHERE clause selecting rows after ``values`` in ``order_by`` order.
+    
+    NULLs sort last, so nothing follows a NULL in its own column and every
+    NULL follows a value.
+    """
+    clauses = []
+    
+    for i, (column, descending) in enumerate(order_by):
+        if values[i] is None:
+            continue
+        after = column < values[i] if descending else column > values[i]
+        if _nullable(column):
+            after = or_(after, column.is_(None))
+        equal = [
+            order_by[j][0].is_(None) if values[j] is None else order_by[j][0] == values[j]
+            for j in range(i)
+        ]
+        clauses.append(and_(*equal, after))
+    
+    return or_(*clauses)
+
+def paginate(query, page=1, per_page=20, order_by=None):
+    """Paginate a SQLAlchemy query.
+    
+    ``order_by`` is a list of ``(column, descending)`` pairs whose last column
+    is unique (usually the primary key). When given, paginate applies the
+    ordering itself, and a ``cursor`` query parameter switches to keyset
+    pagination: each page seeks past the previous page's last sort key
+    instead of using OFFSET, so deep pages cost the same as the first one.
+    NULLs in nullable sort columns come last in both directions.
+    Without ``order_by`` the cursor simply encodes the next offset.
+    
+    The ``count`` query parameter (``exact``, ``estimate`` or ``none``)
+    controls how the total is computed. Offset pages count exactly by
+    default; cursor pages use a cached estimate.
+    """
     page = int(request.args.get('page', page))
     per_page = int(request.args.get('limit', per_page))
     
-    items = query.paginate(page=page, per_page=per_page, error_out=False)
+    if order_by:
+        query = query.order_by(*[_order_clause(column, descending) for column, descending in order_by])
+    
+    if 'cursor' not in request.args:
+        count_mode = request.args.get('count', 'exact')
+        items = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+        total = count_query(query, count_mode)
+        
+        return {
+            'items': items.items,
+            'pagination': {
+                'total': total,
+                'page': items.page,
+                'limit': per_page,
+                'pages': -(-total // per_page) if total is not None and per_page else None
+            }
+        }
+    
+    count_mode = request.args.get('count', 'estimate')
+    total = count_query(query, count_mode)
+    
+    cursor = request.args.get('cursor')
+    position = decode_cursor(cursor) if cursor else None
+    
+    if order_by:
+        if position is not None:
+            if not isinstance(position, list) or len(position) != len(order_by):
+                raise InvalidCursor('Invalid pagination cursor')
+            position = [_cursor_value(column, value) for (column, descending), value in zip(order_by, position)]
+            query = query.filter(_keyset_filter(order_by, position))
+        offset = None
+    else:
+        try:
+            offset = int(position.get('offset', 0)) if position is not None else 0
+        except (AttributeError, TypeError, ValueError) as e:
+            raise InvalidCursor('Invalid pagination cursor') from e
+        query = query.offset(offset)
+    
+    # Fetch one extra row to know whether there is a next page
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    
+    next_cursor = None
+    if has_more and order_by:
+        last = items[-1]
+        next_cursor = encode_cursor([
+            getattr(last, column.key) for column, descending in order_by
+        ])
+    elif has_more:
+        next_cursor = encode_cursor({'offset': offset + per_page})
     
     return {
-        'items': items.items,
+        'items': items,
         'pagination': {
-            'total': items.total,
-            'page': items.page,
+            'total': total,
             'limit': per_page,
-            'pages': items.pages
+            'next_cursor': next_cursor,
+            'has_more': has_more
         }
     }
 
@@ -141,7 +356,8 @@ def format_response(data=None, message=None, success=True, status_code=200):
     if data is not None:
         response['data'] = data
     
-    return jsonify(response), status_code
+    with timed_serialization():
+        return jsonify(response), status_code
 
 def format_error(message, code, details=None, status_code=400):
     """Format a consistent API error response."""
@@ -156,5 +372,6 @@ def format_error(message, code, details=None, status_code=400):
     if details:
         response['error']['details'] = details
     
-    return jsonify(response), status_code
+    with timed_serialization():
+        return jsonify(response), status_code
 
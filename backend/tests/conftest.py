@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the backend tests.
+
+Run from ``backend/`` with ``python -m pytest tests``.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read by src.config at import time: keep 429s and cache hits out of the tests
+os.environ.setdefault('RATELIMIT_ENABLED', 'false')
+os.environ.setdefault('RESPONSE_CACHE_BACKEND', 'none')
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The API on a fresh SQLite database."""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    from src.database import db
+    from src.main import create_app
+    
+    app = create_app('testing')
+    # Tokens carry integer user ids, which newer flask-jwt-extended releases
+    # reject as subjects unless this is off
+    app.config['JWT_VERIFY_SUB'] = False
+    yield app
+    
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,111 @@
+"""
+Tests for the append-only JSON store behind app.py.
+"""
+
+import threading
+
+import json_store
+from json_store import LOG_FILE, LogStore
+
+def open_store(path):
+    return LogStore(str(path), {'items': ()}, shared=True).open()
+
+def ids(store):
+    return [record['id'] for record in store.all('items')]
+
+def test_writes_after_a_torn_tail_are_kept(tmp_path):
+    writer = open_store(tmp_path)
+    reader = open_store(tmp_path)
+    writer.put('items', {'id': 'a'})
+    
+    # A worker crashed halfway through its append
+    with open(tmp_path / LOG_FILE, 'ab') as f:
+        f.write(b'{"op":"put","collection":"items","rec')
+    
+    writer.put('items', {'id': 'b'})
+    writer.put('items', {'id': 'c'})
+    assert ids(writer) == ['a', 'b', 'c']
+    
+    reader.refresh()
+    assert ids(reader) == ['a', 'b', 'c']
+    
+    writer.close()
+    reader.close()
+    assert ids(open_store(tmp_path)) == ['a', 'b', 'c']
+
+def test_torn_tail_is_dropped_on_open(tmp_path):
+    store = open_store(tmp_path)
+    store.put('items', {'id': 'a'})
+    store.close()
+    with open(tmp_path / LOG_FILE, 'ab') as f:
+        f.write(b'{"op":"put"')
+    
+    store = open_store(tmp_path)
+    store.put('items', {'id': 'b'})
+    store.close()
+    assert ids(open_store(tmp_path)) == ['a', 'b']
+
+def test_reload_swaps_in_new_indexes(tmp_path):
+    writer = LogStore(str(tmp_path), {'items': ('kind',)}, shared=True).open()
+    reader = LogStore(str(tmp_path), {'items': ('kind',)}, shared=True).open()
+    writer.put('items', {'id': 'a', 'kind': 'x'})
+    reader.refresh()
+    indexes = reader['items'].indexes
+    
+    writer.put('items', {'id': 'b', 'kind': 'x'})
+    writer.compact()
+    reader.refresh()
+    
+    # A thread still holding the old dicts sees them whole, never half loaded
+    assert list(indexes['kind']['x']) == ['a']
+    assert [record['id'] for record in reader['items'].find('kind', 'x')] == ['a', 'b']
+
+def test_compaction_between_stat_and_open_reloads(tmp_path, monkeypatch):
+    writer = open_store(tmp_path)
+    reader = open_store(tmp_path)
+    writer.put('items', {'id': 'a'})
+    reader.refresh()
+    writer.put('items', {'id': 'b'})
+    
+    def compact_then_open(path, *args, **kwargs):
+        # The reader has seen the old log's size and is about to open it
+        monkeypatch.delattr(json_store, 'open')
+        writer.compact()
+        writer.put('items', {'id': 'c'})
+        return open(path, *args, **kwargs)
+    
+    monkeypatch.setattr(json_store, 'open', compact_then_open, raising=False)
+    reader.refresh()
+    assert ids(reader) == ['a', 'b', 'c']
+
+def test_reads_while_another_thread_refreshes(tmp_path):
+    writer = LogStore(str(tmp_path), {'items': ('kind',)}, compact_every=200, fsync=False, shared=True).open()
+    shared = LogStore(str(tmp_path), {'items': ('kind',)}, compact_every=200, fsync=False, shared=True).open()
+    done = threading.Event()
+    errors = []
+    
+    def read():
+        while not done.is_set():
+            try:
+                shared['items'].find('kind', 'x')
+                shared['items'].recent(5)
+                list(shared['items'])
+            except RuntimeError as error:
+                errors.append(error)
+    
+    def refresh():
+        while not done.is_set():
+            shared.refresh()
+    
+    threads = [threading.Thread(target=read), threading.Thread(target=refresh)]
+    for thread in threads:
+        thread.start()
+    for i in range(3000):
+        writer.put('items', {'id': str(i % 500), 'kind': 'x' if i % 2 else 'y'})
+    done.set()
+    for thread in threads:
+        thread.join()
+    
+    shared.refresh()
+    assert errors == []
+    assert shared.all('items') == writer.all('items')
@@ -0,0 +1,69 @@
+"""
+The routes load a page of results in a fixed number of SQL statements,
+however many rows the page or its related collections hold.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from src.database import count_statements, db
+from src.models import AITool, Category, Industry, Review, ToolGuide, User, UserFavorite
+from src.utils import user_claims
+
+TOOLS = 60
+
+@pytest.fixture
+def catalog(app):
+    """Seed TOOLS tools with industries and guides, a reviewer per review and
+    a user who favorited every tool. Returns that user's auth headers and the
+    ids of a tool with 5 reviews and one with 50."""
+    with app.app_context():
+        categories = [Category(name=f'Category {index}') for index in range(3)]
+        industries = [Industry(name=f'Industry {index}') for index in range(3)]
+        db.session.add_all(categories + industries)
+        
+        tools = []
+        for index in range(TOOLS):
+            tool = AITool(name=f'Tool {index:02d}', description='An AI tool', website_url='https://example.com',
+                          access_level='Public', category=categories[index % 3],
+                          industries=industries[:index % 3 + 1])
+            tool.guides.append(ToolGuide(title='Getting started', content='Step one', guide_type='Tutorial'))
+            tools.append(tool)
+        db.session.add_all(tools)
+        
+        user = User(email='user@example.com', first_name='Test', last_name='User',
+                    password_hash='x', subscription_tier='Business')
+        reviewers = [User(email=f'reviewer{index}@example.com', first_name='Review', last_name=str(index),
+                          password_hash='x') for index in range(50)]
+        db.session.add_all([user] + reviewers)
+        db.session.flush()
+        
+        db.session.add_all(UserFavorite(user_id=user.id, tool_id=tool.id) for tool in tools)
+        for tool, count in ((tools[0], 5), (tools[1], 50)):
+            db.session.add_all(Review(user_id=reviewer.id, tool_id=tool.id, rating=4, comment='Useful')
+                               for reviewer in reviewers[:count])
+        db.session.commit()
+        
+        token = create_access_token(identity=user.id, additional_claims=user_claims(user))
+        return {'Authorization': f'Bearer {token}'}, tools[0].id, tools[1].id
+
+def statement_count(app, client, path, headers=None):
+    with app.app_context(), count_statements() as statements:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return len(statements)
+
+@pytest.mark.parametrize('query', ['', '&view=card', '&category_id=1', '&sort=rating&order=desc'])
+def test_tool_list_statements_do_not_grow_with_page_size(app, client, catalog, query):
+    assert (statement_count(app, client, f'/api/v1/tools?limit=5{query}')
+            == statement_count(app, client, f'/api/v1/tools?limit=50{query}'))
+
+def test_tool_detail_statements_do_not_grow_with_reviews(app, client, catalog):
+    headers, few_reviews, many_reviews = catalog
+    assert (statement_count(app, client, f'/api/v1/tools/{few_reviews}', headers)
+            == statement_count(app, client, f'/api/v1/tools/{many_reviews}', headers))
+
+def test_favorites_statements_do_not_grow_with_page_size(app, client, catalog):
+    headers = catalog[0]
+    assert (statement_count(app, client, '/api/v1/users/me/favorites?limit=5', headers)
+            == statement_count(app, client, '/api/v1/users/me/favorites?limit=50', headers))
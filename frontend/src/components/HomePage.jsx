@@ -11,12 +11,12 @@ const HomePage = () => {
 
   useEffect(() => {
     // Fetch tools from API
-    fetch('https://aiinteltools-production.up.railway.app/api/tools')
+    fetch('https://aiinteltools-production.up.railway.app/api/tools?limit=3')
       .then(response => response.json())
       .then(data => {
         if (data.success) {
-          setTools(data.data.tools.slice(0, 3)); // Get first 3 tools for featured section
-          setStats(prev => ({ ...prev, tools: data.data.tools.length }));
+          setTools(data.data.tools); // First 3 tools for featured section
+          setStats(prev => ({ ...prev, tools: data.data.pagination.total }));
         }
       })
       .catch(error => {
@@ -48,11 +48,11 @@ const HomePage = () => {
       });
 
     // Fetch user count
-    fetch('https://aiinteltools-production.up.railway.app/api/users')
+    fetch('https://aiinteltools-production.up.railway.app/api/users?limit=1&fields=id')
       .then(response => response.json())
       .then(data => {
         if (data.success) {
-          setStats(prev => ({ ...prev, users: data.data.users.length }));
+          setStats(prev => ({ ...prev, users: data.data.pagination.total }));
         }
       })
       .catch(error => console.error('Error fetching users:', error));
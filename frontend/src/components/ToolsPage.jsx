@@ -7,13 +7,27 @@ const ToolsPage = () => {
   const [loading, setLoading] = useState(true)
   
   useEffect(() => {
-    // Fetch tools from API
-    fetch('https://aiinteltools-production.up.railway.app/api/tools')
-      .then(response => response.json())
-      .then(data => {
-        if (data.success) {
-          setTools(data.data.tools)
+    // Fetch every page of tools from the API, following the keyset cursor
+    const fetchAllTools = async () => {
+      const allTools = []
+      let cursor = ''
+      do {
+        const response = await fetch(
+          `https://aiinteltools-production.up.railway.app/api/tools?limit=200&cursor=${encodeURIComponent(cursor)}`
+        )
+        const data = await response.json()
+        if (!data.success) {
+          break
         }
+        allTools.push(...data.data.tools)
+        cursor = data.data.pagination.next_cursor
+      } while (cursor)
+      return allTools
+    }
+
+    fetchAllTools()
+      .then(allTools => {
+        setTools(allTools)
         setLoading(false)
       })
       .catch(error => {